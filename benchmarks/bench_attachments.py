@@ -0,0 +1,110 @@
+"""Attachment download time of a remote import, serial vs. concurrent.
+
+Runs ``add_remote_challenges`` in a throwaway workspace against a fake
+platform client whose downloads sleep for ``--latency`` seconds, and compares
+it with the previous behaviour of downloading one challenge's attachments at
+a time.
+
+    python benchmarks/bench_attachments.py [--challenges N] [--files N]
+        [--latency S] [--limit N]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+
+class _Attachment(SimpleNamespace):
+    def model_dump(self, **kwargs):
+        return {"name": self.name, "url": self.url}
+
+
+class _FakeAttachments:
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    async def download(self, att, save_dir):
+        await asyncio.sleep(self.latency)
+        Path(save_dir, att.name).write_bytes(b"\0" * 64)
+
+    async def download_all(self, atts, save_dir):
+        for att in atts:
+            await self.download(att, save_dir)
+
+
+def _challenges(count: int, files: int):
+    return [
+        SimpleNamespace(
+            id=i,
+            name=f"chall {i}",
+            category="pwn",
+            value=100,
+            solved=False,
+            description="",
+            author=None,
+            tags=[],
+            attachments=[
+                _Attachment(name=f"file{j}", url=f"/files/{i}/{j}")
+                for j in range(files)
+            ],
+        )
+        for i in range(count)
+    ]
+
+
+async def _serial(client, root: Path, challenges) -> None:
+    for ch in challenges:
+        save_dir = root / "serial" / str(ch.id)
+        save_dir.mkdir(parents=True, exist_ok=True)
+        await client.attachments.download_all(ch.attachments, save_dir)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--challenges", type=int, default=50)
+    parser.add_argument("--files", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--limit", type=int, default=8)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        os.environ["PWNV_CONFIG"] = str(root / "pwnv_config.json")
+        sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+        from pwnv.models import CTF
+        from pwnv.utils.config import save_config, set_config_value
+        from pwnv.utils.crud import add_ctf
+        from pwnv.utils.remote import add_remote_challenges
+
+        save_config({"ctfs_path": str(root), "challenge_tags": []})
+        set_config_value("download_concurrency", args.limit)
+        ctf = CTF(name="bench", path=root / "bench")
+        add_ctf(ctf)
+
+        client = SimpleNamespace(attachments=_FakeAttachments(args.latency))
+        challenges = _challenges(args.challenges, args.files)
+        total = args.challenges * args.files
+        print(
+            f"{args.challenges} challenges x {args.files} files, "
+            f"{args.latency * 1000:.0f}ms per download, limit {args.limit}"
+        )
+
+        start = time.perf_counter()
+        asyncio.run(_serial(client, root, challenges))
+        serial = time.perf_counter() - start
+        print(f"  serial downloads   : {serial:.2f}s ({total} files)")
+
+        start = time.perf_counter()
+        asyncio.run(add_remote_challenges(client, ctf, challenges))
+        pipeline = time.perf_counter() - start
+        print(f"  full import (new)  : {pipeline:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Startup time of ``pwnv`` with and without the config snapshot.
+
+Generates a workspace with ``--challenges`` challenges (10k by default) and
+times a fresh interpreter that loads every CTF and challenge, looks up a
+single challenge by name or resolves the challenge owning a directory, first
+with no snapshot (cold) and then with the snapshot written by the previous
+run (warm).
+
+    python benchmarks/bench_config_cache.py [--challenges N] [--runs N]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+_SCENARIOS = {
+    "load everything": (
+        "from pwnv.utils.crud import get_challenges, get_ctfs; "
+        "get_ctfs(); get_challenges()"
+    ),
+    "lookup by name": (
+        "from pwnv.utils.crud import get_challenge_by_name; "
+        "get_challenge_by_name('ch0-0')"
+    ),
+    "current challenge": (
+        "from pwnv.utils.config import get_config_path; "
+        "from pwnv.utils.crud import get_current_challenge; "
+        "get_current_challenge(get_config_path().parent / 'ctf0' / 'pwn' / 'ch0')"
+    ),
+}
+
+
+def _write_config(root: Path, challenges: int, per_ctf: int = 50) -> Path:
+    ctfs, chs = [], []
+    for i in range(max(1, challenges // per_ctf)):
+        ctf_id = str(uuid.uuid4())
+        ctf_path = root / f"ctf{i}"
+        ctfs.append(
+            {
+                "id": ctf_id,
+                "name": f"ctf{i}",
+                "created_at": "2025-01-01T00:00:00",
+                "path": str(ctf_path),
+                "running": 0,
+                "url": f"https://ctf{i}.example.com",
+            }
+        )
+        for j in range(per_ctf):
+            chs.append(
+                {
+                    "id": str(uuid.uuid4()),
+                    "name": f"ch{i}-{j}",
+                    "flag": f"flag{{{j}}}",
+                    "points": 100 + j,
+                    "solved": j % 2,
+                    "category": j % 13 + 1,
+                    "ctf_id": ctf_id,
+                    "path": str(ctf_path / "pwn" / f"ch{j}"),
+                    "tags": ["rop", "heap"],
+                    "extras": {"slug": str(j), "author": "someone"},
+                }
+            )
+    cfg_path = root / "pwnv_config.json"
+    cfg = {
+        "ctfs_path": str(root),
+        "challenge_tags": ["rop", "heap"],
+        "ctfs": ctfs,
+        "challenges": chs,
+        "version": 1,
+    }
+    cfg_path.write_text(json.dumps(cfg, indent=4))
+    return cfg_path
+
+
+def _time_startup(cfg_path: Path, code: str) -> float:
+    env = {**os.environ, "PWNV_CONFIG": str(cfg_path)}
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", code], env=env, check=True)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--challenges", type=int, default=10_000)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cfg_path = _write_config(Path(tmp), args.challenges)
+        snapshot = cfg_path.with_name(cfg_path.name + ".cache")
+        missing = cfg_path.with_name("missing.json")
+        baseline = [_time_startup(missing, "import pwnv.utils.crud") for _ in range(3)]
+        print(f"{args.challenges} challenges, median of {args.runs} runs")
+        print(f"  interpreter + imports only : {statistics.median(baseline):.3f}s")
+
+        for name, code in _SCENARIOS.items():
+            cold, warm = [], []
+            for _ in range(args.runs):
+                snapshot.unlink(missing_ok=True)
+                cold.append(_time_startup(cfg_path, code))
+                warm.append(_time_startup(cfg_path, code))
+            print(f"  {name}")
+            print(f"    no snapshot (cold)       : {statistics.median(cold):.3f}s")
+            print(f"    with snapshot (warm)     : {statistics.median(warm):.3f}s")
+
+
+if __name__ == "__main__":
+    main()
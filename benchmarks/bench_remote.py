@@ -0,0 +1,114 @@
+"""End-to-end remote operations against a local fake CTFd server.
+
+Starts ``tests.fake_ctfd.FakeCTFd`` in a throwaway workspace and reports the
+wall-clock time, HTTP request count and bytes transferred of
+``add_remote_ctf``, an idle and an incremental ``sync_remote_ctf``, and
+``remote_solve`` for every challenge one by one versus ``submit_flags`` for
+all of them at once, followed by the latency and retries of each kind of
+platform call.
+
+    python benchmarks/bench_remote.py [--challenges N] [--files N]
+        [--file-size BYTES] [--latency S] [--rate-limit N] [--failure-rate P]
+        [--submit-rate N]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+def _measure(label: str, server, fn) -> None:
+    server.reset_stats()
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    stats = server.stats
+    kib = (stats["bytes_sent"] + stats["bytes_received"]) / 1024
+    extra = ""
+    if stats["throttled"] or stats["failed"]:
+        extra = f", {stats['throttled']} throttled, {stats['failed']} failed"
+    print(
+        f"  {label:<20}: {elapsed:6.2f}s {stats['requests']:5d} requests "
+        f"{kib:9.1f} KiB{extra}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--challenges", type=int, default=50)
+    parser.add_argument("--files", type=int, default=2)
+    parser.add_argument("--file-size", type=int, default=16 * 1024)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--rate-limit", type=float, default=None)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--submit-rate", type=float, default=20.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        os.environ["PWNV_CONFIG"] = str(root / "pwnv_config.json")
+        sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+        from pwnv.models import CTF
+        from pwnv.utils import remote
+        from pwnv.utils.config import save_config, set_config_value
+        from pwnv.utils.credentials import Credentials
+        from pwnv.utils.crud import get_challenges
+        from pwnv.utils.resilience import get_call_stats
+        from tests.fake_ctfd import PASSWORD, USERNAME, FakeCTFd, flag_for
+
+        save_config({"ctfs_path": str(root), "challenge_tags": []})
+        set_config_value("submit_rate", args.submit_rate)
+        remote._ask_for_credentials = lambda methods: Credentials(USERNAME, PASSWORD)
+
+        server = FakeCTFd(
+            challenges=args.challenges,
+            files=args.files,
+            file_size=args.file_size,
+            latency=args.latency,
+            rate_limit=args.rate_limit,
+            failure_rate=args.failure_rate,
+        )
+        print(
+            f"{args.challenges} challenges x {args.files} files of "
+            f"{args.file_size} bytes, {args.latency * 1000:.0f}ms latency"
+        )
+        with server:
+            ctf = CTF(name="bench", path=root / "bench", url=server.url)
+            _measure("add_remote_ctf", server, lambda: remote.add_remote_ctf(ctf))
+            _measure("sync (no changes)", server, lambda: remote.sync_remote_ctf(ctf))
+            server.add_challenge(files=["/files/new/new.bin"])
+            _measure("sync (one new)", server, lambda: remote.sync_remote_ctf(ctf))
+
+            def _entries():
+                return [
+                    (ctf, ch, flag_for(int((ch.extras or {}).get("slug", 0))))
+                    for ch in get_challenges()
+                ]
+
+            def _solve_each() -> None:
+                for entry in _entries():
+                    remote.submit_flag(*entry)
+
+            _measure("remote_solve (each)", server, _solve_each)
+            _measure(
+                "submit_flags (batch)",
+                server,
+                lambda: remote.submit_flags(_entries()),
+            )
+
+        print("per call (all runs):")
+        for label, stats in sorted(get_call_stats().items()):
+            print(
+                f"  {label:<20}: {stats['calls']:5d} calls {stats['retries']:4d} "
+                f"retries {stats['failures']:3d} failed, avg "
+                f"{stats['seconds'] / stats['calls'] * 1000:7.1f}ms, slowest "
+                f"{stats['slowest'] * 1000:7.1f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
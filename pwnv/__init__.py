@@ -3,7 +3,10 @@ import typer
 from pwnv.cli import (
     challenge_app,
     ctf_app,
+    flush_app,
+    gc_app,
     init_app,
+    migrate_app,
     plugin_app,
     reset_app,
     solve_app,
@@ -14,7 +17,10 @@ def main():
     app = typer.Typer()
     app.add_typer(challenge_app, name="challenge")
     app.add_typer(ctf_app, name="ctf")
+    app.add_typer(flush_app)
+    app.add_typer(gc_app)
     app.add_typer(init_app)
+    app.add_typer(migrate_app)
     app.add_typer(reset_app)
     app.add_typer(solve_app)
     app.add_typer(plugin_app, name="plugin")
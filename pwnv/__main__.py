@@ -0,0 +1,3 @@
+from pwnv import main
+
+main()
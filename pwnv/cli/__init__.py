@@ -1,6 +1,9 @@
 from pwnv.cli.challenge import app as challenge_app
 from pwnv.cli.ctf import app as ctf_app
+from pwnv.cli.flush import app as flush_app
+from pwnv.cli.gc import app as gc_app
 from pwnv.cli.init import app as init_app
+from pwnv.cli.migrate import app as migrate_app
 from pwnv.cli.plugin import app as plugin_app
 from pwnv.cli.reset import app as reset_app
 from pwnv.cli.solve import app as solve_app
@@ -8,7 +11,10 @@ from pwnv.cli.solve import app as solve_app
 __all__ = [
     "challenge_app",
     "ctf_app",
+    "flush_app",
+    "gc_app",
     "init_app",
+    "migrate_app",
     "reset_app",
     "solve_app",
     "plugin_app",
@@ -25,7 +25,6 @@ def add(name: str) -> None:
     """Adds a new challenge to a selected CTF."""
     from pwnv.utils import (
         add_challenge,
-        challenges_for_ctf,
         error,
         get_current_ctf,
         get_running_ctfs,
@@ -49,9 +48,7 @@ def add(name: str) -> None:
     category = prompt_category_selection()
     ch_path = chosen_ctf.path / category.name / sanitize(name)
 
-    if ch_path.exists() or is_duplicate(
-        path=ch_path, model_list=challenges_for_ctf(chosen_ctf)
-    ):
+    if ch_path.exists() or is_duplicate(path=ch_path, model=Challenge):
         error(
             f"[cyan]{name}[/] already exists in "
             f"[cyan]{chosen_ctf.name}/{category.name}/[/]."
@@ -99,7 +96,7 @@ def remove() -> None:
 @challenges_exists()
 def info_(
     all: bool = typer.Option(
-        False, "--all", "-a", help="Show challenges from all CTFs"
+        False, "--all", "-a", help="Show challenges from all CTFs, archived included"
     ),
 ) -> None:
     """Displays detailed information about a selected challenge."""
@@ -122,7 +119,9 @@ def info_(
         return
 
     if all:
-        challenges = get_challenges()
+        from pwnv.utils.archive import get_archived_challenges
+
+        challenges = get_challenges() + get_archived_challenges()
     else:
         selected_ctf = get_current_ctf() or prompt_ctf_selection(
             get_ctfs(), "Select a CTF:"
@@ -142,7 +141,11 @@ def info_(
 @app.command(name="filter")
 @config_exists()
 @challenges_exists()
-def filter_() -> None:
+def filter_(
+    all: bool = typer.Option(
+        False, "--all", "-a", help="Include challenges of archived CTFs"
+    ),
+) -> None:
     """Filters and displays solved challenges based on selected tags."""
     from pwnv.utils import (
         get_solved_challenges,
@@ -154,6 +157,11 @@ def filter_() -> None:
     )
 
     solved = get_solved_challenges()
+    if all:
+        from pwnv.models.challenge import Solved
+        from pwnv.utils.archive import get_archived_challenges
+
+        solved += [ch for ch in get_archived_challenges() if ch.solved == Solved.solved]
     if not solved:
         warn("No solved challenges found.")
         return
@@ -167,3 +175,83 @@ def filter_() -> None:
             show_challenge(prompt_challenge_selection(subset, "Select a challenge:"))
         if not prompt_confirm("Filter again?", default=False):
             break
+
+
+@app.command()
+@config_exists()
+@challenges_exists()
+def fetch(
+    all: bool = typer.Option(
+        False, "--all", "-a", help="Fetch every pending attachment, by priority"
+    ),
+    categories: List[str] = typer.Option(
+        [], "--category", "-c", help="Fetch pending attachments of this category"
+    ),
+    here: bool = typer.Option(
+        False, "--here", help="Only fetch for the challenge in the current directory"
+    ),
+    background: bool = typer.Option(
+        False, "--background", "-b", help="Fetch in a detached background process"
+    ),
+    ids: List[str] = typer.Option([], "--id", hidden=True),
+) -> None:
+    """Downloads the attachments a lazy import left pending."""
+    from pathlib import Path
+
+    from pwnv.utils import (
+        challenges_for_ctf,
+        fetch_challenge_attachments,
+        get_challenge_by_id,
+        get_current_challenge,
+        get_current_ctf,
+        get_running_ctfs,
+        info,
+        order_for_prefetch,
+        prompt_challenge_selection,
+        success,
+        warn,
+    )
+    from pwnv.utils.meta import get_extra
+
+    current = get_current_challenge(Path.cwd())
+    if ids:
+        challenges = [ch for ch in map(get_challenge_by_id, ids) if ch]
+    elif here or (current and not (all or categories)):
+        challenges = [current] if current else []
+    else:
+        ctf = get_current_ctf()
+        ctfs = [ctf] if ctf else get_running_ctfs()
+        challenges = [ch for ctf in ctfs for ch in challenges_for_ctf(ctf)]
+        if categories:
+            challenges = [ch for ch in challenges if ch.category.name in categories]
+    pending = [ch for ch in challenges if get_extra(ch, "pending_attachments")]
+    if not pending:
+        if not here:
+            info("No pending attachments.")
+        return
+    if not (ids or all or categories or here or current):
+        pending = [prompt_challenge_selection(pending, "Select a challenge:")]
+
+    if background:
+        # The choice is made here; the detached process cannot prompt.
+        import subprocess
+        import sys
+
+        args = [sys.executable, "-m", "pwnv", "challenge", "fetch"]
+        subprocess.Popen(
+            [*args, *(arg for ch in pending for arg in ("--id", str(ch.id)))],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+        info("Fetching attachments in the background.")
+        return
+
+    left = fetch_challenge_attachments(
+        order_for_prefetch(pending), interactive=not (ids or here)
+    )
+    if left:
+        warn(f"{left} attachments could not be fetched, try again later.")
+    elif not here:
+        success("Attachments fetched.")
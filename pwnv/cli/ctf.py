@@ -19,7 +19,6 @@ def add(name: str) -> None:
         add_ctf,
         add_remote_ctf,
         error,
-        get_ctfs,
         get_ctfs_path,
         is_duplicate,
         prompt_confirm,
@@ -29,7 +28,7 @@ def add(name: str) -> None:
     )
 
     path: Path = (get_ctfs_path() / sanitize(name)).resolve()
-    if is_duplicate(path=path, model_list=get_ctfs()):
+    if is_duplicate(path=path):
         error(f"CTF [cyan]{name}[/] already exists.")
 
         return
@@ -91,15 +90,19 @@ def info_() -> None:
 @ctfs_exists()
 def stop() -> None:
     """Marks a running CTF as stopped."""
+    from datetime import datetime
+
     from pwnv.models.ctf import Status
     from pwnv.utils import (
         get_current_ctf,
         get_running_ctfs,
+        info,
         prompt_ctf_selection,
         success,
         update_ctf,
         warn,
     )
+    from pwnv.utils.archive import apply_archive_policy
 
     running: list[CTF] = get_running_ctfs()
     if not running:
@@ -112,9 +115,13 @@ def stop() -> None:
     else:
         chosen_ctf = prompt_ctf_selection(running, "Select a CTF to stop:")
     chosen_ctf.running = Status.stopped
+    chosen_ctf.stopped_at = datetime.now()
     update_ctf(chosen_ctf)
     success(f"CTF [cyan]{chosen_ctf.name}[/] stopped.")
 
+    for ctf in apply_archive_policy():
+        info(f"CTF [cyan]{ctf.name}[/] archived by the archive policy.")
+
 
 @app.command()
 @config_exists()
@@ -142,24 +149,122 @@ def start() -> None:
     else:
         chosen_ctf = prompt_ctf_selection(stopped, "Select a CTF to start:")
     chosen_ctf.running = Status.running
+    chosen_ctf.stopped_at = None
     update_ctf(chosen_ctf)
     success(f"CTF [cyan]{chosen_ctf.name}[/] started.")
 
 
+@app.command()
+@config_exists()
+def archive(
+    after: int = typer.Option(
+        None,
+        "--after",
+        help="Archive CTFs stopped this many days ago, now and on every stop",
+    ),
+    auto: bool = typer.Option(
+        False, "--auto", help="Only apply the configured archive policy"
+    ),
+) -> None:
+    """Moves stopped CTFs out of the active workspace into the archive."""
+    from pwnv.utils import (
+        get_stopped_ctfs,
+        prompt_confirm,
+        prompt_ctf_selection,
+        set_config_value,
+        success,
+        warn,
+    )
+    from pwnv.utils.archive import (
+        apply_archive_policy,
+        archive_ctf,
+        get_archive_policy,
+    )
+
+    if after is not None:
+        set_config_value("archive_after_days", after)
+        success(f"CTFs stopped more than {after} days ago will be archived.")
+    if after is not None or auto:
+        if get_archive_policy() is None:
+            warn("No archive policy set, configure one with --after.")
+            return
+        archived = apply_archive_policy()
+        for ctf in archived:
+            success(f"CTF [cyan]{ctf.name}[/] archived.")
+        if not archived:
+            warn("No CTFs matched the archive policy.")
+        return
+
+    stopped = get_stopped_ctfs()
+    if not stopped:
+        warn("No stopped CTFs found.")
+        return
+    chosen_ctf = prompt_ctf_selection(stopped, "Select a CTF to archive:")
+    if not prompt_confirm(
+        f"Archive CTF '{chosen_ctf.name}' and all its challenges?", default=True
+    ):
+        return
+    count = archive_ctf(chosen_ctf)
+    success(f"CTF [cyan]{chosen_ctf.name}[/] archived with {count} challenges.")
+
+
+@app.command()
+@config_exists()
+def unarchive(
+    query: str = typer.Argument(
+        "", help="Only offer archived CTFs matching this name, challenge or tag"
+    ),
+) -> None:
+    """Moves an archived CTF back into the workspace (stopped)."""
+    from pwnv.utils import prompt_ctf_selection, success, warn
+    from pwnv.utils.archive import restore_ctf, search_archive
+
+    archived = search_archive(query)
+    if not archived:
+        warn("No archived CTFs found.")
+        return
+    chosen_ctf = prompt_ctf_selection(archived, "Select a CTF to restore:")
+    count = restore_ctf(chosen_ctf)
+    if count is None:
+        return
+    success(f"CTF [cyan]{chosen_ctf.name}[/] restored with {count} challenges.")
+
+
 @app.command()
 @config_exists()
 @ctfs_exists()
-def sync() -> None:
+def sync(
+    refresh: bool = typer.Option(
+        False, "--refresh", help="Detect the platform again instead of using the cache"
+    ),
+    all_ctfs: bool = typer.Option(
+        False, "--all", "-a", help="Sync every running CTF with a remote URL"
+    ),
+    resume: bool = typer.Option(
+        False, "--resume", help="Continue an interrupted import from its checkpoint"
+    ),
+) -> None:
     """Synchronizes challenges for a remote CTF."""
     from pwnv.utils import (
         get_ctfs,
         get_current_ctf,
+        get_running_ctfs,
         prompt_ctf_selection,
+        show_sync_results,
         success,
         sync_remote_ctf,
+        sync_remote_ctfs,
         warn,
     )
 
+    if all_ctfs:
+        remote = [ctf for ctf in get_running_ctfs() if ctf.url]
+        if not remote:
+            warn("No running CTFs with a remote URL found.")
+            return
+        show_sync_results(sync_remote_ctfs(remote, refresh=refresh))
+        return
+
     ctfs = get_ctfs()
     if not ctfs:
         warn("No CTFs found.")
@@ -172,5 +277,43 @@ def sync() -> None:
         warn("Selected CTF has no remote URL.")
         return
 
-    sync_remote_ctf(chosen_ctf)
+    sync_remote_ctf(chosen_ctf, refresh=refresh, resume=resume)
     success(f"CTF [cyan]{chosen_ctf.name}[/] synced.")
+
+
+@app.command()
+@config_exists()
+@ctfs_exists()
+def watch(
+    interval: float = typer.Option(
+        None, "--interval", "-i", help="Seconds between polls while challenges drop"
+    ),
+    max_interval: float = typer.Option(
+        None, "--max-interval", help="Longest wait between polls when idle"
+    ),
+) -> None:
+    """Watches a remote CTF and imports new challenges as they are released."""
+    from pwnv.utils import (
+        get_current_ctf,
+        get_running_ctfs,
+        info,
+        prompt_ctf_selection,
+        warn,
+        watch_remote_ctf,
+    )
+
+    remote = [ctf for ctf in get_running_ctfs() if ctf.url]
+    current = get_current_ctf()
+    if current and current.url:
+        chosen_ctf = current
+    elif remote:
+        chosen_ctf = prompt_ctf_selection(remote, "Select a CTF to watch:")
+    else:
+        warn("No running CTFs with a remote URL found.")
+        return
+
+    info(f"Watching [cyan]{chosen_ctf.name}[/], press Ctrl+C to stop.")
+    try:
+        watch_remote_ctf(chosen_ctf, interval, max_interval)
+    except KeyboardInterrupt:
+        info("Stopped watching.")
@@ -0,0 +1,21 @@
+import typer
+
+from pwnv.utils import config_exists
+
+app = typer.Typer(no_args_is_help=True)
+
+
+@app.command()
+@config_exists()
+def flush() -> None:
+    """
+    Submits the flags queued while a remote CTF was unreachable.
+    """
+    from pwnv.utils import info, show_submissions
+    from pwnv.utils.submissions import flush_submissions
+
+    results = flush_submissions()
+    if not results:
+        info("No queued flags.")
+        return
+    show_submissions(results)
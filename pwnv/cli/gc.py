@@ -0,0 +1,21 @@
+import typer
+
+from pwnv.utils import config_exists
+
+app = typer.Typer(no_args_is_help=True)
+
+
+@app.command()
+@config_exists()
+def gc() -> None:
+    """
+    Deletes stored attachments that no challenge uses any more.
+    """
+    from pwnv.utils import info, success
+    from pwnv.utils.attachments import collect_garbage
+
+    count, freed = collect_garbage()
+    if not count:
+        info("No unused attachments found.")
+        return
+    success(f"Removed {count} unused attachments ({freed / 1024:.1f} KiB).")
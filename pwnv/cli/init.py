@@ -27,6 +27,12 @@ def init(
         "-f",
         help="Directory that will store all CTFs",
     ),
+    storage: str = typer.Option(
+        "json",
+        "--storage",
+        "-s",
+        help="Storage backend for CTFs and challenges (json, sqlite, sharded)",
+    ),
 ) -> None:
     """
     Initializes a new pwnv environment, setting up the necessary directories and
@@ -46,11 +52,19 @@ def init(
         save_config,
         warn,
     )
+    from pwnv.utils.storage import STORAGE_BACKENDS
 
     if not shutil.which("uv"):
         error(f"{command('uv')} binary not found in PATH. Install it first.")
         return
 
+    if storage not in STORAGE_BACKENDS:
+        error(
+            f"Unknown storage backend '{storage}'. "
+            f"Choose one of: {', '.join(STORAGE_BACKENDS)}."
+        )
+        return
+
     cfg_path = get_config_path()
     plugin_folder = cfg_path.parent / DEFAULT_PLUGINS_FOLDER_NAME
     templates_folder = cfg_path.parent / DEFAULT_TEMPLATES_FOLDER_NAME
@@ -77,7 +91,13 @@ def init(
     plugin_folder.mkdir(parents=True, exist_ok=True)
     templates_folder.mkdir(parents=True, exist_ok=True)
 
-    init_model = Init(ctfs_path=ctfs_folder, challenge_tags=[], ctfs=[], challenges=[])
+    init_model = Init(
+        ctfs_path=ctfs_folder,
+        challenge_tags=[],
+        ctfs=[],
+        challenges=[],
+        storage=storage,
+    )
     save_config(init_model.model_dump())
 
     if not (
@@ -0,0 +1,34 @@
+import typer
+
+from pwnv.utils import config_exists
+
+app = typer.Typer(no_args_is_help=True)
+
+
+@app.command()
+@config_exists()
+def migrate(
+    backend: str = typer.Argument(
+        ...,
+        help="Storage backend to move the workspace data to (json, sqlite, sharded)",
+    ),
+) -> None:
+    """
+    Moves all CTFs, challenges and tags to another storage backend.
+    """
+    from pwnv.utils import error, get_config_value, info, success
+    from pwnv.utils.storage import STORAGE_BACKENDS, migrate_storage
+
+    if backend not in STORAGE_BACKENDS:
+        error(
+            f"Unknown storage backend '{backend}'. "
+            f"Choose one of: {', '.join(STORAGE_BACKENDS)}."
+        )
+        return
+
+    if (get_config_value("storage") or "json") == backend:
+        info(f"Workspace already uses the '{backend}' backend.")
+        return
+
+    count = migrate_storage(backend)
+    success(f"Migrated {count} challenges to the '{backend}' backend.")
@@ -15,6 +15,8 @@ from pwnv.utils import (
     success,
     warn,
 )
+from pwnv.utils.archive import get_archive_path
+from pwnv.utils.storage import get_db_path, get_manifest_path
 
 app = typer.Typer(no_args_is_help=True)
 
@@ -74,6 +76,17 @@ def reset(
 
                 shutil.copytree(ctfs_path, tmp / ctfs_path.name, ignore=ignore_pwnvenv)
                 shutil.copy(cfg_path, tmp / cfg_path.name)
+                for data_path in (get_db_path(), get_manifest_path()):
+                    if data_path.exists():
+                        shutil.copy(data_path, tmp / data_path.name)
+                # Archived CTFs exist nowhere but in the archive.
+                archive_path = get_archive_path()
+                if archive_path.exists():
+                    shutil.copytree(
+                        archive_path,
+                        tmp / archive_path.name,
+                        ignore=shutil.ignore_patterns("*.lock"),
+                    )
 
                 shutil.make_archive(str(backup_base), "gztar", root_dir=tmp)
 
@@ -11,36 +11,50 @@ app = typer.Typer(no_args_is_help=True)
 @app.command()
 @config_exists()
 @challenges_exists()
-def solve(flag: str = "") -> None:
+def solve(
+    flag: str = "",
+    batch: str = typer.Option(
+        None,
+        "--batch",
+        "-b",
+        help="File of `challenge,flag` lines to submit at once ('-' for stdin)",
+    ),
+) -> None:
     """
     Marks a challenge as solved,
     optionally submitting the flag to a remote CTF and adding tags.
     """
-    import asyncio
+    if batch:
+        _solve_batch(batch)
+        return
 
     from pwnv.models.challenge import Solved
     from pwnv.utils import (
         add_tags,
+        command,
+        error,
         get_ctf_by_challenge,
         get_current_challenge,
         get_unsolved_challenges,
+        info,
         prompt_challenge_selection,
         prompt_text,
-        remote_solve,
         success,
+        transaction,
         update_challenge,
         warn,
     )
+    from pwnv.utils.resilience import attempt_limit
+    from pwnv.utils.submissions import enqueue_submission, flush_submissions
 
-    unsolved = get_unsolved_challenges()
-    if not unsolved:
-        warn("No unsolved challenges found.")
-
-        return
+    challenge = get_current_challenge()
+    if not challenge or challenge.solved != Solved.unsolved:
+        unsolved = get_unsolved_challenges()
+        if not unsolved:
+            warn("No unsolved challenges found.")
 
-    challenge = (
-        get_current_challenge() if get_current_challenge() in unsolved else None
-    ) or prompt_challenge_selection(unsolved, "Select a challenge:")
+            return
+        challenge = prompt_challenge_selection(unsolved, "Select a challenge:")
 
     challenge.solved = Solved.solved
     if not flag:
@@ -50,14 +64,125 @@ def solve(flag: str = "") -> None:
         challenge.flag = flag
 
     ctf = get_ctf_by_challenge(challenge)
-    if ctf and (ctf.path / ".env").exists():
-        if not asyncio.run(remote_solve(challenge=challenge, ctf=ctf, flag=flag)):
+    if flag and _is_remote(ctf):
+        enqueue_submission(ctf, challenge, flag)
+        # One quick try; if the platform is down the queue takes over.
+        with attempt_limit(1):
+            results = flush_submissions([ctf])
+        result = next(
+            (r for r in results if r.challenge.id == challenge.id and r.flag == flag),
+            None,
+        )
+        if result is None or result.error:
+            challenge.solved = Solved.unsolved
+            info(f"Flag queued, {command('pwnv flush')} submits it later.")
+        elif not result.correct:
+            error(f"Flag [cyan]{flag}[/] incorrect")
             return
+        else:
+            success(f"Flag [cyan]{flag}[/] accepted!")
     raw = prompt_text("Enter tags (comma-separated):")
-    if raw:
-        tags = {t.strip().lower() for t in raw.split(",") if t.strip()}
-        add_tags(tags)
-        challenge.tags = sorted(tags)
+    with transaction():
+        if raw:
+            tags = {t.strip().lower() for t in raw.split(",") if t.strip()}
+            add_tags(tags)
+            challenge.tags = sorted(tags)
+
+        update_challenge(challenge)
+    if challenge.solved == Solved.solved:
+        success(f"[cyan]{challenge.name}[/] marked as solved.")
+
+
+def _is_remote(ctf) -> bool:
+    return bool(
+        ctf
+        and ctf.url
+        and any((ctf.path / name).exists() for name in (".env", ".session"))
+    )
+
+
+def _resolve_challenges(names):
+    """Map each challenge name of a batch to its CTF and challenge.
+
+    A plain name is looked up in the running CTFs; ``ctf/challenge`` picks
+    the CTF explicitly.  Unknown and ambiguous names map to ``None``.
+    """
+    from pwnv.utils import (
+        challenges_for_ctf,
+        get_ctf_by_name,
+        get_running_ctfs,
+        warn,
+    )
+
+    running = {}
+    for ctf in get_running_ctfs():
+        for challenge in challenges_for_ctf(ctf):
+            running.setdefault(challenge.name, []).append((ctf, challenge))
+
+    resolved = {}
+    for name in names:
+        matches = running.get(name, [])
+        if not matches and "/" in name:
+            ctf_name, _, challenge_name = name.partition("/")
+            ctf = get_ctf_by_name(ctf_name)
+            matches = [
+                (ctf, ch)
+                for ch in (challenges_for_ctf(ctf) if ctf else [])
+                if ch.name == challenge_name
+            ]
+        if len(matches) > 1:
+            ctfs = ", ".join(ctf.name for ctf, _ in matches)
+            warn(
+                f"{name!r} is in several running CTFs ({ctfs}), "
+                "qualify it as `ctf/challenge`."
+            )
+        resolved[name] = matches[0] if len(matches) == 1 else None
+    return resolved
+
+
+def _solve_batch(source: str) -> None:
+    """Submit the flags listed in ``source`` and record the accepted ones.
+
+    Local solves are recorded in the transaction of the submitted flags, so
+    the whole batch is one commit.
+    """
+    import sys
+    from pathlib import Path
+
+    from pwnv.models.challenge import Solved
+    from pwnv.utils import show_submissions, success, warn
+    from pwnv.utils.submissions import enqueue_submission, flush_submissions
+
+    text = sys.stdin.read() if source == "-" else Path(source).read_text()
+    lines = []
+    for line in text.splitlines():
+        name, _, flag = (part.strip() for part in line.partition(","))
+        if name and not name.startswith("#"):
+            lines.append((line, name, flag))
+    resolved = _resolve_challenges({name for _, name, _ in lines})
+
+    remote, local = [], []
+    for line, name, flag in lines:
+        if resolved[name] is None or not flag:
+            warn(f"Skipping invalid line: {line!r}")
+            continue
+        ctf, challenge = resolved[name]
+        if _is_remote(ctf):
+            remote.append((ctf, challenge, flag))
+        else:
+            local.append((challenge, flag))
+
+    for ctf, challenge, flag in remote:
+        enqueue_submission(ctf, challenge, flag)
+    for challenge, flag in local:
+        challenge.solved = Solved.solved
+        challenge.flag = flag
+    # Submitting can take a while; the storage lock is only taken afterwards.
+    ctfs = {ctf.id: ctf for ctf, _, _ in remote}
+    results = flush_submissions(
+        list(ctfs.values()), solved=[challenge for challenge, _ in local]
+    )
 
-    update_challenge(challenge)
-    success(f"[cyan]{challenge.name}[/] marked as solved.")
+    for challenge, _ in local:
+        success(f"[cyan]{challenge.name}[/] marked as solved.")
+    show_submissions(results)
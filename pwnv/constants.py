@@ -4,11 +4,21 @@ PWNV_DEBUG_ENV = "PWNV_DEBUG"
 
 # Default paths
 DEFAULT_CONFIG_BASENAME = "pwnv_config.json"
+DEFAULT_DB_BASENAME = "pwnv.db"
+DEFAULT_MANIFEST_BASENAME = "pwnv_manifest.json"
+DEFAULT_SHARD_DIRNAME = ".pwnv"
+DEFAULT_SHARD_BASENAME = "ctf.json"
+DEFAULT_META_BASENAME = "meta.json"
+DEFAULT_QUEUE_BASENAME = "submissions.jsonl"
+DEFAULT_CHECKPOINT_BASENAME = "import.json"
+DEFAULT_REMOTE_CACHE_BASENAME = "remote_cache.json"
 DEFAULT_CTFS_FOLDER_NAME = "CTF"
 DEFAULT_PWNVENV_FOLDER_NAME = ".pwnvenv"
 DEFAULT_PLUGINS_FOLDER_NAME = "plugins"
 DEFAULT_TEMPLATES_FOLDER_NAME = "templates"
 DEFAULT_SELECTION_FILE_NAME = "selection.json"
+DEFAULT_ARCHIVE_FOLDER_NAME = "archive"
+DEFAULT_STORE_FOLDER_NAME = "store"
 
 # Default packages
 DEFAULT_PACKAGES = [
@@ -22,5 +32,30 @@ DEFAULT_PACKAGES = [
     "libdebug",
 ]
 
+# Attachment downloads
+DEFAULT_DOWNLOAD_CONCURRENCY = 8
+DEFAULT_DOWNLOAD_ATTEMPTS = 3
+
+# Concurrent syncs per remote platform for `pwnv ctf sync --all`
+DEFAULT_SYNC_CONCURRENCY = 2
+
+# Retries and circuit breaking for remote platform calls
+DEFAULT_REMOTE_ATTEMPTS = 4
+DEFAULT_BREAKER_THRESHOLD = 5
+DEFAULT_BREAKER_COOLDOWN = 30
+DEFAULT_MAX_RETRY_AFTER = 300
+
+# Flag submissions per second and burst size per remote platform
+DEFAULT_SUBMIT_RATE = 1.0
+DEFAULT_SUBMIT_BURST = 5
+DEFAULT_SUBMIT_ATTEMPTS = 5
+
+# Polling interval bounds (seconds) for `pwnv ctf watch`
+DEFAULT_WATCH_INTERVAL = 30
+DEFAULT_WATCH_MAX_INTERVAL = 300
+
+# Seconds after which cached platform detection results are discarded
+DEFAULT_PLATFORM_CACHE_TTL = 7 * 24 * 60 * 60
+
 # Default template filename
 DEFAULT_TEMPLATE_FILENAME = "solve.py"
@@ -2,7 +2,7 @@ import uuid
 from enum import IntEnum
 from pathlib import Path
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class Category(IntEnum):
@@ -27,7 +27,7 @@ class Solved(IntEnum):
 
 
 class Challenge(BaseModel):
-    id: uuid.UUID | int = uuid.uuid4()
+    id: uuid.UUID | int = Field(default_factory=uuid.uuid4)
     name: str
     flag: str | None = None
     points: int | None = None
@@ -37,3 +37,5 @@ class Challenge(BaseModel):
     path: Path
     tags: list[str] | None = None
     extras: dict | None = None
+    # Keys of large extras kept in the challenge's side file (pwnv.utils.meta).
+    meta_keys: list[str] | None = None
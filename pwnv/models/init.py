@@ -11,3 +11,4 @@ class Init(BaseModel):
     challenge_tags: list[str]
     ctfs: list[CTF] | list[None]
     challenges: list[Challenge] | list[None]
+    storage: str = "json"
@@ -8,13 +8,21 @@ from pwnv.utils.config import (
 )
 from pwnv.utils.crud import (
     add_challenge,
+    add_challenges,
     add_ctf,
     add_tags,
     challenges_for_ctf,
+    count_challenges,
+    count_ctfs,
     ctfs_with_challenges,
+    exists_challenges,
+    exists_ctfs,
+    get_challenge_by_id,
     get_challenge_by_name,
     get_challenges,
+    get_challenges_by_category,
     get_ctf_by_challenge,
+    get_ctf_by_id,
     get_ctf_by_name,
     get_ctfs,
     get_current_challenge,
@@ -27,6 +35,7 @@ from pwnv.utils.crud import (
     is_duplicate,
     remove_challenge,
     remove_ctf,
+    transaction,
     update_challenge,
     update_ctf,
 )
@@ -49,15 +58,22 @@ from pwnv.utils.plugin import (
 )
 from pwnv.utils.remote import (
     add_remote_ctf,
+    fetch_challenge_attachments,
     normalise_category,
+    order_for_prefetch,
     remote_solve,
     sanitize,
+    submit_flag,
+    submit_flags,
     sync_remote_ctf,
+    sync_remote_ctfs,
+    watch_remote_ctf,
 )
 from pwnv.utils.ui import (
     command,
     error,
     info,
+    notify,
     prompt_category_selection,
     prompt_challenge_selection,
     prompt_confirm,
@@ -69,6 +85,8 @@ from pwnv.utils.ui import (
     show_challenge,
     show_ctf,
     show_plugin,
+    show_submissions,
+    show_sync_results,
     success,
     warn,
 )
@@ -83,9 +101,14 @@ __all__ = [
     "set_config_value",
     # crud
     "add_challenge",
+    "add_challenges",
     "add_ctf",
     "add_tags",
     "challenges_for_ctf",
+    "count_challenges",
+    "count_ctfs",
+    "exists_challenges",
+    "exists_ctfs",
     "ctfs_with_challenges",
     "get_challenges",
     "get_ctf_by_challenge",
@@ -100,9 +123,13 @@ __all__ = [
     "is_duplicate",
     "remove_challenge",
     "remove_ctf",
+    "transaction",
     "update_challenge",
     "update_ctf",
+    "get_challenge_by_id",
     "get_challenge_by_name",
+    "get_challenges_by_category",
+    "get_ctf_by_id",
     "get_ctf_by_name",
     # guards
     "challenges_exists",
@@ -111,10 +138,16 @@ __all__ = [
     "plugins_exists",
     # remote
     "add_remote_ctf",
+    "fetch_challenge_attachments",
     "normalise_category",
+    "order_for_prefetch",
     "remote_solve",
     "sanitize",
+    "submit_flag",
+    "submit_flags",
     "sync_remote_ctf",
+    "sync_remote_ctfs",
+    "watch_remote_ctf",
     # ui
     "prompt_confirm",
     "error",
@@ -130,8 +163,11 @@ __all__ = [
     "success",
     "warn",
     "info",
+    "notify",
     "command",
     "show_plugin",
+    "show_submissions",
+    "show_sync_results",
     # plugin
     "get_plugins_directory",
     "get_templates_directory",
@@ -0,0 +1,201 @@
+"""Cold storage for stopped CTFs.
+
+Archiving moves a CTF and its challenges out of the active storage into a
+gzip-compressed file under the ``archive`` folder next to the config, so
+everyday commands no longer load them.  A small summary index (CTF records
+plus the name, category, state and tags of each challenge) keeps archived
+CTFs searchable without opening the compressed files; the full records are
+only read by commands that explicitly ask for archived data.
+
+The directories of archived CTFs are left untouched on disk.
+"""
+
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List
+
+from pwnv.models import CTF, Challenge
+from pwnv.models.ctf import Status
+
+_SUMMARY_FIELDS = ("id", "name", "category", "solved", "tags")
+
+
+def get_archive_path() -> Path:
+    """Return the folder holding the archived CTFs."""
+    from pwnv.constants import DEFAULT_ARCHIVE_FOLDER_NAME
+    from pwnv.utils.config import get_config_path
+
+    return get_config_path().parent / DEFAULT_ARCHIVE_FOLDER_NAME
+
+
+def _index_path() -> Path:
+    return get_archive_path() / "index.json"
+
+
+def _lock():
+    from filelock import SoftFileLock
+
+    return SoftFileLock(f"{_index_path()}.lock")
+
+
+def _load_index() -> List[dict]:
+    import json
+
+    try:
+        return json.loads(_index_path().read_text())["ctfs"]
+    except (FileNotFoundError, ValueError):
+        return []
+
+
+def _load_bundle(ctf_id, name: str) -> dict | None:
+    """Return the archived records of a CTF, ``None`` if its file is gone."""
+    import gzip
+    import json
+
+    from pwnv.utils.ui import warn
+
+    try:
+        with gzip.open(get_archive_path() / f"{ctf_id}.json.gz", "rb") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        warn(f"The archive of CTF {name} is missing, skipping it.")
+        return None
+
+
+# [READ]
+def get_archived_ctfs() -> List[CTF]:
+    """Return the archived CTFs, read from the summary index."""
+    from pwnv.utils.repository import ctf_from_record
+
+    return [ctf_from_record(entry) for entry in _load_index()]
+
+
+def get_archived_ctf(ctf_id) -> CTF | None:
+    return next((ctf for ctf in get_archived_ctfs() if ctf.id == ctf_id), None)
+
+
+def search_archive(query: str) -> List[CTF]:
+    """Return archived CTFs whose name, challenge names or tags match ``query``.
+
+    Only the summary index is read.
+    """
+    from pwnv.utils.repository import ctf_from_record
+
+    query = query.lower()
+
+    def _matches(entry: dict) -> bool:
+        words = [entry["name"]]
+        for ch in entry["challenges"]:
+            words += [ch["name"], *(ch["tags"] or [])]
+        return any(query in word.lower() for word in words)
+
+    return [ctf_from_record(e) for e in _load_index() if _matches(e)]
+
+
+def get_archived_challenges(ctf: CTF | None = None) -> List[Challenge]:
+    """Return the full challenge records of ``ctf`` or of every archived CTF."""
+    from pwnv.utils.repository import challenge_from_record
+
+    ctfs = (
+        [(ctf.id, ctf.name)] if ctf else [(e["id"], e["name"]) for e in _load_index()]
+    )
+    bundles = [_load_bundle(ctf_id, name) for ctf_id, name in ctfs]
+    return [
+        challenge_from_record(record)
+        for bundle in bundles
+        if bundle is not None
+        for record in bundle["challenges"]
+    ]
+
+
+# [WRITE]
+def archive_ctf(ctf: CTF) -> int:
+    """Move ``ctf`` and its challenges to the archive.
+
+    Returns the number of archived challenges.
+    """
+    from pwnv.utils.config import write_json
+    from pwnv.utils.storage import get_storage
+
+    storage = get_storage()
+    if ctf.running == Status.running:
+        ctf.running = Status.stopped
+        ctf.stopped_at = datetime.now()
+    record = ctf.model_dump(mode="json")
+    challenges = [
+        ch.model_dump(mode="json") for ch in storage.challenges_for_ctf(ctf.id)
+    ]
+    with _lock():
+        write_json(
+            get_archive_path() / f"{ctf.id}.json.gz",
+            {"ctf": record, "challenges": challenges},
+            compress=True,
+        )
+        index = [e for e in _load_index() if e["id"] != record["id"]]
+        summaries = [{k: ch[k] for k in _SUMMARY_FIELDS} for ch in challenges]
+        index.append({**record, "challenges": summaries})
+        write_json(_index_path(), {"ctfs": index})
+        storage.remove_ctf(ctf)
+    return len(challenges)
+
+
+def restore_ctf(ctf: CTF) -> int | None:
+    """Move an archived ``ctf`` back to the active storage, stopped.
+
+    Returns the number of restored challenges, ``None`` if its archive file
+    is missing.
+    """
+    from pwnv.utils.config import write_json
+    from pwnv.utils.repository import challenge_from_record, ctf_from_record
+    from pwnv.utils.storage import get_storage
+
+    with _lock():
+        bundle = _load_bundle(ctf.id, ctf.name)
+        if bundle is None:
+            return None
+        challenges = [challenge_from_record(ch) for ch in bundle["challenges"]]
+        get_storage().import_records(
+            [ctf_from_record(bundle["ctf"])], challenges, set()
+        )
+        index = [e for e in _load_index() if e["id"] != str(ctf.id)]
+        write_json(_index_path(), {"ctfs": index})
+        (get_archive_path() / f"{ctf.id}.json.gz").unlink()
+    return len(challenges)
+
+
+def get_archive_policy() -> int | None:
+    """Return after how many days stopped CTFs are archived, if at all."""
+    from pwnv.utils.config import get_config_value
+
+    return get_config_value("archive_after_days")
+
+
+def _stopped_at(ctf: CTF) -> datetime:
+    """Return when ``ctf`` was stopped.
+
+    CTFs stopped before that was recorded fall back to when their directory
+    last changed, then to their creation.
+    """
+    if ctf.stopped_at is not None:
+        return ctf.stopped_at
+    try:
+        return datetime.fromtimestamp(ctf.path.stat().st_mtime)
+    except OSError:
+        return ctf.created_at
+
+
+def apply_archive_policy(now: datetime | None = None) -> List[CTF]:
+    """Archive the CTFs stopped longer ago than the policy allows.
+
+    Returns the archived CTFs.
+    """
+    from pwnv.utils.crud import get_stopped_ctfs
+
+    days = get_archive_policy()
+    if days is None:
+        return []
+    cutoff = (now or datetime.now()) - timedelta(days=days)
+    expired = [ctf for ctf in get_stopped_ctfs() if _stopped_at(ctf) <= cutoff]
+    for ctf in expired:
+        archive_ctf(ctf)
+    return expired
@@ -0,0 +1,284 @@
+"""Content-addressed store for downloaded attachments.
+
+Attachments are identified by their SHA-256 and cloned into the challenge
+directories using them.  On Linux file systems with reflinks (btrfs, XFS)
+one copy is kept under ``store/blobs`` next to the config and the clones
+share its data blocks until one is modified.  Elsewhere no blob is kept, as
+it would only double the disk used: the download goes to the challenge and
+further challenges get plain copies of an unmodified one.  Either way each
+challenge gets its own writable file, so ``chmod +x`` or patching a binary
+in one challenge leaves the others and the store alone.
+
+An index maps attachment sources (platform hash or URL) to hashes, so a
+known attachment is copied without downloading it again.  Downloads are
+staged in a directory derived from the source; files a previous attempt
+already finished there are picked up instead of being downloaded again.
+Concurrent fetches of the same source wait for each other.
+
+The copies of each hash are recorded in ``refs.json``; a blob none of whose
+copies exist any more is what :func:`collect_garbage` prunes.  Both files
+are written by :func:`flush_store` once a batch of downloads is done.
+"""
+
+import asyncio
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+_locks: Dict[str, asyncio.Lock] = {}
+
+_HASH_FIELDS = ("sha256", "hash", "checksum")
+
+
+class MissingAttachmentError(Exception):
+    """Raised when a download ``ctfbridge`` swallowed the error of left no file.
+
+    Nothing says whether that failure was transient, so it is not retried
+    (see :func:`pwnv.utils.resilience.classify`).
+    """
+
+
+def get_store_path() -> Path:
+    from pwnv.constants import DEFAULT_STORE_FOLDER_NAME
+    from pwnv.utils.config import get_config_path
+
+    return get_config_path().parent / DEFAULT_STORE_FOLDER_NAME
+
+
+def _blob_path(sha: str) -> Path:
+    return get_store_path() / "blobs" / sha[:2] / sha
+
+
+def _index_path() -> Path:
+    return get_store_path() / "index.json"
+
+
+# The index and the references are loaded once and written back by
+# :func:`flush_store`, not after every file of a download batch.
+_index: Dict[str, str] | None = None
+_refs: Dict[str, List[str]] | None = None
+_dirty = False
+
+
+def _load_index() -> Dict[str, str]:
+    global _index
+    if _index is None:
+        try:
+            _index = json.loads(_index_path().read_text())
+        except (FileNotFoundError, ValueError):
+            _index = {}
+    return _index
+
+
+def _refs_path() -> Path:
+    return get_store_path() / "refs.json"
+
+
+def _load_refs() -> Dict[str, List[str]]:
+    global _refs
+    if _refs is None:
+        try:
+            _refs = json.loads(_refs_path().read_text())
+        except (FileNotFoundError, ValueError):
+            _refs = {}
+    return _refs
+
+
+def _remember(source: str, sha: str) -> None:
+    global _dirty
+    _load_index()[source] = sha
+    _dirty = True
+
+
+def _add_ref(sha: str, dest: Path) -> None:
+    global _dirty
+    paths = _load_refs().setdefault(sha, [])
+    if str(dest) not in paths:
+        paths.append(str(dest))
+        _dirty = True
+
+
+def flush_store() -> None:
+    """Write the index and references changed since the last flush."""
+    global _index, _refs, _dirty
+    from pwnv.utils.config import write_json
+
+    if _dirty:
+        write_json(_index_path(), _load_index())
+        write_json(_refs_path(), _load_refs())
+    _index = _refs = None
+    _dirty = False
+
+
+def _source(att: Any) -> Tuple[str, str | None]:
+    """Return the index key of ``att`` and the SHA-256 the platform gave, if any."""
+    dump = att.model_dump(mode="json")
+    known = next(
+        (
+            str(dump[field]).lower()
+            for field in _HASH_FIELDS
+            if len(str(dump.get(field) or "")) == 64
+        ),
+        None,
+    )
+    url = dump.get("url") or (dump.get("download_info") or {}).get("url")
+    if known:
+        return f"sha256:{known}", known
+    return url or json.dumps(dump, sort_keys=True), None
+
+
+def hash_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _reflink(src: Path, dest: Path) -> bool:
+    """Make ``dest`` share ``src``'s data blocks; return whether it could."""
+    ficlone = 0x40049409  # FICLONE ioctl, Linux only
+    try:
+        import fcntl
+    except ImportError:
+        return False
+    with open(src, "rb") as fsrc, open(dest, "wb") as fdst:
+        try:
+            fcntl.ioctl(fdst.fileno(), ficlone, fsrc.fileno())
+            return True
+        except OSError:
+            pass
+    dest.unlink()
+    return False
+
+
+def _clone(src: Path, dest: Path) -> None:
+    """Copy ``src`` to ``dest``, sharing its blocks where the file system can."""
+    import shutil
+
+    if not _reflink(src, dest):
+        shutil.copyfile(src, dest)
+
+
+def _stored_copy(sha: str) -> Path | None:
+    """Return the blob of ``sha``, else an unmodified copy of it, if any."""
+    blob = _blob_path(sha)
+    if blob.exists():
+        return blob
+    for path in map(Path, _load_refs().get(sha, [])):
+        if path.is_file() and hash_file(path) == sha:
+            return path
+    return None
+
+
+def link_blob(sha: str, src: Path, dest: Path) -> None:
+    """Make ``dest`` a writable copy of ``src``, stored as ``sha``."""
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    dest.unlink(missing_ok=True)
+    _clone(src, dest)
+    _add_ref(sha, dest)
+
+
+def add_download(path: Path, dest: Path) -> str:
+    """Move the downloaded file at ``path`` to ``dest`` and return its SHA-256.
+
+    It is only kept in the store as well if ``dest`` can share its blocks;
+    without reflinks the store would double the disk used, so copies are
+    made from a challenge's unmodified file instead.
+    """
+    import shutil
+
+    sha = hash_file(path)
+    blob = _blob_path(sha)
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    dest.unlink(missing_ok=True)
+    if blob.exists():
+        path.unlink()
+        _clone(blob, dest)
+    elif _reflink(path, dest):
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        path.replace(blob)
+        blob.chmod(0o444)
+    else:
+        shutil.move(path, dest)
+    _add_ref(sha, dest)
+    return sha
+
+
+async def fetch_attachment(client: Any, att: Any, save_dir: Path) -> None:
+    """Place ``att`` in ``save_dir``, downloading it only if it is not stored."""
+    source, known = _source(att)
+    key = hashlib.sha256(source.encode()).hexdigest()[:32]
+    # The staging directory is per source, so one download at a time may use it.
+    async with _locks.setdefault(key, asyncio.Lock()):
+        await _fetch(client, att, save_dir, source, known, key)
+
+
+async def _fetch(
+    client: Any, att: Any, save_dir: Path, source: str, known: str | None, key: str
+) -> None:
+    sha = known or _load_index().get(source)
+    name = att.model_dump(mode="json").get("name")
+    if sha and name and (copy := _stored_copy(sha)):
+        link_blob(sha, copy, save_dir / Path(name).name)
+        return
+
+    staging = get_store_path() / "partial" / key
+    staging.mkdir(parents=True, exist_ok=True)
+    if not _finished(staging):
+        await _download(client, att, staging)
+        if not _finished(staging):
+            raise MissingAttachmentError(f"download of {source} produced no file")
+    for file in _finished(staging):
+        _remember(source, add_download(file, save_dir / file.name))
+    for leftover in staging.iterdir():
+        leftover.unlink()
+    staging.rmdir()
+
+
+async def _download(client: Any, att: Any, staging: Path) -> None:
+    """Download ``att`` into ``staging``.
+
+    ``download()`` logs and swallows every failure, so for plain HTTP files
+    its ``_download_http`` step is used directly: the error then tells an
+    outage (retried) from a file that is gone (not retried).
+    """
+    service = client.attachments
+    kind = getattr(getattr(att, "download_info", None), "type", None)
+    if kind == "http" and hasattr(service, "_download_http"):
+        await service._download_http(att, staging)
+    else:
+        await service.download(att, str(staging))
+
+
+def _finished(staging: Path) -> list:
+    return [f for f in sorted(staging.iterdir()) if f.is_file() and f.suffix != ".part"]
+
+
+def collect_garbage() -> Tuple[int, int]:
+    """Delete blobs none of whose copies exist any more.
+
+    Returns the number of deleted blobs and the bytes freed.
+    """
+    global _dirty
+
+    blobs = get_store_path() / "blobs"
+    refs = _load_refs()
+    for sha, paths in list(refs.items()):
+        refs[sha] = [path for path in paths if Path(path).exists()]
+        if not refs[sha]:
+            del refs[sha]
+    removed, freed = set(), 0
+    for blob in blobs.glob("*/*") if blobs.exists() else ():
+        if blob.name not in refs:
+            freed += blob.stat().st_size
+            blob.unlink()
+            removed.add(blob.name)
+    index = _load_index()
+    for source, sha in list(index.items()):
+        if sha not in refs and not _blob_path(sha).exists():
+            del index[source]
+    _dirty = True
+    flush_store()
+    return len(removed), freed
@@ -0,0 +1,103 @@
+"""Checkpoints of remote imports, so an interrupted import can be resumed.
+
+While challenges are imported, ``.pwnv/import.json`` in the CTF directory
+records the challenge details fetched so far and the attachment downloads
+still outstanding.  The next sync re-queues the outstanding downloads; with
+``--resume`` it also reuses the fetched details instead of requesting them
+again.  The checkpoint is removed once an import completes.
+"""
+
+import json
+import time
+from pathlib import Path
+from typing import Any, List, Tuple
+
+from pwnv.models import CTF
+
+
+def get_checkpoint_path(ctf: CTF) -> Path:
+    from pwnv.constants import DEFAULT_CHECKPOINT_BASENAME, DEFAULT_SHARD_DIRNAME
+
+    return ctf.path / DEFAULT_SHARD_DIRNAME / DEFAULT_CHECKPOINT_BASENAME
+
+
+class ImportCheckpoint:
+    """Progress of the import into ``ctf``, saved at most once per second.
+
+    Unless ``resume`` is set, details fetched by an earlier run are dropped;
+    outstanding downloads are always kept.
+    """
+
+    def __init__(self, ctf: CTF, resume: bool = False):
+        self.path = get_checkpoint_path(ctf)
+        try:
+            data = json.loads(self.path.read_text())
+        except (FileNotFoundError, ValueError):
+            data = {}
+        self.exists = bool(data)
+        self.details = data.get("details", {}) if resume else {}
+        self.downloads = data.get("downloads", {})
+        self._saved_at = 0.0
+
+    def get_detail(self, slug) -> Any | None:
+        """Return the remote challenge ``slug`` as fetched before, if known."""
+        from ctfbridge.models.challenge import Challenge as RemoteChallenge
+
+        dump = self.details.get(str(slug))
+        if dump is None:
+            return None
+        try:
+            # Attachment collections dump to a bare list.
+            attachments = {"attachments": dump.get("attachments") or []}
+            return RemoteChallenge.model_validate({**dump, "attachments": attachments})
+        except ValueError:
+            return None
+
+    def add_detail(self, ch) -> None:
+        self.details[str(ch.id)] = ch.model_dump(mode="json")
+        self.save()
+
+    def add_downloads(self, jobs) -> None:
+        for att, save_dir in jobs:
+            entry = {"dir": str(save_dir), "attachment": att.model_dump(mode="json")}
+            self.downloads[json.dumps(entry, sort_keys=True)] = entry
+        self.save(force=True)
+
+    def finish_download(self, att, save_dir: Path) -> None:
+        entry = {"dir": str(save_dir), "attachment": att.model_dump(mode="json")}
+        self.downloads.pop(json.dumps(entry, sort_keys=True), None)
+        self.save()
+
+    def pending_downloads(self) -> List[Tuple[Any, Path]]:
+        """Return the downloads an earlier run did not finish.
+
+        Downloads into challenges removed since are dropped.
+        """
+        from ctfbridge.models.challenge import Attachment
+
+        self.downloads = {
+            key: entry
+            for key, entry in self.downloads.items()
+            if Path(entry["dir"]).is_dir()
+        }
+        return [
+            (Attachment.model_validate(entry["attachment"]), Path(entry["dir"]))
+            for entry in self.downloads.values()
+        ]
+
+    def save(self, force: bool = False) -> None:
+        from pwnv.utils.config import write_json
+
+        if not force and time.monotonic() - self._saved_at < 1:
+            return
+        if self.details or self.downloads:
+            write_json(
+                self.path, {"details": self.details, "downloads": self.downloads}
+            )
+            self.exists = True
+        self._saved_at = time.monotonic()
+
+    def clear(self) -> None:
+        """Forget the checkpoint after a completed import."""
+        self.path.unlink(missing_ok=True)
+        self.details, self.downloads, self.exists = {}, {}, False
@@ -3,22 +3,48 @@
 The configuration is stored as JSON on disk.  This module resolves the
 location of that file, exposes helpers to read and write it and provides
 simple accessor helpers used across the code base.
+
+Every write bumps the ``version`` stored in the file.  Writers only hold the
+lock for a compare-and-swap of the file itself; if another process committed
+in the meantime the mutations are replayed on its version, so concurrent
+``pwnv`` invocations don't lose each other's updates.
+
+A ``marshal`` snapshot of the parsed config, plus plain data derived from
+it (see :func:`load_derived`), is kept next to the file and keyed on its
+inode, mtime and size, so warm starts skip JSON parsing and rebuilding.
+It is written once per config version: when derived data is first built,
+or at exit if nothing was.
 """
 
+import atexit
+import os
+from contextlib import contextmanager
 from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Dict, Iterator, List, Tuple
 
-from dotenv import load_dotenv
 from filelock import SoftFileLock
 
-load_dotenv()
+
+def _load_dotenv_settings() -> None:
+    """Export the ``PWNV_*`` settings of a ``.env`` in the working directory.
+
+    Nothing else is loaded into the environment: a CTF's ``.env`` holds its
+    credentials, which are read per CTF by :mod:`pwnv.utils.credentials`.
+    """
+    from dotenv import dotenv_values, find_dotenv
+
+    path = find_dotenv(usecwd=True)
+    for key, value in dotenv_values(path).items() if path else ():
+        if key.startswith("PWNV_") and value is not None:
+            os.environ.setdefault(key, value)
+
+
+_load_dotenv_settings()
 
 
 def _resolve_config_path() -> Path:
     """Return the path of the configuration file."""
-    import os
-
     import typer
 
     from pwnv.constants import DEFAULT_CONFIG_BASENAME, PWNV_CONFIG_ENV, PWNV_DEBUG_ENV
@@ -40,44 +66,306 @@ def _resolve_config_path() -> Path:
 config_path: Path = _resolve_config_path()
 config_path.parent.mkdir(parents=True, exist_ok=True)
 _lock = SoftFileLock(str(config_path) + ".lock")
+_pending: List[Callable[[dict], None]] | None = None
+
+
+_MAX_COMMIT_ATTEMPTS = 5
+_SNAPSHOT_FORMAT = 3
+
+Signature = Tuple[int, int, int]
+
+_dirty = 0
+_derived: Dict[str, Any] = {}
+_derived_generation: Tuple[Signature | None, int] | None = None
+# Fingerprinted derived values, kept across config versions: key -> (fp, value).
+_carried: Dict[str, Tuple[Any, Any]] = {}
+_snapshot_saved = True
+
+
+class ConfigConflictError(RuntimeError):
+    """Raised when a commit cannot be merged with a concurrent one."""
+
+
+def _signature(st: os.stat_result) -> Signature:
+    return st.st_ino, st.st_mtime_ns, st.st_size
+
+
+def _file_signature() -> Signature | None:
+    """Return the identity of the config file currently on disk."""
+    try:
+        return _signature(config_path.stat())
+    except FileNotFoundError:
+        return None
+
+
+def get_snapshot_path() -> Path:
+    """Return the path of the binary snapshot kept next to the config."""
+    return config_path.with_name(config_path.name + ".cache")
+
+
+def _load_snapshot(signature: Signature) -> dict | None:
+    """Return the snapshot taken of the config file ``signature``, if any.
+
+    The fingerprinted values of a stale snapshot are picked up either way.
+    """
+    import marshal
+
+    try:
+        fmt, key, snapshot = marshal.loads(get_snapshot_path().read_bytes())
+    except Exception:
+        return None
+    if fmt != _SNAPSHOT_FORMAT:
+        return None
+    for name, carried in snapshot.get("carried", {}).items():
+        _carried.setdefault(name, carried)
+    return snapshot if key == signature else None
+
+
+def _save_snapshot(signature: Signature, snapshot: dict) -> None:
+    """Store ``snapshot`` (plain data only) for the config file ``signature``."""
+    import marshal
+    from tempfile import NamedTemporaryFile
+
+    try:
+        with NamedTemporaryFile("wb", dir=config_path.parent, delete=False) as tmp:
+            marshal.dump((_SNAPSHOT_FORMAT, signature, snapshot), tmp)
+        Path(tmp.name).replace(get_snapshot_path())
+    except (OSError, ValueError):
+        pass
 
 
 @lru_cache(maxsize=1)
-def load_config() -> dict:
-    """Load and return the JSON configuration as a dictionary."""
+def _read_config() -> Tuple[dict, Signature | None, dict]:
+    """Return the config, the signature of its file and the snapshot data.
+
+    When the snapshot matches the file on disk the JSON is not parsed at all;
+    otherwise the file is parsed and a fresh snapshot is taken.
+    """
     import json
 
-    if not config_path.exists():
-        return {"ctfs": [], "challenges": [], "challenge_tags": []}
-    with open(config_path) as f:
-        return json.load(f)
+    global _snapshot_saved
+
+    signature = _file_signature()
+    if signature is not None and (snapshot := _load_snapshot(signature)):
+        return snapshot.pop("config"), signature, snapshot
+
+    try:
+        with open(config_path) as f:
+            cfg, signature = json.load(f), _signature(os.fstat(f.fileno()))
+    except FileNotFoundError:
+        return {"ctfs": [], "challenges": [], "challenge_tags": []}, None, {}
+    _snapshot_saved = False
+    return cfg, signature, {}
+
+
+def _flush_snapshot() -> None:
+    """Snapshot a config parsed by this process if nothing else did."""
+    if _snapshot_saved or _dirty:
+        return
+    cfg, signature, snapshot = _read_config()
+    if signature is not None and signature == _file_signature():
+        _save_snapshot(signature, {"config": cfg, **snapshot, "carried": _carried})
+
+
+atexit.register(_flush_snapshot)
+
+
+def load_config() -> dict:
+    """Load and return the JSON configuration as a dictionary.
+
+    Reads never take the lock: writers replace the file atomically, so a
+    reader always sees one complete version.
+    """
+    return _read_config()[0]
+
+
+def get_config_version() -> int:
+    """Return the version of the loaded configuration."""
+    return load_config().get("version", 0)
+
+
+def get_config_generation() -> Tuple[Signature | None, int]:
+    """Return a key that changes whenever the loaded configuration does.
+
+    It covers both new versions on disk and uncommitted in-memory changes.
+    """
+    return _read_config()[1], _dirty
+
+
+def load_derived(key: str, build: Callable[[dict], Any], persist: bool = True) -> Any:
+    """Return ``build(cfg)``, computed once per config generation.
+
+    With ``persist`` the value derived from a clean (committed) config is
+    also stored in the snapshot, so later invocations get it without parsing
+    or rebuilding anything; it must then be plain data (``marshal``-able).
+    ``build`` must not mutate ``cfg``.
+    """
+    return load_derived_many({key: build}, persist)[key]
+
+
+def load_derived_many(
+    builders: Dict[str, Callable[[dict], Any]],
+    persist: bool = True,
+    fingerprints: Dict[str, Callable[[dict], Any]] | None = None,
+) -> Dict[str, Any]:
+    """Return the values of :func:`load_derived` for several ``builders``.
+
+    Everything missing is built before the snapshot is saved, once.  A value
+    with an entry in ``fingerprints`` survives new config versions: it is
+    only rebuilt when its fingerprint of the config changes.
+    """
+    global _derived_generation, _snapshot_saved
+
+    generation = get_config_generation()
+    if generation != _derived_generation:
+        _derived.clear()
+        _derived_generation = generation
+    missing = [key for key in builders if key not in _derived]
+    if not missing:
+        return {key: _derived[key] for key in builders}
+
+    cfg, signature, snapshot = _read_config()
+    persist = persist and not _dirty and signature is not None
+    built = False
+    for key in missing:
+        if persist and key in snapshot:
+            _derived[key] = snapshot[key]
+            continue
+        fingerprint = (fingerprints or {}).get(key)
+        fp = fingerprint(cfg) if fingerprint else None
+        if fingerprint and key in _carried and _carried[key][0] == fp:
+            value = _carried[key][1]
+        else:
+            value = builders[key](cfg)
+        if fingerprint:
+            _carried[key] = (fp, value)
+        _derived[key] = value
+        if persist:
+            snapshot[key] = value
+            built = True
+    if built or (persist and not _snapshot_saved):
+        _save_snapshot(signature, {"config": cfg, **snapshot, "carried": _carried})
+        _snapshot_saved = True
+    return {key: _derived[key] for key in builders}
 
 
 def _invalidate_cache() -> None:
     """Clear the cached configuration."""
-    load_config.cache_clear()
+    global _dirty
 
+    _read_config.cache_clear()
+    _dirty = 0
 
-def save_config(cfg: dict) -> None:
-    """Write ``cfg`` to disk atomically and invalidate the cache."""
+
+def write_json(path: Path, data: Any, compress: bool = False) -> None:
+    """Atomically replace ``path`` with ``data`` serialized as JSON.
+
+    With ``compress`` the file is gzip-compressed.
+    """
+    import gzip
     import json
-    import os
     from tempfile import NamedTemporaryFile
 
+    payload = json.dumps(data, indent=None if compress else 4, default=str).encode()
+    if compress:
+        payload = gzip.compress(payload)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with NamedTemporaryFile("wb", dir=path.parent, delete=False) as tmp:
+        tmp.write(payload)
+        tmp.flush()
+        os.fsync(tmp.fileno())
+    Path(tmp.name).replace(path)
+
+
+def _write(cfg: dict) -> None:
+    """Atomically replace the config file with ``cfg``. Needs the lock."""
     cfg.setdefault("ctfs", [])
     cfg.setdefault("challenges", [])
     cfg.setdefault("challenge_tags", [])
+    write_json(config_path, cfg)
 
+
+def save_config(cfg: dict) -> None:
+    """Write ``cfg`` to disk atomically and invalidate the cache.
+
+    This overwrites whatever is on disk; use :func:`update_config` to change
+    the configuration without losing concurrent edits.
+    """
     with _lock:
-        cfg_json = json.dumps(cfg, indent=4, default=str)
-        with NamedTemporaryFile(
-            "w", dir=config_path.parent, delete=False, encoding="utf-8"
-        ) as tmp:
-            tmp.write(cfg_json)
-            tmp.flush()
-            os.fsync(tmp.fileno())
-        Path(tmp.name).replace(config_path)
+        cfg["version"] = cfg.get("version", 0) + 1
+        _write(cfg)
+    _invalidate_cache()
+
+
+def _commit(mutations: List[Callable[[dict], None]]) -> None:
+    """Persist the working copy with a compare-and-swap on the file.
+
+    The swap only happens if nobody committed since the copy was read.
+    Otherwise the latest version is reloaded, ``mutations`` are replayed on
+    top of it and the swap is attempted again.
+    """
+    cfg, signature, _ = _read_config()
+    for _ in range(_MAX_COMMIT_ATTEMPTS):
+        with _lock:
+            if _file_signature() == signature:
+                cfg["version"] = cfg.get("version", 0) + 1
+                _write(cfg)
+                _invalidate_cache()
+                return
+        _invalidate_cache()
+        cfg, signature, _ = _read_config()
+        for mutate in mutations:
+            mutate(cfg)
     _invalidate_cache()
+    raise ConfigConflictError("Config kept changing while committing; try again.")
+
+
+def update_config(mutate: Callable[[dict], None]) -> None:
+    """Apply ``mutate`` to the configuration and persist the result.
+
+    ``mutate`` may be replayed on a newer version of the configuration if a
+    concurrent process committed first, so it must only describe the change
+    (e.g. "replace record X") instead of relying on a previously read state.
+    Inside :func:`transaction` the mutation only touches the in-memory copy
+    and is written together with the rest of the batch.
+    """
+    global _dirty
+
+    mutate(load_config())
+    _dirty += 1
+    if _pending is None:
+        try:
+            _commit([mutate])
+        except BaseException:
+            _invalidate_cache()
+            raise
+    else:
+        _pending.append(mutate)
+
+
+@contextmanager
+def transaction() -> Iterator[None]:
+    """Collect every :func:`update_config` call into one atomic write.
+
+    Nested transactions join the outermost one.  If the block raises, the
+    collected mutations are discarded.
+    """
+    global _pending
+
+    if _pending is not None:
+        yield
+        return
+
+    _pending = []
+    try:
+        yield
+        if _pending:
+            _commit(_pending)
+    except BaseException:
+        _invalidate_cache()
+        raise
+    finally:
+        _pending = None
 
 
 def get_config_path() -> Path:
@@ -99,6 +387,8 @@ def get_config_value(key: str) -> Any:
 
 def set_config_value(key: str, value: Any) -> None:
     """Set a ``key`` in the configuration and persist it."""
-    config = load_config()
-    config[key] = value
-    save_config(config)
+
+    def _set(cfg: dict) -> None:
+        cfg[key] = value
+
+    update_config(_set)
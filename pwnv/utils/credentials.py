@@ -0,0 +1,76 @@
+"""Per-CTF credentials stored in the ``.env`` file of each CTF directory.
+
+The files are parsed with ``dotenv_values`` instead of being loaded into the
+process environment, so CTFs handled by the same process (e.g. by
+``pwnv ctf sync --all``) never see each other's credentials.  Each file is
+parsed once and cached until it changes on disk.
+"""
+
+from pathlib import Path
+from typing import Dict, NamedTuple, Tuple
+
+from pwnv.models import CTF
+
+_ENV_KEYS = {
+    "username": "CTF_USERNAME",
+    "password": "CTF_PASSWORD",
+    "token": "CTF_TOKEN",
+}
+
+
+class Credentials(NamedTuple):
+    """Login data of one CTF; unused fields are ``None``."""
+
+    username: str | None = None
+    password: str | None = None
+    token: str | None = None
+
+    def login_kwargs(self) -> Dict[str, str]:
+        """Return the fields to pass to ``client.auth.login``."""
+        return {k: v for k, v in self._asdict().items() if v}
+
+
+_cache: Dict[Path, Tuple[Tuple[int, int], Credentials]] = {}
+
+
+def get_credentials_path(ctf: CTF) -> Path:
+    return ctf.path / ".env"
+
+
+def get_credentials(ctf: CTF) -> Credentials | None:
+    """Return the stored credentials of ``ctf``, or ``None`` if it has none."""
+    from dotenv import dotenv_values
+
+    path = get_credentials_path(ctf)
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        _cache.pop(path, None)
+        return None
+    key = (stat.st_mtime_ns, stat.st_size)
+    cached = _cache.get(path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    values = dotenv_values(path)
+    creds = Credentials(**{f: values.get(env) or None for f, env in _ENV_KEYS.items()})
+    _cache[path] = (key, creds)
+    return creds
+
+
+def save_credentials(ctf: CTF, creds: Credentials) -> None:
+    """Store ``creds`` in the ``.env`` file of ``ctf``, readable by the owner."""
+    import os
+
+    path = get_credentials_path(ctf)
+    path.touch(mode=0o600, exist_ok=True)
+    # touch keeps the mode of an existing file, e.g. a world-readable .env.
+    os.chmod(path, 0o600)
+    path.write_text(
+        "".join(
+            f"{_ENV_KEYS[field]}={value}\n"
+            for field, value in creds._asdict().items()
+            if value
+        )
+    )
+    _cache.pop(path, None)
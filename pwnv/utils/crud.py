@@ -1,158 +1,205 @@
 from pathlib import Path
-from typing import List, Sequence, Set
+from typing import ContextManager, List, Sequence, Set, Type
 
 from pwnv.models import CTF, Challenge
-from pwnv.models.challenge import Solved
+from pwnv.models.challenge import Category, Solved
+from pwnv.models.ctf import Status
 
 
 # -- [CRUD] --
 # [READ]
 def get_ctfs() -> List[CTF]:
-    from pwnv.utils.config import load_config
+    from pwnv.utils.storage import get_storage
 
-    return [CTF(**ctf) for ctf in load_config().get("ctfs", [])]
+    return get_storage().get_ctfs()
 
 
 def get_challenges() -> List[Challenge]:
-    from pwnv.utils.config import load_config
+    from pwnv.utils.storage import get_storage
 
-    return [Challenge(**ch) for ch in load_config().get("challenges", [])]
+    return get_storage().get_challenges()
+
+
+def count_ctfs() -> int:
+    from pwnv.utils.storage import get_storage
+
+    return get_storage().count_ctfs()
+
+
+def count_challenges(ctf: CTF | None = None) -> int:
+    from pwnv.utils.storage import get_storage
+
+    return get_storage().count_challenges(None if ctf is None else ctf.id)
+
+
+def exists_ctfs() -> bool:
+    return count_ctfs() > 0
+
+
+def exists_challenges() -> bool:
+    return count_challenges() > 0
 
 
 def get_running_ctfs() -> List[CTF]:
-    return [ctf for ctf in get_ctfs() if ctf.running]
+    from pwnv.utils.storage import get_storage
+
+    return get_storage().get_ctfs_by_status(Status.running)
 
 
 def get_stopped_ctfs() -> List[CTF]:
-    return [ctf for ctf in get_ctfs() if not ctf.running]
+    from pwnv.utils.storage import get_storage
+
+    return get_storage().get_ctfs_by_status(Status.stopped)
 
 
 def get_unsolved_challenges() -> List[Challenge]:
-    return [ch for ch in get_challenges() if ch.solved == Solved.unsolved]
+    from pwnv.utils.storage import get_storage
+
+    return get_storage().get_challenges_by_solved(Solved.unsolved)
 
 
 def get_solved_challenges() -> List[Challenge]:
-    return [ch for ch in get_challenges() if ch.solved == Solved.solved]
+    from pwnv.utils.storage import get_storage
+
+    return get_storage().get_challenges_by_solved(Solved.solved)
+
+
+def get_challenges_by_category(category: Category) -> List[Challenge]:
+    from pwnv.utils.storage import get_storage
+
+    return get_storage().get_challenges_by_category(category)
 
 
 def challenges_for_ctf(ctf: CTF) -> List[Challenge]:
-    return [ch for ch in get_challenges() if ch.ctf_id == ctf.id]
+    from pwnv.utils.storage import get_storage
+
+    return get_storage().challenges_for_ctf(ctf.id)
 
 
 def ctfs_with_challenges() -> List[CTF]:
-    populated = {ch.ctf_id for ch in get_challenges()}
-    return [ctf for ctf in get_ctfs() if ctf.id in populated]
+    from pwnv.utils.storage import get_storage
+
+    return get_storage().get_populated_ctfs()
 
 
 def get_ctf_by_challenge(ch: Challenge) -> CTF | None:
-    for ctf in get_ctfs():
-        if ch.ctf_id == ctf.id:
-            return ctf
-    return None
+    from pwnv.utils.storage import get_storage
+
+    return get_storage().get_ctf(ch.ctf_id)
 
 
 def get_tags() -> Set[str]:
-    from pwnv.utils.config import load_config
+    from pwnv.utils.storage import get_storage
 
-    return set(load_config().get("challenge_tags", []))
+    return get_storage().get_tags()
 
 
 def get_current_ctf(path: Path = Path.cwd()) -> CTF | None:
-    for ctf in get_ctfs():
-        if path.is_relative_to(ctf.path):
-            return ctf
-    return None
+    from pwnv.utils.storage import get_storage
+
+    return get_storage().get_ctf_by_path(path)
 
 
 def get_current_challenge(path: Path = Path.cwd()) -> Challenge | None:
-    for ch in get_challenges():
-        if path.is_relative_to(ch.path):
-            return ch
-    return None
+    from pwnv.utils.storage import get_storage
+
+    return get_storage().get_challenge_by_path(path)
+
+
+def get_ctf_by_id(ctf_id) -> CTF | None:
+    from pwnv.utils.storage import get_storage
+
+    return get_storage().get_ctf(ctf_id)
+
+
+def get_challenge_by_id(challenge_id) -> Challenge | None:
+    from pwnv.utils.storage import get_storage
+
+    return get_storage().get_challenge(challenge_id)
 
 
 def get_challenge_by_name(name: str) -> Challenge | None:
-    for ch in get_challenges():
-        if ch.name == name:
-            return ch
-    return None
+    from pwnv.utils.storage import get_storage
+
+    return get_storage().get_challenge_by_name(name)
 
 
 def get_ctf_by_name(name: str) -> CTF | None:
-    for ctf in get_ctfs():
-        if ctf.name == name:
-            return ctf
-    return None
+    from pwnv.utils.storage import get_storage
+
+    return get_storage().get_ctf_by_name(name)
 
 
 # [CREATE]
+def transaction() -> ContextManager[None]:
+    """Group the writes made inside the block into a single commit."""
+    from pwnv.utils.storage import get_storage
+
+    return get_storage().transaction()
+
+
 def add_ctf(ctf: CTF) -> None:
-    from pwnv.utils.config import load_config, save_config
+    from pwnv.utils.storage import get_storage
 
-    cfg = load_config()
-    cfg.setdefault("ctfs", []).append(ctf.model_dump())
-    save_config(cfg)
+    get_storage().add_ctf(ctf)
     ctf.path.mkdir(parents=True, exist_ok=True)
 
 
 def add_challenge(ch: Challenge) -> None:
     from pwnv.core.setup import Core
-    from pwnv.utils.config import load_config, save_config
+    from pwnv.utils.meta import offload_extras
+    from pwnv.utils.storage import get_storage
 
-    cfg = load_config()
-    cfg.setdefault("challenges", []).append(ch.model_dump())
-    save_config(cfg)
+    offload_extras(ch)
+    get_storage().add_challenge(ch)
     ch.path.mkdir(parents=True, exist_ok=True)
     Core(ch)
 
 
+def add_challenges(challenges: Sequence[Challenge]) -> None:
+    """Add ``challenges`` with a single storage commit, then set them up."""
+    from pwnv.core.setup import Core
+    from pwnv.utils.meta import offload_extras
+    from pwnv.utils.storage import get_storage
+
+    storage = get_storage()
+    with storage.transaction():
+        for ch in challenges:
+            offload_extras(ch)
+            storage.add_challenge(ch)
+    for ch in challenges:
+        ch.path.mkdir(parents=True, exist_ok=True)
+        Core(ch)
+
+
 def add_tags(tags: set[str]) -> None:
-    from pwnv.utils.config import load_config, save_config
+    from pwnv.utils.storage import get_storage
 
-    cfg = load_config()
-    cfg["challenge_tags"] = list(
-        set(cfg.get("challenge_tags", [])) | {t.lower() for t in tags}
-    )
-    save_config(cfg)
+    get_storage().add_tags(tags)
 
 
 # [UPDATE]
 def update_ctf(ctf: CTF) -> None:
-    from pwnv.utils.config import load_config, save_config
+    from pwnv.utils.storage import get_storage
 
-    cfg = load_config()
-    ctfs = cfg.setdefault("ctfs", [])
-    for idx, c in enumerate(ctfs):
-        if c["id"] == str(ctf.id):
-            ctfs[idx] = ctf.model_dump()
-            break
-    save_config(cfg)
+    get_storage().update_ctf(ctf)
 
 
 def update_challenge(ch: Challenge) -> None:
-    from pwnv.utils.config import load_config, save_config
+    from pwnv.utils.meta import offload_extras
+    from pwnv.utils.storage import get_storage
 
-    cfg = load_config()
-    challenges = cfg.setdefault("challenges", [])
-    for idx, item in enumerate(challenges):
-        if item["id"] == str(ch.id):
-            challenges[idx] = ch.model_dump()
-            break
-    save_config(cfg)
+    offload_extras(ch)
+    get_storage().update_challenge(ch)
 
 
 # [DELETE]
 def remove_ctf(ctf: CTF) -> None:
     import shutil
 
-    from pwnv.utils.config import load_config, save_config
+    from pwnv.utils.storage import get_storage
 
-    cfg = load_config()
-    cfg["ctfs"] = [c for c in cfg.get("ctfs", []) if c["id"] != str(ctf.id)]
-    cfg["challenges"] = [
-        ch for ch in cfg.get("challenges", []) if ch["ctf_id"] != str(ctf.id)
-    ]
-    save_config(cfg)
+    get_storage().remove_ctf(ctf)
     if ctf.path.exists():
         shutil.rmtree(ctf.path)
 
@@ -160,13 +207,9 @@ def remove_ctf(ctf: CTF) -> None:
 def remove_challenge(ch: Challenge) -> None:
     import shutil
 
-    from pwnv.utils.config import load_config, save_config
+    from pwnv.utils.storage import get_storage
 
-    cfg = load_config()
-    cfg["challenges"] = [
-        item for item in cfg.get("challenges", []) if item["id"] != str(ch.id)
-    ]
-    save_config(cfg)
+    get_storage().remove_challenge(ch)
     if ch.path.exists():
         shutil.rmtree(ch.path)
 
@@ -176,10 +219,29 @@ def is_duplicate(
     *,
     name: str | None = None,
     path: Path | None = None,
-    model_list: Sequence[CTF | Challenge],
+    model_list: Sequence[CTF | Challenge] | None = None,
+    model: Type[CTF | Challenge] = CTF,
 ) -> bool:
-    if path is None:
-        return any(model.name == name for model in model_list)
-    elif name is None:
-        return any(model.path == path for model in model_list)
-    return any(model.name == name or model.path == path for model in model_list)
+    """Return whether a stored ``model`` has ``name`` or ``path``.
+
+    The storage's name and path indexes answer this without decoding every
+    record; with ``model_list`` that list is searched instead.
+    """
+    from pwnv.utils.storage import get_storage
+
+    if model_list is not None:
+        if path is None:
+            return any(record.name == name for record in model_list)
+        elif name is None:
+            return any(record.path == path for record in model_list)
+        return any(record.name == name or record.path == path for record in model_list)
+
+    storage = get_storage()
+    if model is CTF:
+        by_name, by_path = storage.get_ctf_by_name, storage.get_ctf_by_path
+    else:
+        by_name, by_path = storage.get_challenge_by_name, storage.get_challenge_by_path
+    if name is not None and by_name(name) is not None:
+        return True
+    found = by_path(path) if path is not None else None
+    return found is not None and found.path == path
@@ -26,15 +26,15 @@ def config_exists():
 
 
 def ctfs_exists():
-    from pwnv.utils.crud import get_ctfs
+    from pwnv.utils.crud import exists_ctfs
 
-    return _guard(lambda: bool(get_ctfs()), "No CTFs found.")
+    return _guard(exists_ctfs, "No CTFs found.")
 
 
 def challenges_exists():
-    from pwnv.utils.crud import get_challenges
+    from pwnv.utils.crud import exists_challenges
 
-    return _guard(lambda: bool(get_challenges()), "No challenges found.")
+    return _guard(exists_challenges, "No challenges found.")
 
 
 def plugins_exists():
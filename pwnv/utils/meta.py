@@ -0,0 +1,68 @@
+"""Side files for large challenge extras.
+
+Bulky extras, such as remote descriptions and attachment listings, are kept in
+``<challenge.path>/.pwnv/meta.json`` instead of the storage backend, and the
+challenge only lists their keys in ``meta_keys``.  They are read back on
+access, so loading the workspace does not depend on how long descriptions are.
+"""
+
+from pathlib import Path
+from typing import Any
+
+from pwnv.models import Challenge
+
+# Extras whose JSON encoding is longer than this are moved to the side file.
+_INLINE_LIMIT = 256
+
+
+def get_meta_path(ch: Challenge) -> Path:
+    from pwnv.constants import DEFAULT_META_BASENAME, DEFAULT_SHARD_DIRNAME
+
+    return ch.path / DEFAULT_SHARD_DIRNAME / DEFAULT_META_BASENAME
+
+
+def _read_meta(ch: Challenge) -> dict:
+    import json
+
+    try:
+        return json.loads(get_meta_path(ch).read_text())
+    except FileNotFoundError:
+        return {}
+
+
+def offload_extras(ch: Challenge) -> None:
+    """Move the large extras of ``ch`` to its side file, in place."""
+    import json
+
+    from pwnv.utils.config import write_json
+
+    large = {
+        key: value
+        for key, value in (ch.extras or {}).items()
+        if len(json.dumps(value, default=str)) > _INLINE_LIMIT
+    }
+    if not large:
+        return
+    write_json(get_meta_path(ch), {**_read_meta(ch), **large})
+    ch.extras = {k: v for k, v in ch.extras.items() if k not in large}
+    ch.meta_keys = sorted({*(ch.meta_keys or []), *large})
+
+
+def get_extras(ch: Challenge) -> dict:
+    """Return all extras of ``ch``, reading the side file only if it has one."""
+    if not ch.meta_keys:
+        return dict(ch.extras or {})
+    meta = _read_meta(ch)
+    return {
+        **{key: meta[key] for key in ch.meta_keys if key in meta},
+        **(ch.extras or {}),
+    }
+
+
+def get_extra(ch: Challenge, key: str, default: Any = None) -> Any:
+    """Return the extra ``key`` of ``ch``."""
+    if ch.extras and key in ch.extras:
+        return ch.extras[key]
+    if ch.meta_keys and key in ch.meta_keys:
+        return _read_meta(ch).get(key, default)
+    return default
@@ -0,0 +1,64 @@
+"""Token-bucket rate limits shared by the requests made to one platform.
+
+Buckets live for the whole process, so every coroutine talking to the same
+platform draws from the same budget.  A rate-limited response pauses the
+bucket, which holds back all of them rather than just the one that was
+refused.
+"""
+
+import asyncio
+import time
+from typing import Dict
+
+
+class TokenBucket:
+    """Allow ``rate`` acquisitions per second on average, ``burst`` at once."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = float(burst)
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it."""
+        while True:
+            self._refill()
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    async def wait(self) -> None:
+        """Wait until the bucket is no longer paused, without taking a token."""
+        while True:
+            self._refill()
+            if self.tokens >= 0:
+                return
+            await asyncio.sleep(-self.tokens / self.rate)
+
+    def pause(self, delay: float) -> None:
+        """Hand out no tokens for the next ``delay`` seconds."""
+        self._refill()
+        self.tokens = min(self.tokens, -delay * self.rate)
+
+
+_buckets: Dict[str, TokenBucket] = {}
+
+
+def get_bucket(key: str) -> TokenBucket:
+    """Return the bucket for ``key``, sized by ``submit_rate``/``submit_burst``."""
+    from pwnv.constants import DEFAULT_SUBMIT_BURST, DEFAULT_SUBMIT_RATE
+    from pwnv.utils.config import get_config_value
+
+    if key not in _buckets:
+        _buckets[key] = TokenBucket(
+            get_config_value("submit_rate") or DEFAULT_SUBMIT_RATE,
+            get_config_value("submit_burst") or DEFAULT_SUBMIT_BURST,
+        )
+    return _buckets[key]
@@ -1,10 +1,13 @@
 """Helpers for interacting with remote CTF platforms via ``ctfbridge``."""
 
 import asyncio
-from typing import Any, Dict, Tuple
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Sequence, Set, Tuple
 
 from pwnv.models import CTF, Challenge
 from pwnv.models.challenge import Category
+from pwnv.utils.credentials import Credentials, get_credentials, save_credentials
+from pwnv.utils.resilience import call, host_key
 
 _keyword_map = {
     "pwn": Category.pwn,
@@ -40,53 +43,63 @@ def normalise_category(raw: str) -> Category:
     return _keyword_map.get(key, Category.other)
 
 
-def _ask_for_credentials(methods) -> Dict[str, str | None]:
+def _ask_for_credentials(methods) -> Credentials | None:
     """Prompt the user for credentials using available authentication methods."""
     from ctfbridge.models.auth import AuthMethod
     from InquirerPy import inquirer
 
     from pwnv.utils.ui import error, prompt_text
 
-    creds: Dict[str, str | None] = {"username": None, "password": None, "token": None}
     chosen = inquirer.select(
         message="Choose authentication method:",
         choices=[method.name for method in methods],
     ).execute()
     if chosen == AuthMethod.CREDENTIALS.name:
-        creds["username"] = prompt_text("Username:")
-        creds["password"] = inquirer.secret(message="Password:").execute().strip()
-    elif chosen == AuthMethod.TOKEN.name:
-        creds["token"] = inquirer.secret(message="Token:").execute().strip()
-    else:
-        error("No supported authentication methods found.")
-        return {}
-    return creds
+        return Credentials(
+            username=prompt_text("Username:"),
+            password=inquirer.secret(message="Password:").execute().strip(),
+        )
+    if chosen == AuthMethod.TOKEN.name:
+        return Credentials(token=inquirer.secret(message="Token:").execute().strip())
+    error("No supported authentication methods found.")
+    return None
 
 
 _runner: asyncio.Runner | None = None
 
 
 def _run_async(coro):
-    """Run ``coro`` in a persistent asyncio runner."""
+    """Run ``coro`` in a persistent asyncio runner.
+
+    The coroutine sees the caller's context variables, not those of the
+    call that created the runner.
+    """
     import asyncio
     import atexit
+    import contextvars
 
     global _runner
     if _runner is None:
         _runner = asyncio.Runner()
         atexit.register(_runner.close)
-    return _runner.run(coro)
+    return _runner.run(coro, context=contextvars.copy_context())
 
 
 def add_remote_ctf(ctf: CTF) -> None:
-    """Interactively add ``ctf`` by fetching its challenges remotely."""
+    """Interactively add ``ctf`` by fetching its challenges remotely.
+
+    Progress is checkpointed, so an interrupted import is kept and can be
+    continued with ``pwnv ctf sync --resume``.
+    """
+    from pwnv.utils.checkpoint import ImportCheckpoint
     from pwnv.utils.crud import add_ctf, remove_ctf
+    from pwnv.utils.ui import warn
 
     client, methods = _run_async(get_remote_credential_methods(ctf.url))
     if client is None or methods is None:
         return
     creds = _ask_for_credentials(methods)
-    if not creds:
+    if creds is None:
         return
 
     add_ctf(ctf)
@@ -94,137 +107,614 @@ def add_remote_ctf(ctf: CTF) -> None:
     if not _run_async(create_remote_session(client, creds, ctf)):
         remove_ctf(ctf)
         return
+    save_credentials(ctf, creds)
+
+    checkpoint = ImportCheckpoint(ctf)
+    challenges = _run_async(get_remote_challenges(client, ctf, checkpoint))
+    if challenges is not None:
+        _run_async(add_remote_challenges(client, ctf, challenges, checkpoint))
+    if challenges is None or checkpoint.downloads:
+        warn("Import incomplete, continue it with `pwnv ctf sync --resume`.")
+    else:
+        checkpoint.clear()
+
+
+def sync_remote_ctf(ctf: CTF, refresh: bool = False, resume: bool = False) -> None:
+    """Fetch new and changed challenges for ``ctf`` from its remote platform.
+
+    With ``refresh`` the platform is detected again instead of relying on
+    the cached platform information.  Downloads an interrupted import left
+    over are retried; with ``resume`` the challenge details it fetched are
+    reused as well (see :mod:`pwnv.utils.checkpoint`).
+    """
+    from pwnv.utils.checkpoint import ImportCheckpoint
+    from pwnv.utils.ui import info, warn
+
+    if not ctf.url:
+        warn("CTF has no remote URL configured.")
+        return
+    if refresh:
+        forget_client(ctf.url)
+
+    client = _run_async(open_session(ctf))
+    if client is None:
+        return
 
-    challenges = _run_async(get_remote_challenges(client, ctf))
+    checkpoint = ImportCheckpoint(ctf, resume=resume)
+    if resume and not checkpoint.exists:
+        info("No interrupted import to resume, syncing everything.")
+    challenges = _run_async(get_remote_challenges(client, ctf, checkpoint))
     if challenges is None:
-        remove_ctf(ctf)
         return
 
-    env_path = ctf.path / ".env"
-    with open(env_path, "w") as f:
-        if creds.get("username", None):
-            f.write(f"CTF_USERNAME={creds.get('username')}\n")
-        if creds.get("password", None):
-            f.write(f"CTF_PASSWORD={creds.get('password')}\n")
-        if creds.get("token", None):
-            f.write(f"CTF_TOKEN={creds.get('token')}\n")
+    pending = checkpoint.pending_downloads()
+    if pending:
+        info(f"Retrying {len(pending)} unfinished downloads.")
+        for att, save_dir in _run_async(
+            download_attachments(client, pending, checkpoint=checkpoint)
+        ):
+            warn(f"Skipped attachment {att.name} for {save_dir.name}")
+
+    new, changed = _diff_remote_challenges(ctf, challenges)
+    if changed:
+        _run_async(update_remote_challenges(client, changed, checkpoint))
+    if new:
+        _run_async(add_remote_challenges(client, ctf, new, checkpoint))
+    if checkpoint.downloads:
+        warn("Some downloads failed, retry them with `pwnv ctf sync`.")
+    else:
+        checkpoint.clear()
+    if not new and not changed:
+        info("Everything is up to date.")
 
-    _run_async(add_remote_challenges(client, ctf, challenges))
+
+async def _get_listing(client: Any, ctf: CTF):
+    """Fetch the challenge list without per-challenge details."""
+    try:
+        return await call(
+            host_key(ctf.url),
+            "listing",
+            lambda: client.challenges.get_all(detailed=False),
+        )
+    except Exception as e:
+        forget_client(ctf.url, e)
+        return None
 
 
-def sync_remote_ctf(ctf: CTF) -> None:
-    """Fetch new challenges for ``ctf`` from its remote platform."""
-    from dotenv import load_dotenv
+def _listing_matches_local(ctf: CTF, listing) -> bool:
+    """Return whether the stored challenges already reflect ``listing``.
 
+    Only what the listing carries is compared: which challenges exist, their
+    points and whether they are solved.
+    """
+    from pwnv.models.challenge import Solved
     from pwnv.utils.crud import challenges_for_ctf
-    from pwnv.utils.ui import info, warn
+    from pwnv.utils.meta import get_extra
 
-    if not ctf.url:
-        warn("CTF has no remote URL configured.")
+    local = {get_extra(ch, "slug"): ch for ch in challenges_for_ctf(ctf)}
+    for ch in listing:
+        known = local.get(ch.id)
+        if known is None or known.points != ch.value:
+            return False
+        if ch.solved and known.solved != Solved.solved:
+            return False
+    return True
+
+
+def _listing_fingerprint(challenges) -> str:
+    import hashlib
+    import json
+
+    fields = sorted(
+        (str(ch.id), ch.name, ch.category, ch.value, bool(ch.solved))
+        for ch in challenges
+    )
+    return hashlib.sha256(json.dumps(fields, default=str).encode()).hexdigest()
+
+
+def watch_remote_ctf(
+    ctf: CTF, interval: float | None = None, max_interval: float | None = None
+) -> None:
+    """Poll ``ctf`` for new and changed challenges until interrupted.
+
+    The pooled client and its session are reused across polls.  Each poll
+    only fetches the challenge list; details are fetched and imported when
+    the list changed, or on the first poll when it doesn't match the stored
+    challenges.  The interval doubles after every poll without
+    changes, up to ``max_interval``, and resets when something changes.
+    Queued flags are flushed on every poll.
+    """
+    import time
+
+    from pwnv.constants import DEFAULT_WATCH_INTERVAL, DEFAULT_WATCH_MAX_INTERVAL
+    from pwnv.utils.config import get_config_value
+    from pwnv.utils.submissions import flush_submissions, get_queued_submissions
+    from pwnv.utils.ui import notify, show_submissions
+
+    interval = interval or get_config_value("watch_interval") or DEFAULT_WATCH_INTERVAL
+    max_interval = max(
+        interval,
+        max_interval
+        or get_config_value("watch_max_interval")
+        or DEFAULT_WATCH_MAX_INTERVAL,
+    )
+    if _run_async(open_session(ctf)) is None:
         return
+    delay, seen = interval, None
+    while True:
+        client = _run_async(open_session(ctf, interactive=False))
+        listing = None if client is None else _run_async(_get_listing(client, ctf))
+        changes = False
+        if seen is None and listing and _listing_matches_local(ctf, listing):
+            seen = _listing_fingerprint(listing)
+        if listing is not None and _listing_fingerprint(listing) != seen:
+            challenges = _run_async(get_remote_challenges(client, ctf, listing=listing))
+            if challenges is not None:
+                seen = _listing_fingerprint(listing)
+                new, changed = _diff_remote_challenges(ctf, challenges)
+                if changed:
+                    _run_async(update_remote_challenges(client, changed))
+                if new:
+                    _run_async(add_remote_challenges(client, ctf, new))
+                for ch in new:
+                    notify(
+                        f"New challenge in {ctf.name}", f"{ch.name} ({ch.value} pts)"
+                    )
+                changes = bool(new or changed)
+
+        if get_queued_submissions(ctf):
+            show_submissions(flush_submissions([ctf]))
+        delay = interval if changes else min(delay * 2, max_interval)
+        time.sleep(delay)
+
+
+class SyncResult(NamedTuple):
+    """Outcome of syncing one CTF with :func:`sync_remote_ctfs`."""
+
+    ctf: CTF
+    added: int = 0
+    updated: int = 0
+    error: str | None = None
+
+
+def _platform_key(url: str) -> str:
+    """Return the key sharing a concurrency cap: the platform, else the host."""
+    from pwnv.utils.remote_cache import get_platform_info
+
+    cached = get_platform_info(url) or {}
+    if cached.get("platform") not in (None, "auto"):
+        return cached["platform"]
+    return host_key(url)
+
+
+def sync_remote_ctfs(ctfs: Sequence[CTF], refresh: bool = False) -> List[SyncResult]:
+    """Sync several remote CTFs concurrently and commit them together.
+
+    Fetches run in parallel, at most ``sync_concurrency`` (default 2) per
+    platform.  CTFs that cannot be synced without asking for credentials, or
+    whose fetch fails, are reported without affecting the others.  All
+    records are then written in one commit and the attachments of every CTF
+    are downloaded concurrently.
+    """
+    from pwnv.constants import DEFAULT_SYNC_CONCURRENCY
+    from pwnv.utils.config import get_config_value
+    from pwnv.utils.crud import add_challenges, transaction, update_challenge
+
+    limit = get_config_value("sync_concurrency") or DEFAULT_SYNC_CONCURRENCY
+    caps: Dict[str, asyncio.Semaphore] = {}
+
+    async def _plan(ctf: CTF):
+        if refresh:
+            forget_client(ctf.url)
+        cap = caps.setdefault(_platform_key(ctf.url), asyncio.Semaphore(limit))
+        async with cap:
+            client = await open_session(ctf, interactive=False)
+            if client is None:
+                raise RuntimeError("no usable session or stored credentials")
+            challenges = await get_remote_challenges(client, ctf)
+            if challenges is None:
+                raise RuntimeError("failed to fetch challenges")
+        return client, *_diff_remote_challenges(ctf, challenges)
+
+    async def _sync() -> List[SyncResult]:
+        plans = await asyncio.gather(
+            *(_plan(ctf) for ctf in ctfs), return_exceptions=True
+        )
+        results, downloads, added, changed = [], [], [], []
+        for ctf, plan in zip(ctfs, plans):
+            if isinstance(plan, Exception):
+                results.append(SyncResult(ctf, error=str(plan) or type(plan).__name__))
+                continue
+            client, new, ctf_changed = plan
+            ctf_added = _build_challenges(ctf, new)
+            jobs = _apply_remote_changes(ctf_changed)
+            jobs += [
+                (att, ch.path)
+                for remote, ch in ctf_added
+                for att in _defer_attachments(ch, remote.attachments)
+            ]
+            added += [ch for _, ch in ctf_added]
+            changed += [local for _, local in ctf_changed]
+            downloads.append(download_attachments(client, jobs))
+            results.append(SyncResult(ctf, len(ctf_added), len(ctf_changed)))
+
+        with transaction():
+            for local in changed:
+                update_challenge(local)
+            add_challenges(added)
+        await asyncio.gather(*downloads)
+        return results
+
+    return _run_async(_sync())
+
+
+# Clients live as long as the process and its persistent event loop (see
+# ``_run_async``), so consecutive remote operations reuse the HTTP connection
+# pool, the detected platform and the authenticated session.
+_clients: Dict[str, Any] = {}
+_auth_methods: Dict[str, Any] = {}
+_sessions: Set[str] = set()
+
+
+async def get_client(url: str) -> Any:
+    """Return the pooled ``ctfbridge`` client for ``url``.
+
+    A platform detected by an earlier run (see :mod:`pwnv.utils.remote_cache`)
+    is reused instead of probing the remote again.
+    """
+    from ctfbridge import create_client
 
-    client, methods = _run_async(get_remote_credential_methods(ctf.url))
-    if client is None or methods is None:
-        return
+    from pwnv.utils.remote_cache import (
+        get_platform_info,
+        invalidate_platform_info,
+        store_platform_info,
+    )
 
-    creds: Dict[str, str | None] = {}
-    if (ctf.path / ".session").exists():
+    if url in _clients:
+        return _clients[url]
+    client = None
+    if cached := get_platform_info(url):
         try:
-            _run_async(client.session.load(str(ctf.path / ".session")))
-        except Exception as e:
-            warn(f"Ignoring broken session cookie ({e}).")
-            creds = _ask_for_credentials(methods)
-            if not creds:
-                return
-            if not _run_async(create_remote_session(client, creds, ctf)):
-                return
-    elif (ctf.path / ".env").exists():
-        import os
-
-        load_dotenv(ctf.path / ".env")
-        creds = {
-            "username": os.getenv("CTF_USERNAME"),
-            "password": os.getenv("CTF_PASSWORD"),
-            "token": os.getenv("CTF_TOKEN"),
-        }
-        if not _run_async(create_remote_session(client, creds, ctf)):
-            return
+            client = await call(
+                host_key(url),
+                "connect",
+                lambda: create_client(
+                    url=cached["api_url"] or url, platform=cached["platform"]
+                ),
+            )
+        except Exception:
+            invalidate_platform_info(url)
+    if client is None:
+        client = await call(host_key(url), "detect", lambda: create_client(url=url))
+        store_platform_info(
+            url,
+            platform=_registry_name(client),
+            api_url=getattr(client, "platform_url", None),
+        )
+    _clients[url] = client
+    return client
+
+
+def _registry_name(client: Any) -> str:
+    """Return the name ``create_client`` knows ``client``'s platform by.
+
+    ``platform_name`` is a display name ("CTFd", "pwnable.kr"), the registry
+    is keyed by the client class instead; "auto" if neither matches.
+    """
+    from ctfbridge.platforms.registry import PLATFORM_CLIENTS
+
+    path = f"{type(client).__module__}.{type(client).__qualname__}"
+    for name, client_path in PLATFORM_CLIENTS.items():
+        if client_path == path:
+            return name
+    name = str(getattr(client, "platform_name", "") or "").lower()
+    return name if name in PLATFORM_CLIENTS else "auto"
+
+
+async def get_auth_methods(url: str) -> Any:
+    """Return the authentication methods supported by the platform at ``url``."""
+    from pwnv.utils.remote_cache import (
+        decode_auth_methods,
+        encode_auth_methods,
+        get_platform_info,
+        store_platform_info,
+    )
+
+    if url in _auth_methods:
+        return _auth_methods[url]
+    cached = get_platform_info(url) or {}
+    if "auth_methods" in cached:
+        methods = decode_auth_methods(cached["auth_methods"])
     else:
-        creds = _ask_for_credentials(methods)
-        if not creds:
-            return
-        if not _run_async(create_remote_session(client, creds, ctf)):
-            return
+        client = await get_client(url)
+        methods = await call(
+            host_key(url), "auth_methods", client.auth.get_supported_auth_methods
+        )
+        store_platform_info(url, auth_methods=encode_auth_methods(methods))
+    _auth_methods[url] = methods
+    return methods
+
+
+def _platform_suspect(exc: BaseException | None) -> bool:
+    """Return whether ``exc`` may mean the cached platform information is wrong.
+
+    That is a failed detection, an unreachable API host or a missing
+    endpoint; timeouts, server errors, rate limits and expired sessions are
+    not.
+    """
+    import httpx
+    from ctfbridge.exceptions import (
+        NotFoundError,
+        PlatformMismatchError,
+        UnknownBaseURLError,
+        UnknownPlatformError,
+    )
+
+    suspects = (
+        httpx.ConnectError,
+        NotFoundError,
+        PlatformMismatchError,
+        UnknownBaseURLError,
+        UnknownPlatformError,
+    )
+    seen = set()
+    while exc is not None and id(exc) not in seen:
+        seen.add(id(exc))
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+        if isinstance(exc, suspects) or status == 404:
+            return True
+        exc = exc.__cause__ or exc.__context__
+    return False
 
-    challenges = _run_async(get_remote_challenges(client, ctf))
-    if challenges is None:
-        return
 
-    existing = {sanitize(ch.name) for ch in challenges_for_ctf(ctf)}
-    new_challenges = [ch for ch in challenges if sanitize(ch.name) not in existing]
+def forget_client(url: str | None, exc: BaseException | None = None) -> None:
+    """Drop the pooled client of ``url`` and its session.
 
-    if not new_challenges:
-        info("No new challenges found.")
-        return
+    Called with ``--refresh``, which also discards what is cached about the
+    platform, and when an operation fails with ``exc``; the platform cache
+    then only goes if ``exc`` suggests it was wrong.
+    """
+    from pwnv.utils.remote_cache import invalidate_platform_info
 
-    _run_async(add_remote_challenges(client, ctf, new_challenges))
+    if not url:
+        return
+    _clients.pop(url, None)
+    _auth_methods.pop(url, None)
+    _sessions.discard(url)
+    if exc is None or _platform_suspect(exc):
+        invalidate_platform_info(url)
 
 
 async def get_remote_credential_methods(
     url: str | None,
 ) -> Tuple[Any, Any] | Tuple[None, None]:
     """Retrieve supported authentication methods from the remote platform."""
-    from ctfbridge import create_client
-
     if not url:
         return None, None
 
     try:
-        client: Any = await create_client(url=url)
+        client = await get_client(url)
     except Exception:
         from pwnv.utils.ui import error
 
         error("Failed to get client.")
         return None, None
-    methods = await client.auth.get_supported_auth_methods()
-    return client, methods
+    return client, await get_auth_methods(url)
+
+
+async def open_session(ctf: CTF, interactive: bool = True) -> Any | None:
+    """Return the pooled client for ``ctf`` with an authenticated session.
+
+    A saved ``.session`` is loaded without probing the platform's auth
+    methods; stored credentials come next and the user is only prompted as
+    a last resort, unless ``interactive`` is false.
+    """
+    from pwnv.utils.ui import error, warn
+
+    if not ctf.url:
+        return None
+    try:
+        client = await get_client(ctf.url)
+    except Exception:
+        error("Failed to get client.")
+        return None
+    if ctf.url in _sessions:
+        return client
+
+    if (ctf.path / ".session").exists():
+        try:
+            await client.session.load(str(ctf.path / ".session"))
+            _sessions.add(ctf.url)
+            return client
+        except Exception as e:
+            warn(f"Ignoring broken session cookie ({e}).")
+
+    creds = get_credentials(ctf)
+    if creds is None:
+        if not interactive:
+            return None
+        creds = _ask_for_credentials(await get_auth_methods(ctf.url))
+        if creds is None:
+            return None
+    if not await create_remote_session(client, creds, ctf):
+        return None
+    return client
 
 
-async def create_remote_session(
-    client: Any, creds: Dict[str, str | None], ctf: CTF
-) -> bool:
+async def create_remote_session(client: Any, creds: Credentials, ctf: CTF) -> bool:
     """Create and store an authenticated session."""
     try:
-        await client.auth.login(**{k: v for k, v in creds.items() if v is not None})
+        await call(
+            host_key(ctf.url),
+            "login",
+            lambda: client.auth.login(**creds.login_kwargs()),
+        )
         await client.session.save(str(ctf.path / ".session"))
+        _sessions.add(ctf.url)
         return True
-    except Exception:
+    except Exception as e:
         from pwnv.utils.ui import error
 
+        forget_client(ctf.url, e)
         error("Failed to authenticate with the provided credentials.")
         return False
 
 
-async def get_remote_challenges(client: Any, ctf: CTF):
-    """Fetch the list of challenges for ``ctf`` from the remote platform."""
+async def get_remote_challenges(client: Any, ctf: CTF, checkpoint=None, listing=None):
+    """Fetch the list of challenges for ``ctf`` from the remote platform.
+
+    Where the list lacks details, each challenge is fetched (and retried) on
+    its own, so one failed request doesn't restart the whole import.  Details
+    are recorded in ``checkpoint``, and those it already holds are reused.
+    A ``listing`` fetched by the caller is used instead of fetching it again.
+
+    At most ``download_concurrency`` details are fetched at once, and a
+    rate-limited one pauses the host's bucket (see :mod:`pwnv.utils.ratelimit`)
+    for them and for flag submissions alike.
+    """
+    from pwnv.constants import DEFAULT_DOWNLOAD_CONCURRENCY
+    from pwnv.utils.config import get_config_value
+    from pwnv.utils.ratelimit import get_bucket
+
+    key = host_key(ctf.url)
+    service = client.challenges
+    bucket = get_bucket(key)
+    semaphore = asyncio.Semaphore(
+        get_config_value("download_concurrency") or DEFAULT_DOWNLOAD_CONCURRENCY
+    )
+
+    async def _fetch(ch):
+        await bucket.wait()
+        return await service.get_by_id(ch.id)
+
+    async def _detail(ch):
+        detail = checkpoint and checkpoint.get_detail(ch.id)
+        if not detail:
+            async with semaphore:
+                detail = await call(
+                    key, "challenge", lambda: _fetch(ch), on_rate_limit=bucket.pause
+                )
+            if checkpoint is not None:
+                checkpoint.add_detail(detail)
+        return detail
+
     try:
-        await client.session.load(str(ctf.path / ".session"))
-        challenges = await client.challenges.get_all()
-        return challenges
-    except Exception:
+        if listing is None:
+            listing = await call(
+                key, "listing", lambda: service.get_all(detailed=False)
+            )
+        if getattr(service, "base_has_details", True):
+            return listing
+        # Let every fetch finish, so the checkpoint keeps all that succeeded.
+        details = await asyncio.gather(
+            *(_detail(ch) for ch in listing), return_exceptions=True
+        )
+        for detail in details:
+            if isinstance(detail, BaseException):
+                raise detail
+        return details
+    except Exception as e:
         from pwnv.utils.ui import error
 
+        forget_client(ctf.url, e)
         error("Failed to fetch challenges.")
         return None
+    finally:
+        if checkpoint is not None:
+            checkpoint.save(force=True)
+
+
+def _remote_extras(ch) -> Dict[str, Any]:
+    """Return the extras stored for the remote challenge ``ch``.
+
+    ``sync_hash`` fingerprints every field a sync may update, so unchanged
+    challenges are recognised without comparing them field by field.
+    """
+    import hashlib
+    import json
+
+    extras = {
+        "slug": ch.id,
+        "description": ch.description,
+        "attachments": [att.model_dump(mode="json") for att in ch.attachments],
+        "author": ch.author,
+    }
+    fields = {
+        **extras,
+        "name": ch.name,
+        "category": ch.category,
+        "value": ch.value,
+        "solved": bool(ch.solved),
+        "tags": ch.tags,
+    }
+    digest = json.dumps(fields, sort_keys=True, default=str).encode()
+    return {**extras, "sync_hash": hashlib.sha256(digest).hexdigest()}
+
+
+def _diff_remote_challenges(ctf: CTF, challenges) -> Tuple[list, list]:
+    """Split remote ``challenges`` into new ones and changed ``(remote, local)``.
+
+    Challenges are matched on their remote slug; local challenges imported
+    without one are matched by name.
+    """
+    from pwnv.utils.crud import challenges_for_ctf
+    from pwnv.utils.meta import get_extra
+
+    by_slug, by_name = {}, {}
+    for local in challenges_for_ctf(ctf):
+        slug = get_extra(local, "slug")
+        if slug is not None:
+            by_slug[slug] = local
+        by_name.setdefault(local.name, local)
+
+    new, changed = [], []
+    for ch in challenges:
+        local = by_slug.get(ch.id) or by_name.get(sanitize(ch.name))
+        if local is None:
+            new.append(ch)
+        elif get_extra(local, "sync_hash") != _remote_extras(ch)["sync_hash"]:
+            changed.append((ch, local))
+    return new, changed
 
 
-async def add_remote_challenges(client, ctf: CTF, challenges) -> None:
-    """Persist fetched challenges locally and download attachments."""
-    from pwnv.models import Challenge
+def _apply_remote_changes(changed) -> List[Tuple[Any, Path]]:
+    """Update the local side of each ``(remote, local)`` pair in place.
+
+    Returns the download jobs for attachments the local challenge did not
+    list before.  Category and path are kept, since files live there.
+    """
+    import json
+
+    from pwnv.models.challenge import Solved
+    from pwnv.utils.meta import get_extras
+
+    def _key(att: dict) -> str:
+        return json.dumps(att, sort_keys=True)
+
+    jobs = []
+    for ch, local in changed:
+        known = {_key(att) for att in get_extras(local).get("attachments") or []}
+        extras = _remote_extras(ch)
+        local.points = ch.value
+        if ch.solved:
+            local.solved = Solved.solved
+        if ch.tags:
+            local.tags = sorted({*(local.tags or []), *ch.tags})
+        local.extras = {**(local.extras or {}), **extras}
+        unseen = [
+            att
+            for att, dump in zip(ch.attachments, extras["attachments"])
+            if _key(dump) not in known
+        ]
+        jobs += [(att, local.path) for att in _defer_attachments(local, unseen)]
+    return jobs
+
+
+def _build_challenges(ctf: CTF, challenges) -> List[Tuple[Any, Challenge]]:
+    """Return ``(remote, local)`` pairs for remote challenges new to ``ctf``."""
     from pwnv.models.challenge import Solved
-    from pwnv.utils.crud import add_challenge
-    from pwnv.utils.ui import success
 
+    added = []
     for ch in challenges:
         category = normalise_category(ch.category)
         name = sanitize(ch.name)
@@ -235,77 +725,301 @@ async def add_remote_challenges(client, ctf: CTF, challenges) -> None:
             category=category,
             points=ch.value,
             solved=Solved.solved if ch.solved else Solved.unsolved,
-            extras={
-                "slug": ch.id,
-                "description": ch.description,
-                "attachments": [att.model_dump() for att in ch.attachments],
-                "author": ch.author,
-            },
+            extras=_remote_extras(ch),
             tags=ch.tags,
         )
-        add_challenge(challenge)
-        try:
-            await client.attachments.download_all(ch.attachments, challenge.path)
-        except Exception:
-            from pwnv.utils.ui import warn
+        added.append((ch, challenge))
+    return added
+
+
+def _defer_attachments(challenge: Challenge, attachments) -> list:
+    """Return which of ``attachments`` to download now.
+
+    With the ``lazy_attachments`` config value set, only challenges whose
+    category is listed in ``prefetch_categories`` are downloaded at once.
+    The attachments of the others are left in their
+    ``extras["pending_attachments"]`` for :func:`fetch_challenge_attachments`.
+    """
+    from pwnv.utils.config import get_config_value
+    from pwnv.utils.meta import get_extra
+
+    eager = get_config_value("prefetch_categories") or []
+    if not get_config_value("lazy_attachments") or challenge.category.name in eager:
+        return list(attachments)
+    pending = list(get_extra(challenge, "pending_attachments") or [])
+    pending += [
+        dump
+        for dump in (att.model_dump(mode="json") for att in attachments)
+        if dump not in pending
+    ]
+    challenge.extras = {**(challenge.extras or {}), "pending_attachments": pending}
+    return []
+
+
+def order_for_prefetch(challenges: Sequence[Challenge]) -> List[Challenge]:
+    """Order ``challenges`` by the ``prefetch_priority`` config value.
+
+    It lists category names, most wanted first; other categories follow in
+    their original order.
+    """
+    from pwnv.utils.config import get_config_value
+
+    priority = get_config_value("prefetch_priority") or []
+    rank = {name: i for i, name in enumerate(priority)}
+    return sorted(challenges, key=lambda ch: rank.get(ch.category.name, len(rank)))
+
+
+def fetch_challenge_attachments(
+    challenges: Sequence[Challenge], interactive: bool = True
+) -> int:
+    """Download the attachments a lazy import left pending for ``challenges``.
+
+    Downloads start in the given order.  Attachments that fail stay pending;
+    returns how many did.
+    """
+    from ctfbridge.models.challenge import Attachment
+
+    from pwnv.utils.crud import get_ctf_by_id, transaction, update_challenge
+    from pwnv.utils.meta import get_extra
+    from pwnv.utils.ui import warn
+
+    by_ctf: Dict[Any, List[Challenge]] = {}
+    for ch in challenges:
+        if get_extra(ch, "pending_attachments"):
+            by_ctf.setdefault(ch.ctf_id, []).append(ch)
+
+    left = 0
+    for ctf_id, group in by_ctf.items():
+        ctf = get_ctf_by_id(ctf_id)
+        pending = [get_extra(ch, "pending_attachments") for ch in group]
+        if ctf is None:
+            names = ", ".join(ch.name for ch in group)
+            warn(f"Skipping {names}: their CTF is archived or was removed.")
+            left += sum(map(len, pending))
+            continue
+        client = ctf.url and _run_async(open_session(ctf, interactive))
+        if not client:
+            warn(f"Cannot fetch attachments for {ctf.name} without a session.")
+            left += sum(map(len, pending))
+            continue
+        jobs = [
+            (Attachment.model_validate(dump), ch.path)
+            for ch, dumps in zip(group, pending)
+            for dump in dumps
+        ]
+        failed = {id(att) for att, _ in _run_async(download_attachments(client, jobs))}
+        atts = iter(att for att, _ in jobs)
+        with transaction():
+            for ch, dumps in zip(group, pending):
+                still = [dump for dump, att in zip(dumps, atts) if id(att) in failed]
+                for dump in still:
+                    warn(f"Skipped attachment {dump.get('name')} for {ch.name}")
+                ch.extras = {**(ch.extras or {}), "pending_attachments": still}
+                update_challenge(ch)
+        left += len(failed)
+    return left
+
+
+async def update_remote_challenges(client, changed, checkpoint=None) -> None:
+    """Apply remote changes to local challenges and fetch new attachments.
+
+    ``changed`` holds ``(remote, local)`` pairs.  All records are written in
+    one batch; only attachments the local challenge did not list before are
+    downloaded.
+    """
+    from pwnv.utils.crud import transaction, update_challenge
+    from pwnv.utils.ui import success, warn
+
+    jobs = _apply_remote_changes(changed)
+    with transaction():
+        for _, local in changed:
+            update_challenge(local)
+    for _, local in changed:
+        success(f"{local.name} ({local.points} pts) updated")
+
+    for att, save_dir in await download_attachments(
+        client, jobs, checkpoint=checkpoint
+    ):
+        warn(f"Skipped attachment {att.name} for {save_dir.name}")
+
+
+async def add_remote_challenges(client, ctf: CTF, challenges, checkpoint=None) -> None:
+    """Persist fetched challenges locally and download attachments.
+
+    All challenges are stored (and set up by the plugins) first, then the
+    attachments of every challenge are downloaded concurrently.
+    """
+    from pwnv.utils.crud import add_challenges
+    from pwnv.utils.ui import success, warn
+
+    added = _build_challenges(ctf, challenges)
+    jobs = [
+        (att, challenge.path)
+        for ch, challenge in added
+        for att in _defer_attachments(challenge, ch.attachments)
+    ]
+    add_challenges([challenge for _, challenge in added])
+    for _, challenge in added:
+        success(f"{challenge.name} ({challenge.points} pts) added")
 
-            warn(f"Skipped attachments for {challenge.name}")
+    for att, save_dir in await download_attachments(
+        client, jobs, checkpoint=checkpoint
+    ):
+        warn(f"Skipped attachment {att.name} for {save_dir.name}")
+
+
+async def download_attachments(
+    client,
+    jobs: Sequence[Tuple[Any, Path]],
+    limit: int | None = None,
+    checkpoint=None,
+) -> List[Tuple[Any, Path]]:
+    """Download every ``(attachment, save_dir)`` job concurrently.
+
+    Files go through the content-addressed store (:mod:`pwnv.utils.attachments`),
+    so attachments already stored are linked instead of downloaded.
+
+    At most ``limit`` downloads (the ``download_concurrency`` config value by
+    default) run at once, and failed downloads are retried (see
+    :mod:`pwnv.utils.resilience`).  With a ``checkpoint`` the jobs are
+    recorded there until they finish.
+    Returns the jobs that still failed.
+    """
+    from rich.progress import Progress
+
+    from pwnv.constants import DEFAULT_DOWNLOAD_ATTEMPTS, DEFAULT_DOWNLOAD_CONCURRENCY
+    from pwnv.utils.attachments import fetch_attachment, flush_store
+    from pwnv.utils.config import get_config_value
+
+    limit = limit or get_config_value("download_concurrency")
+    semaphore = asyncio.Semaphore(limit or DEFAULT_DOWNLOAD_CONCURRENCY)
+    # Downloads have their own breaker: a broken file must not cut off the API.
+    key = host_key(getattr(client, "platform_url", None)) + "/downloads"
+    failed: List[Tuple[Any, Path]] = []
+
+    async def _download(att, save_dir: Path) -> None:
+        async with semaphore:
+            try:
+                await call(
+                    key,
+                    "download",
+                    lambda: fetch_attachment(client, att, save_dir),
+                    attempts=DEFAULT_DOWNLOAD_ATTEMPTS,
+                )
+            except Exception:
+                failed.append((att, save_dir))
+            else:
+                if checkpoint is not None:
+                    checkpoint.finish_download(att, save_dir)
+
+    if not jobs:
+        return failed
+    if checkpoint is not None:
+        checkpoint.add_downloads(jobs)
+    try:
+        with Progress(transient=True) as progress:
+            task = progress.add_task("Downloading attachments", total=len(jobs))
 
-        success(f"{challenge.name} ({challenge.points} pts) added")
+            async def _tracked(att, save_dir: Path) -> None:
+                await _download(att, save_dir)
+                progress.advance(task)
+
+            await asyncio.gather(*(_tracked(att, save_dir) for att, save_dir in jobs))
+    finally:
+        flush_store()
+        if checkpoint is not None:
+            checkpoint.save(force=True)
+    return failed
+
+
+def submit_flag(ctf: CTF, challenge: Challenge, flag: str) -> bool:
+    """Submit ``flag`` on the shared event loop; see :func:`remote_solve`."""
+    return _run_async(remote_solve(ctf, challenge, flag))
+
+
+async def _submit(client: Any, ctf: CTF, challenge: Challenge, flag: str) -> bool:
+    """Submit ``flag`` within the rate limit of the CTF's host.
+
+    A rate-limited attempt pauses the host's bucket, holding back every
+    submission to it; other failures are retried as usual.
+    """
+    from pwnv.constants import DEFAULT_SUBMIT_ATTEMPTS
+    from pwnv.utils.meta import get_extra
+    from pwnv.utils.ratelimit import get_bucket
+
+    slug = get_extra(challenge, "slug")
+    if slug is None:
+        raise ValueError(f"{challenge.name} has no remote id")
+    key = host_key(ctf.url)
+    bucket = get_bucket(key)
+
+    async def _attempt():
+        await bucket.acquire()
+        return (await client.challenges.submit(slug, flag)).correct
+
+    return await call(
+        key,
+        "submit",
+        _attempt,
+        attempts=DEFAULT_SUBMIT_ATTEMPTS,
+        on_rate_limit=bucket.pause,
+    )
 
 
 async def remote_solve(ctf: CTF, challenge: Challenge, flag: str) -> bool:
     """Submit ``flag`` to the remote platform and return ``True`` if correct."""
-    import os
+    from pwnv.utils.ui import error, success
 
-    from ctfbridge import create_client
-    from dotenv import load_dotenv
+    client = await open_session(ctf)
+    if client is None:
+        return False
 
-    if not ctf.url:
+    try:
+        correct = await _submit(client, ctf, challenge, flag)
+    except Exception:
+        error(f"Failed to submit flag '{flag}'.")
         return False
+    if correct:
+        success(f"Flag [cyan]{flag}[/] accepted!")
+    else:
+        error(f"Flag [cyan]{flag}[/] incorrect")
+    return correct
 
-    client: Any = await create_client(ctf.url)
-    if (ctf.path / ".session").exists():
-        try:
-            await client.session.load(str(ctf.path / ".session"))
-        except Exception as e:
-            from pwnv.utils.ui import warn
 
-            warn(f"Ignoring broken session cookie ({e}).")
+class Submission(NamedTuple):
+    """Outcome of one flag submitted with :func:`submit_flags`."""
 
-    elif (ctf.path / ".env").exists():
-        load_dotenv(ctf.path / ".env")
-        creds = {
-            "username": os.getenv("CTF_USERNAME"),
-            "password": os.getenv("CTF_PASSWORD"),
-            "token": os.getenv("CTF_TOKEN"),
-        }
-        await client.auth.login(**{k: v for k, v in creds.items() if v is not None})
-    else:
-        creds = _ask_for_credentials(await client.auth.get_supported_auth_methods())
-        if not await create_remote_session(client, creds, ctf):
-            return False
+    challenge: Challenge
+    flag: str
+    correct: bool = False
+    error: str | None = None
 
-    try:
-        slug = (
-            challenge.extras.get("slug") if isinstance(challenge.extras, dict) else None
-        )
-        if slug is None:
-            return False
-        res = await client.challenges.submit(slug, flag)
-        if res.correct:
-            from pwnv.utils.ui import success
 
-            success(f"Flag [cyan]{flag}[/] accepted!")
+def submit_flags(entries: Sequence[Tuple[CTF, Challenge, str]]) -> List[Submission]:
+    """Submit many ``(ctf, challenge, flag)`` entries concurrently.
 
-            return True
-        else:
-            from pwnv.utils.ui import error
+    Each CTF gets one pooled session, opened up front so submissions don't
+    race to log in, and every platform keeps to its rate limit.  Failures
+    are reported per entry.
+    """
 
-            error(f"Flag [cyan]{flag}[/] incorrect")
-            return False
-    except Exception:
-        from pwnv.utils.ui import error
+    async def _submit_all() -> List[Submission]:
+        clients = {}
+        for ctf, _, _ in entries:
+            if ctf.id not in clients:
+                clients[ctf.id] = await open_session(ctf, interactive=False)
 
-        error(f"Failed to submit flag '{flag}'.")
-        return False
+        async def _one(ctf: CTF, challenge: Challenge, flag: str) -> Submission:
+            client = clients[ctf.id]
+            if client is None:
+                return Submission(challenge, flag, error="no usable session")
+            try:
+                return Submission(
+                    challenge, flag, await _submit(client, ctf, challenge, flag)
+                )
+            except Exception as e:
+                return Submission(challenge, flag, error=str(e) or type(e).__name__)
+
+        return list(await asyncio.gather(*(_one(*entry) for entry in entries)))
+
+    return _run_async(_submit_all())
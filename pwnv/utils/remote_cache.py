@@ -0,0 +1,78 @@
+"""Persistent cache of what was discovered about remote CTF platforms.
+
+For every CTF URL the detected platform, its API base URL and the supported
+authentication methods are stored in ``remote_cache.json`` next to the
+config, so later runs can create a client without probing the platform.
+Entries expire after ``platform_cache_ttl`` seconds and are dropped as soon
+as an operation based on them fails.
+"""
+
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+
+def get_remote_cache_path() -> Path:
+    from pwnv.constants import DEFAULT_REMOTE_CACHE_BASENAME
+    from pwnv.utils.config import get_config_path
+
+    return get_config_path().parent / DEFAULT_REMOTE_CACHE_BASENAME
+
+
+def _load() -> Dict[str, dict]:
+    import json
+
+    try:
+        return json.loads(get_remote_cache_path().read_text())
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def _ttl() -> float:
+    from pwnv.constants import DEFAULT_PLATFORM_CACHE_TTL
+    from pwnv.utils.config import get_config_value
+
+    ttl = get_config_value("platform_cache_ttl")
+    return DEFAULT_PLATFORM_CACHE_TTL if ttl is None else ttl
+
+
+def get_platform_info(url: str) -> dict | None:
+    """Return the unexpired cache entry for ``url``, if any."""
+    entry = _load().get(url)
+    if entry is None or time.time() - entry["fetched_at"] > _ttl():
+        return None
+    return entry
+
+
+def store_platform_info(url: str, **fields: Any) -> None:
+    """Merge ``fields`` into the cache entry of ``url``.
+
+    Storing the platform starts a new entry; other fields extend it.
+    """
+    from pwnv.utils.config import write_json
+
+    cache = _load()
+    entry = {} if "platform" in fields else cache.get(url, {})
+    entry.update(fields)
+    entry.setdefault("fetched_at", time.time())
+    cache[url] = entry
+    write_json(get_remote_cache_path(), cache)
+
+
+def invalidate_platform_info(url: str) -> None:
+    """Forget everything cached for ``url``."""
+    from pwnv.utils.config import write_json
+
+    cache = _load()
+    if cache.pop(url, None) is not None:
+        write_json(get_remote_cache_path(), cache)
+
+
+def encode_auth_methods(methods) -> List[str]:
+    return [method.name for method in methods]
+
+
+def decode_auth_methods(names: List[str]):
+    from ctfbridge.models.auth import AuthMethod
+
+    return [AuthMethod[name] for name in names]
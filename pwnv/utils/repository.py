@@ -0,0 +1,313 @@
+"""In-memory indexes over the records of one configuration generation.
+
+The indexes map ids, names, CTFs, categories and solved states to record
+positions, and a trie over path components maps directories to the ids of
+the CTF and challenge owning them.  They are plain data, so they are stored
+in the config snapshot and warm invocations don't even rebuild them.  The
+trie only depends on ids and paths, so it is kept across config versions
+that don't move anything.  Models are only decoded for the records a lookup
+actually returns.
+"""
+
+import copy
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from pwnv.models import CTF, Challenge
+from pwnv.models.challenge import Category, Solved
+from pwnv.models.ctf import Status
+
+_DECODE_ERRORS = (KeyError, TypeError, ValueError, AttributeError)
+
+
+def _str(value) -> str:
+    if not isinstance(value, str):
+        raise TypeError(value)
+    return value
+
+
+def _datetime(value) -> datetime | None:
+    return None if value is None else datetime.fromisoformat(value)
+
+
+def ctf_from_record(record: dict) -> CTF:
+    """Return the CTF stored in ``record`` without running validation.
+
+    Stored records come from ``model_dump(mode="json")``, so each field is
+    decoded directly; anything unexpected goes through full validation.
+    """
+    try:
+        return CTF.model_construct(
+            id=uuid.UUID(record["id"]),
+            name=_str(record["name"]),
+            created_at=datetime.fromisoformat(record["created_at"]),
+            path=Path(record["path"]),
+            running=Status(record.get("running", Status.running)),
+            url=record.get("url"),
+            stopped_at=_datetime(record.get("stopped_at")),
+        )
+    except _DECODE_ERRORS:
+        return CTF(**record)
+
+
+def challenge_from_record(record: dict) -> Challenge:
+    """Return the challenge stored in ``record`` without running validation.
+
+    Extras are deep-copied, since their nested lists and dicts would otherwise
+    be shared with the cached config.
+    """
+    try:
+        ch_id, tags, extras = record["id"], record.get("tags"), record.get("extras")
+        meta_keys = record.get("meta_keys")
+        return Challenge.model_construct(
+            id=ch_id if type(ch_id) is int else uuid.UUID(ch_id),
+            name=_str(record["name"]),
+            flag=record.get("flag"),
+            points=record.get("points"),
+            solved=Solved(record.get("solved", Solved.unsolved)),
+            category=Category(record.get("category", Category.pwn)),
+            ctf_id=uuid.UUID(record["ctf_id"]),
+            path=Path(record["path"]),
+            tags=None if tags is None else [_str(tag) for tag in tags],
+            extras=None if extras is None else copy.deepcopy(extras),
+            meta_keys=None if meta_keys is None else [_str(k) for k in meta_keys],
+        )
+    except _DECODE_ERRORS:
+        return Challenge(**copy.deepcopy(record))
+
+
+def build_indexes(cfg: dict) -> Dict[str, dict]:
+    """Return the lookup tables for the records in ``cfg``.
+
+    Names map to the first record carrying them, like a linear scan would.
+    """
+    indexes: Dict[str, dict] = {
+        "ctf_id": {},
+        "ctf_name": {},
+        "challenge_id": {},
+        "challenge_name": {},
+        "ctf_challenges": {},
+        "category": {},
+        "solved": {},
+    }
+    for pos, ctf in enumerate(cfg.get("ctfs", [])):
+        indexes["ctf_id"].setdefault(str(ctf["id"]), pos)
+        indexes["ctf_name"].setdefault(ctf["name"], pos)
+    for pos, ch in enumerate(cfg.get("challenges", [])):
+        indexes["challenge_id"].setdefault(str(ch["id"]), pos)
+        indexes["challenge_name"].setdefault(ch["name"], pos)
+        category = int(ch.get("category", Category.pwn))
+        solved = int(ch.get("solved", Solved.unsolved))
+        indexes["ctf_challenges"].setdefault(str(ch["ctf_id"]), []).append(pos)
+        indexes["category"].setdefault(category, []).append(pos)
+        indexes["solved"].setdefault(solved, []).append(pos)
+    indexes["duplicate_ids"] = len(indexes["ctf_id"]) != len(
+        cfg.get("ctfs", [])
+    ) or len(indexes["challenge_id"]) != len(cfg.get("challenges", []))
+    return indexes
+
+
+def find_record(records: List[dict], record_id, hint: int | None = None) -> int | None:
+    """Return the position of the record with ``record_id`` in ``records``.
+
+    ``hint`` is the position an index reported for it; it is verified, so a
+    stale hint (records removed or replayed on a newer config) falls back to
+    a scan instead of touching the wrong record.
+    """
+    record_id = str(record_id)
+    if hint is not None and hint < len(records):
+        if str(records[hint]["id"]) == record_id:
+            return hint
+    return next(
+        (pos for pos, r in enumerate(records) if str(r["id"]) == record_id), None
+    )
+
+
+def repair_duplicate_ids(cfg: dict) -> None:
+    """Give every record sharing its id with an earlier one a fresh id.
+
+    Configs written before ids were generated per instance can contain many
+    records with the same id.  Challenges of a re-keyed CTF follow it by
+    path.
+    """
+    moved: List[Tuple[str, str, Path]] = []
+    seen: set = set()
+    ctfs = cfg.get("ctfs", [])
+    for pos, ctf in enumerate(ctfs):
+        if str(ctf["id"]) in seen:
+            new_id = str(uuid.uuid4())
+            moved.append((str(ctf["id"]), new_id, Path(ctf["path"])))
+            ctfs[pos] = ctf = {**ctf, "id": new_id}
+        seen.add(str(ctf["id"]))
+
+    seen = set()
+    challenges = cfg.get("challenges", [])
+    for pos, ch in enumerate(challenges):
+        ctf_id = next(
+            (
+                new_id
+                for old_id, new_id, path in moved
+                if str(ch["ctf_id"]) == old_id and Path(ch["path"]).is_relative_to(path)
+            ),
+            ch["ctf_id"],
+        )
+        if str(ch["id"]) in seen:
+            ch = {**ch, "id": str(uuid.uuid4())}
+        if ctf_id != ch["ctf_id"]:
+            ch = {**ch, "ctf_id": ctf_id}
+        challenges[pos] = ch
+        seen.add(str(ch["id"]))
+
+
+# NUL cannot appear in a path component, so these never clash with a directory.
+_CTF_MARK = "\0ctf"
+_CHALLENGE_MARK = "\0challenge"
+
+
+def _roots(cfg: dict):
+    for mark, key in ((_CTF_MARK, "ctfs"), (_CHALLENGE_MARK, "challenges")):
+        for record in cfg.get(key, []):
+            yield mark, str(record["id"]), record["path"]
+
+
+def path_fingerprint(cfg: dict) -> str:
+    """Return a hash of everything :func:`build_path_trie` depends on."""
+    import hashlib
+
+    digest = hashlib.sha1()
+    for root in _roots(cfg):
+        digest.update("\1".join(root).encode() + b"\2")
+    return digest.hexdigest()
+
+
+def build_path_trie(cfg: dict) -> dict:
+    """Return a trie of path components marking CTF and challenge roots."""
+    trie: dict = {}
+    for mark, record_id, path in _roots(cfg):
+        node = trie
+        for part in Path(path).parts:
+            node = node.setdefault(part, {})
+        node.setdefault(mark, record_id)
+    return trie
+
+
+def resolve_path(trie: dict, path: Path) -> Tuple[str | None, str | None]:
+    """Return the ids of the CTF and challenge owning ``path``.
+
+    Walks one trie node per path component, keeping the deepest match.
+    """
+    ctf = challenge = None
+    node = trie
+    for part in path.parts:
+        node = node.get(part)
+        if node is None:
+            break
+        ctf = node.get(_CTF_MARK, ctf)
+        challenge = node.get(_CHALLENGE_MARK, challenge)
+    return ctf, challenge
+
+
+class Repository:
+    """Indexed, lazily decoded view of the CTFs and challenges in a config.
+
+    Every lookup returns fresh model instances, with their extras copied
+    deeply, so callers may modify them before passing them to ``update_*``
+    without touching the cached state.
+    """
+
+    def __init__(self, cfg: dict, indexes: Dict[str, dict], path_trie: dict):
+        self._ctf_records: List[dict] = cfg.get("ctfs", [])
+        self._challenge_records: List[dict] = cfg.get("challenges", [])
+        self._indexes = indexes
+        self._path_trie = path_trie
+
+    @classmethod
+    def from_config(cls, cfg: dict) -> "Repository":
+        from pwnv.utils.config import load_derived_many
+
+        derived = load_derived_many(
+            {"indexes": build_indexes, "path_trie": build_path_trie},
+            fingerprints={"path_trie": path_fingerprint},
+        )
+        return cls(cfg, derived["indexes"], derived["path_trie"])
+
+    def ctf(self, pos: int) -> CTF:
+        return ctf_from_record(self._ctf_records[pos])
+
+    def challenge(self, pos: int) -> Challenge:
+        return challenge_from_record(self._challenge_records[pos])
+
+    def count_ctfs(self) -> int:
+        return len(self._ctf_records)
+
+    def count_challenges(self, ctf_id=None) -> int:
+        if ctf_id is None:
+            return len(self._challenge_records)
+        return len(self._indexes["ctf_challenges"].get(str(ctf_id), []))
+
+    def _ctf_at(self, index: str, key) -> CTF | None:
+        pos = self._indexes[index].get(key)
+        return None if pos is None else self.ctf(pos)
+
+    def _challenge_at(self, index: str, key) -> Challenge | None:
+        pos = self._indexes[index].get(key)
+        return None if pos is None else self.challenge(pos)
+
+    def _challenges_at(self, index: str, key) -> List[Challenge]:
+        return [self.challenge(pos) for pos in self._indexes[index].get(key, [])]
+
+    def ctfs(self) -> List[CTF]:
+        return [self.ctf(pos) for pos in range(len(self._ctf_records))]
+
+    def challenges(self) -> List[Challenge]:
+        return [self.challenge(pos) for pos in range(len(self._challenge_records))]
+
+    def ctf_by_id(self, ctf_id) -> CTF | None:
+        return self._ctf_at("ctf_id", str(ctf_id))
+
+    def ctf_by_name(self, name: str) -> CTF | None:
+        return self._ctf_at("ctf_name", name)
+
+    def challenge_by_id(self, challenge_id) -> Challenge | None:
+        return self._challenge_at("challenge_id", str(challenge_id))
+
+    def challenge_by_name(self, name: str) -> Challenge | None:
+        return self._challenge_at("challenge_name", name)
+
+    def challenges_for_ctf(self, ctf_id) -> List[Challenge]:
+        return self._challenges_at("ctf_challenges", str(ctf_id))
+
+    def challenges_by_category(self, category: Category) -> List[Challenge]:
+        return self._challenges_at("category", int(category))
+
+    def challenges_by_solved(self, solved: Solved) -> List[Challenge]:
+        return self._challenges_at("solved", int(solved))
+
+    def ctf_by_path(self, path: Path) -> CTF | None:
+        ctf_id = resolve_path(self._path_trie, path)[0]
+        return None if ctf_id is None else self.ctf_by_id(ctf_id)
+
+    def challenge_by_path(self, path: Path) -> Challenge | None:
+        challenge_id = resolve_path(self._path_trie, path)[1]
+        return None if challenge_id is None else self.challenge_by_id(challenge_id)
+
+    @property
+    def has_duplicate_ids(self) -> bool:
+        return self._indexes["duplicate_ids"]
+
+    def ctf_position(self, ctf_id) -> int | None:
+        return self._indexes["ctf_id"].get(str(ctf_id))
+
+    def challenge_position(self, challenge_id) -> int | None:
+        return self._indexes["challenge_id"].get(str(challenge_id))
+
+    def populated_ctfs(self) -> List[CTF]:
+        """Return the CTFs that have at least one challenge."""
+        populated = self._indexes["ctf_challenges"]
+        return [
+            self.ctf(pos)
+            for pos, record in enumerate(self._ctf_records)
+            if str(record["id"]) in populated
+        ]
@@ -0,0 +1,238 @@
+"""Retries, backoff and circuit breaking for calls to remote platforms.
+
+Every ``ctfbridge`` call goes through :func:`call`, which classifies a
+failure by walking its chain of causes:
+
+* rate limited (HTTP 429): retried after ``Retry-After``, or the backoff if
+  that is longer;
+* transient (connection errors, timeouts, HTTP 5xx): retried with jittered
+  exponential backoff;
+* anything else (bad credentials, 4xx, parse errors): raised at once.
+
+Consecutive transient failures against one host open its circuit breaker,
+which then fails calls immediately until a cooldown has passed.  Latency,
+retries and failures are recorded per kind of call, see
+:func:`get_call_stats`.
+"""
+
+import asyncio
+import random
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Iterator
+from urllib.parse import urlparse
+
+RATE_LIMITED, TRANSIENT, FATAL = "rate_limited", "transient", "fatal"
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a host whose circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """Opens after ``threshold`` consecutive failures, for ``cooldown`` seconds.
+
+    Once the cooldown is over one call is let through as a probe, the others
+    are refused until its outcome closes or reopens the breaker.
+    """
+
+    def __init__(self, threshold: int, cooldown: float):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at: float | None = None
+        self.probing = False
+
+    def allow(self) -> bool:
+        if self.opened_at is None:
+            return True
+        if self.probing or time.monotonic() - self.opened_at < self.cooldown:
+            return False
+        self.probing = True
+        return True
+
+    def release(self) -> None:
+        """Let another call probe, the last one ended without a verdict."""
+        self.probing = False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self.probing = False
+        if self.failures >= self.threshold:
+            self.opened_at = time.monotonic()
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_stats: Dict[str, Counter] = {}
+_attempt_cap: ContextVar[int | None] = ContextVar("attempt_cap", default=None)
+
+
+@contextmanager
+def attempt_limit(attempts: int) -> Iterator[None]:
+    """Cap the attempts of every call made within the block.
+
+    Remote operations started inside it inherit the cap, so a command can
+    try the platform once and fall back at once if it is unavailable.
+    """
+    token = _attempt_cap.set(attempts)
+    try:
+        yield
+    finally:
+        _attempt_cap.reset(token)
+
+
+def host_key(url: str | None) -> str:
+    """Return the key breakers and rate limits of ``url`` are shared under."""
+    return urlparse(url or "").netloc or "remote"
+
+
+def get_breaker(key: str) -> CircuitBreaker:
+    from pwnv.constants import DEFAULT_BREAKER_COOLDOWN, DEFAULT_BREAKER_THRESHOLD
+
+    if key not in _breakers:
+        _breakers[key] = CircuitBreaker(
+            DEFAULT_BREAKER_THRESHOLD, DEFAULT_BREAKER_COOLDOWN
+        )
+    return _breakers[key]
+
+
+def retry_after(exc: BaseException | None) -> float | None:
+    """Return the delay a rate-limited request asked for, ``None`` otherwise.
+
+    Platform clients wrap the rate-limit error, so the whole chain of causes
+    is searched.  ``Retry-After`` may be a number of seconds or an HTTP date;
+    a value that is neither gives 0, i.e. the usual backoff.
+    """
+    while exc is not None:
+        if hasattr(exc, "retry_after"):
+            return _parse_retry_after(exc.retry_after)
+        response = getattr(exc, "response", None)
+        if getattr(response, "status_code", None) == 429:
+            return _parse_retry_after(response.headers.get("Retry-After"))
+        exc = exc.__cause__ or exc.__context__
+    return None
+
+
+def _parse_retry_after(value: Any) -> float:
+    """Return ``value`` as seconds to wait, capped at ``DEFAULT_MAX_RETRY_AFTER``."""
+    from datetime import datetime, timezone
+    from email.utils import parsedate_to_datetime
+
+    from pwnv.constants import DEFAULT_MAX_RETRY_AFTER
+
+    try:
+        delay = float(value or 0)
+    except (TypeError, ValueError):
+        try:
+            when = parsedate_to_datetime(str(value))
+        except (TypeError, ValueError):
+            return 0.0
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        delay = (when - datetime.now(timezone.utc)).total_seconds()
+    if delay != delay:  # NaN
+        return 0.0
+    return min(max(delay, 0.0), DEFAULT_MAX_RETRY_AFTER)
+
+
+def classify(exc: BaseException) -> str:
+    """Return whether ``exc`` is worth retrying, and how."""
+    import httpx
+
+    if retry_after(exc) is not None:
+        return RATE_LIMITED
+    seen = set()
+    while exc is not None and id(exc) not in seen:
+        seen.add(id(exc))
+        status = getattr(exc, "status_code", None)
+        if status is None:
+            status = getattr(getattr(exc, "response", None), "status_code", None)
+        if isinstance(status, int):
+            return TRANSIENT if status >= 500 or status == 408 else FATAL
+        if isinstance(exc, (httpx.TransportError, OSError, asyncio.TimeoutError)):
+            return TRANSIENT
+        exc = exc.__cause__ or exc.__context__
+    return FATAL
+
+
+def get_call_stats() -> Dict[str, Counter]:
+    """Return the recorded counters (``calls``, ``retries``, ``failures``,
+    ``seconds``, ``slowest``) per kind of call."""
+    return _stats
+
+
+def reset_call_stats() -> None:
+    _stats.clear()
+
+
+def _record(label: str, seconds: float, retries: int, failed: bool) -> None:
+    stats = _stats.setdefault(label, Counter())
+    stats["calls"] += 1
+    stats["retries"] += retries
+    stats["failures"] += failed
+    stats["seconds"] += seconds
+    stats["slowest"] = max(stats["slowest"], seconds)
+
+
+async def call(
+    key: str,
+    label: str,
+    fn: Callable[[], Awaitable[Any]],
+    attempts: int | None = None,
+    on_rate_limit: Callable[[float], None] | None = None,
+) -> Any:
+    """Await ``fn()``, retrying it as its failures allow.
+
+    ``key`` selects the circuit breaker (see :func:`host_key`) and ``label``
+    the statistics.  ``attempts`` defaults to the ``remote_attempts`` config
+    value.  With ``on_rate_limit`` a rate-limit delay is handed to it (e.g. a
+    shared :class:`~pwnv.utils.ratelimit.TokenBucket`) instead of slept.
+    :func:`attempt_limit` caps the attempts from outside.
+    """
+    from pwnv.constants import DEFAULT_REMOTE_ATTEMPTS
+    from pwnv.utils.config import get_config_value
+
+    attempts = (
+        attempts or get_config_value("remote_attempts") or DEFAULT_REMOTE_ATTEMPTS
+    )
+    attempts = min(attempts, _attempt_cap.get() or attempts)
+    breaker = get_breaker(key)
+    start = time.perf_counter()
+    for attempt in range(attempts):
+        probe = breaker.opened_at is not None
+        if not breaker.allow():
+            _record(label, time.perf_counter() - start, attempt, True)
+            raise CircuitOpenError(f"{key} keeps failing, not contacting it for now")
+        try:
+            result = await fn()
+        except Exception as e:
+            kind = classify(e)
+            if kind == TRANSIENT:
+                breaker.record_failure()
+            elif probe:
+                breaker.release()
+            if kind == FATAL or attempt + 1 == attempts:
+                _record(label, time.perf_counter() - start, attempt, True)
+                raise
+            delay = 0.5 * 2**attempt * (0.5 + random.random() / 2)
+            if kind == RATE_LIMITED:
+                delay = max(delay, retry_after(e))
+                if on_rate_limit is not None:
+                    on_rate_limit(delay)
+                    continue
+            await asyncio.sleep(delay)
+        except BaseException:
+            if probe:
+                breaker.release()
+            raise
+        else:
+            breaker.record_success()
+            _record(label, time.perf_counter() - start, attempt, False)
+            return result
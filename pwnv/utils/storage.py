@@ -0,0 +1,872 @@
+"""Storage backends for CTF and challenge records.
+
+``JsonStorage`` keeps every record inside the main configuration file,
+``SqliteStorage`` keeps them in an indexed SQLite database next to it and
+``ShardedStorage`` keeps one file per CTF inside its directory.  The backend
+is selected by the ``storage`` key of the configuration and all of them
+expose the same API, so :mod:`pwnv.utils.crud` does not care which one is in
+use.
+"""
+
+import sqlite3
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import ContextManager, Dict, Iterable, Iterator, List, Set
+
+from pwnv.models import CTF, Challenge
+from pwnv.models.challenge import Category, Solved
+from pwnv.models.ctf import Status
+from pwnv.utils.repository import (
+    Repository,
+    challenge_from_record,
+    ctf_from_record,
+    find_record,
+    repair_duplicate_ids,
+)
+
+STORAGE_BACKENDS = ("json", "sqlite", "sharded")
+
+
+class Storage(ABC):
+    """Common interface implemented by every storage backend."""
+
+    name: str
+
+    # [READ]
+    @abstractmethod
+    def get_ctfs(self) -> List[CTF]: ...
+
+    @abstractmethod
+    def get_challenges(self) -> List[Challenge]: ...
+
+    @abstractmethod
+    def get_tags(self) -> Set[str]: ...
+
+    def count_ctfs(self) -> int:
+        return len(self.get_ctfs())
+
+    def count_challenges(self, ctf_id=None) -> int:
+        if ctf_id is None:
+            return len(self.get_challenges())
+        return len(self.challenges_for_ctf(ctf_id))
+
+    def get_ctfs_by_status(self, status: Status) -> List[CTF]:
+        return [ctf for ctf in self.get_ctfs() if ctf.running == status]
+
+    def get_ctf(self, ctf_id) -> CTF | None:
+        return next((ctf for ctf in self.get_ctfs() if ctf.id == ctf_id), None)
+
+    def get_ctf_by_name(self, name: str) -> CTF | None:
+        return next((ctf for ctf in self.get_ctfs() if ctf.name == name), None)
+
+    def get_challenge_by_name(self, name: str) -> Challenge | None:
+        return next((ch for ch in self.get_challenges() if ch.name == name), None)
+
+    def get_challenge(self, challenge_id) -> Challenge | None:
+        return next((ch for ch in self.get_challenges() if ch.id == challenge_id), None)
+
+    def challenges_for_ctf(self, ctf_id) -> List[Challenge]:
+        return [ch for ch in self.get_challenges() if ch.ctf_id == ctf_id]
+
+    def get_challenges_by_category(self, category: Category) -> List[Challenge]:
+        return [ch for ch in self.get_challenges() if ch.category == category]
+
+    def get_challenges_by_solved(self, solved: Solved) -> List[Challenge]:
+        return [ch for ch in self.get_challenges() if ch.solved == solved]
+
+    def get_populated_ctfs(self) -> List[CTF]:
+        populated = {ch.ctf_id for ch in self.get_challenges()}
+        return [ctf for ctf in self.get_ctfs() if ctf.id in populated]
+
+    def get_ctf_by_path(self, path: Path) -> CTF | None:
+        return next(
+            (ctf for ctf in self.get_ctfs() if path.is_relative_to(ctf.path)), None
+        )
+
+    def get_challenge_by_path(self, path: Path) -> Challenge | None:
+        return next(
+            (ch for ch in self.get_challenges() if path.is_relative_to(ch.path)), None
+        )
+
+    # [WRITE]
+    @abstractmethod
+    def transaction(self) -> ContextManager[None]:
+        """Group the writes made inside the block into a single commit."""
+
+    @abstractmethod
+    def add_ctf(self, ctf: CTF) -> None: ...
+
+    @abstractmethod
+    def add_challenge(self, ch: Challenge) -> None: ...
+
+    @abstractmethod
+    def add_tags(self, tags: Iterable[str]) -> None: ...
+
+    @abstractmethod
+    def update_ctf(self, ctf: CTF) -> None: ...
+
+    @abstractmethod
+    def update_challenge(self, ch: Challenge) -> None: ...
+
+    @abstractmethod
+    def remove_ctf(self, ctf: CTF) -> None: ...
+
+    @abstractmethod
+    def remove_challenge(self, ch: Challenge) -> None: ...
+
+    # [MIGRATION]
+    @abstractmethod
+    def import_records(
+        self, ctfs: List[CTF], challenges: List[Challenge], tags: Set[str]
+    ) -> None:
+        """Bulk insert records copied from another backend."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Drop every stored record."""
+
+
+def _merge_record(base: dict, ours: dict, theirs: dict) -> dict:
+    """Three-way merge of a record edited here (``ours``) and concurrently.
+
+    Fields we left untouched keep the concurrent value; a field changed on
+    both sides to different values is a conflict.
+    """
+    from pwnv.utils.config import ConfigConflictError
+
+    if theirs == base:
+        return ours
+    merged = dict(theirs)
+    for field in ours.keys() | base.keys():
+        if ours.get(field) == base.get(field):
+            continue
+        if theirs.get(field) not in (base.get(field), ours.get(field)):
+            raise ConfigConflictError(
+                f"'{field}' of '{ours.get('name')}' was changed concurrently."
+            )
+        merged[field] = ours.get(field)
+    return merged
+
+
+class JsonStorage(Storage):
+    """Records stored in the ``ctfs``/``challenges`` lists of the config file."""
+
+    name = "json"
+
+    @staticmethod
+    def _repository() -> Repository:
+        """Return the indexed view of the current config generation."""
+        from pwnv.utils.config import load_derived, update_config
+
+        repository = load_derived("repository", Repository.from_config, persist=False)
+        if repository.has_duplicate_ids:
+            # Written by versions that shared one id between all records;
+            # re-key them before any id-based lookup or update can go wrong.
+            update_config(repair_duplicate_ids)
+            repository = load_derived(
+                "repository", Repository.from_config, persist=False
+            )
+        return repository
+
+    def get_ctfs(self) -> List[CTF]:
+        return self._repository().ctfs()
+
+    def get_challenges(self) -> List[Challenge]:
+        return self._repository().challenges()
+
+    def get_ctf(self, ctf_id) -> CTF | None:
+        return self._repository().ctf_by_id(ctf_id)
+
+    def get_ctf_by_name(self, name: str) -> CTF | None:
+        return self._repository().ctf_by_name(name)
+
+    def get_challenge(self, challenge_id) -> Challenge | None:
+        return self._repository().challenge_by_id(challenge_id)
+
+    def get_challenge_by_name(self, name: str) -> Challenge | None:
+        return self._repository().challenge_by_name(name)
+
+    def challenges_for_ctf(self, ctf_id) -> List[Challenge]:
+        return self._repository().challenges_for_ctf(ctf_id)
+
+    def get_challenges_by_category(self, category: Category) -> List[Challenge]:
+        return self._repository().challenges_by_category(category)
+
+    def get_challenges_by_solved(self, solved: Solved) -> List[Challenge]:
+        return self._repository().challenges_by_solved(solved)
+
+    def get_populated_ctfs(self) -> List[CTF]:
+        return self._repository().populated_ctfs()
+
+    def get_ctf_by_path(self, path: Path) -> CTF | None:
+        return self._repository().ctf_by_path(path)
+
+    def get_challenge_by_path(self, path: Path) -> Challenge | None:
+        return self._repository().challenge_by_path(path)
+
+    def get_tags(self) -> Set[str]:
+        from pwnv.utils.config import load_config
+
+        return set(load_config().get("challenge_tags", []))
+
+    def count_ctfs(self) -> int:
+        return self._repository().count_ctfs()
+
+    def count_challenges(self, ctf_id=None) -> int:
+        return self._repository().count_challenges(ctf_id)
+
+    def transaction(self):
+        from pwnv.utils.config import transaction
+
+        return transaction()
+
+    def add_ctf(self, ctf: CTF) -> None:
+        from pwnv.utils.config import update_config
+
+        record = ctf.model_dump(mode="json")
+        update_config(lambda cfg: cfg.setdefault("ctfs", []).append(record))
+
+    def add_challenge(self, ch: Challenge) -> None:
+        from pwnv.utils.config import update_config
+
+        record = ch.model_dump(mode="json")
+        update_config(lambda cfg: cfg.setdefault("challenges", []).append(record))
+
+    def add_tags(self, tags: Iterable[str]) -> None:
+        from pwnv.utils.config import update_config
+
+        new_tags = {t.lower() for t in tags}
+
+        def _add(cfg: dict) -> None:
+            cfg["challenge_tags"] = list(set(cfg.get("challenge_tags", [])) | new_tags)
+
+        update_config(_add)
+
+    @staticmethod
+    def _update_record(key: str, record: dict, hint: int | None) -> None:
+        from pwnv.utils.config import load_config, update_config
+
+        current = load_config().get(key, [])
+        pos = find_record(current, record["id"], hint)
+        base = None if pos is None else current[pos]
+
+        def _update(cfg: dict) -> None:
+            records = cfg.setdefault(key, [])
+            idx = find_record(records, record["id"], pos)
+            if idx is not None:
+                records[idx] = _merge_record(base or records[idx], record, records[idx])
+
+        update_config(_update)
+
+    def update_ctf(self, ctf: CTF) -> None:
+        hint = self._repository().ctf_position(ctf.id)
+        self._update_record("ctfs", ctf.model_dump(mode="json"), hint)
+
+    def update_challenge(self, ch: Challenge) -> None:
+        hint = self._repository().challenge_position(ch.id)
+        self._update_record("challenges", ch.model_dump(mode="json"), hint)
+
+    def remove_ctf(self, ctf: CTF) -> None:
+        from pwnv.utils.config import update_config
+
+        def _remove(cfg: dict) -> None:
+            cfg["ctfs"] = [c for c in cfg.get("ctfs", []) if c["id"] != str(ctf.id)]
+            cfg["challenges"] = [
+                ch for ch in cfg.get("challenges", []) if ch["ctf_id"] != str(ctf.id)
+            ]
+
+        update_config(_remove)
+
+    def remove_challenge(self, ch: Challenge) -> None:
+        from pwnv.utils.config import update_config
+
+        hint = self._repository().challenge_position(ch.id)
+
+        def _remove(cfg: dict) -> None:
+            records = cfg.get("challenges", [])
+            pos = find_record(records, ch.id, hint)
+            if pos is not None:
+                del records[pos]
+
+        update_config(_remove)
+
+    def import_records(
+        self, ctfs: List[CTF], challenges: List[Challenge], tags: Set[str]
+    ) -> None:
+        from pwnv.utils.config import update_config
+
+        ctf_records = [ctf.model_dump(mode="json") for ctf in ctfs]
+        challenge_records = [ch.model_dump(mode="json") for ch in challenges]
+
+        def _import(cfg: dict) -> None:
+            cfg.setdefault("ctfs", []).extend(ctf_records)
+            cfg.setdefault("challenges", []).extend(challenge_records)
+            cfg["challenge_tags"] = list(set(cfg.get("challenge_tags", [])) | tags)
+
+        update_config(_import)
+
+    def clear(self) -> None:
+        from pwnv.utils.config import update_config
+
+        def _clear(cfg: dict) -> None:
+            cfg["ctfs"], cfg["challenges"], cfg["challenge_tags"] = [], [], []
+
+        update_config(_clear)
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ctfs (
+    id TEXT NOT NULL PRIMARY KEY,
+    name TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    path TEXT NOT NULL,
+    running INTEGER NOT NULL,
+    url TEXT,
+    stopped_at TEXT
+);
+CREATE TABLE IF NOT EXISTS challenges (
+    id TEXT NOT NULL PRIMARY KEY,
+    name TEXT NOT NULL,
+    flag TEXT,
+    points INTEGER,
+    solved INTEGER NOT NULL,
+    category INTEGER NOT NULL,
+    ctf_id TEXT NOT NULL,
+    path TEXT NOT NULL,
+    tags TEXT,
+    extras TEXT,
+    meta_keys TEXT
+);
+CREATE TABLE IF NOT EXISTS tags (
+    tag TEXT PRIMARY KEY
+);
+CREATE INDEX IF NOT EXISTS ctfs_name ON ctfs (name);
+CREATE INDEX IF NOT EXISTS ctfs_path ON ctfs (path);
+CREATE INDEX IF NOT EXISTS challenges_name ON challenges (name);
+CREATE INDEX IF NOT EXISTS challenges_ctf_id ON challenges (ctf_id);
+CREATE INDEX IF NOT EXISTS challenges_path ON challenges (path);
+CREATE INDEX IF NOT EXISTS challenges_category ON challenges (category);
+CREATE INDEX IF NOT EXISTS challenges_solved ON challenges (solved);
+"""
+
+_CTF_COLUMNS = ("id", "name", "created_at", "path", "running", "url", "stopped_at")
+_CHALLENGE_COLUMNS = (
+    "id",
+    "name",
+    "flag",
+    "points",
+    "solved",
+    "category",
+    "ctf_id",
+    "path",
+    "tags",
+    "extras",
+    "meta_keys",
+)
+# Challenge columns holding JSON-encoded lists and dicts.
+_JSON_COLUMNS = ("tags", "extras", "meta_keys")
+
+
+def _ctf_row(ctf: CTF) -> tuple:
+    data = ctf.model_dump(mode="json")
+    return tuple(data[col] for col in _CTF_COLUMNS)
+
+
+def _challenge_row(ch: Challenge) -> tuple:
+    import json
+
+    data = ch.model_dump(mode="json")
+    for col in _JSON_COLUMNS:
+        data[col] = None if data[col] is None else json.dumps(data[col])
+    return tuple(data[col] for col in _CHALLENGE_COLUMNS)
+
+
+def _ctf_from_row(row: sqlite3.Row) -> CTF:
+    return ctf_from_record(dict(row))
+
+
+def _challenge_from_row(row: sqlite3.Row) -> Challenge:
+    import json
+
+    data = dict(row)
+    for col in _JSON_COLUMNS:
+        data[col] = None if data[col] is None else json.loads(data[col])
+    return challenge_from_record(data)
+
+
+def _ancestors(path: Path) -> List[str]:
+    return [str(p) for p in (path, *path.parents)]
+
+
+class SqliteStorage(Storage):
+    """Records stored in an SQLite database with indexed lookups."""
+
+    name = "sqlite"
+
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        self._conn = sqlite3.connect(db_path)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._in_transaction = False
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        if self._in_transaction:
+            yield
+            return
+        self._in_transaction = True
+        try:
+            with self._conn:
+                yield
+        finally:
+            self._in_transaction = False
+
+    @contextmanager
+    def _write(self) -> Iterator[None]:
+        if self._in_transaction:
+            yield
+        else:
+            with self._conn:
+                yield
+
+    def _ctfs(self, where: str = "", params: tuple = ()) -> List[CTF]:
+        rows = self._conn.execute(f"SELECT * FROM ctfs {where}", params)
+        return [_ctf_from_row(row) for row in rows]
+
+    def _challenges(self, where: str = "", params: tuple = ()) -> List[Challenge]:
+        rows = self._conn.execute(f"SELECT * FROM challenges {where}", params)
+        return [_challenge_from_row(row) for row in rows]
+
+    def get_ctfs(self) -> List[CTF]:
+        return self._ctfs("ORDER BY rowid")
+
+    def get_challenges(self) -> List[Challenge]:
+        return self._challenges("ORDER BY rowid")
+
+    def get_tags(self) -> Set[str]:
+        return {row["tag"] for row in self._conn.execute("SELECT tag FROM tags")}
+
+    def count_ctfs(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM ctfs").fetchone()[0]
+
+    def count_challenges(self, ctf_id=None) -> int:
+        if ctf_id is None:
+            query, params = "SELECT COUNT(*) FROM challenges", ()
+        else:
+            query = "SELECT COUNT(*) FROM challenges WHERE ctf_id = ?"
+            params = (str(ctf_id),)
+        return self._conn.execute(query, params).fetchone()[0]
+
+    def get_ctfs_by_status(self, status: Status) -> List[CTF]:
+        return self._ctfs("WHERE running = ? ORDER BY rowid", (int(status),))
+
+    def get_ctf(self, ctf_id) -> CTF | None:
+        return next(iter(self._ctfs("WHERE id = ?", (str(ctf_id),))), None)
+
+    def get_ctf_by_name(self, name: str) -> CTF | None:
+        return next(iter(self._ctfs("WHERE name = ?", (name,))), None)
+
+    def get_challenge_by_name(self, name: str) -> Challenge | None:
+        return next(iter(self._challenges("WHERE name = ?", (name,))), None)
+
+    def get_challenge(self, challenge_id) -> Challenge | None:
+        return next(iter(self._challenges("WHERE id = ?", (str(challenge_id),))), None)
+
+    def challenges_for_ctf(self, ctf_id) -> List[Challenge]:
+        return self._challenges("WHERE ctf_id = ? ORDER BY rowid", (str(ctf_id),))
+
+    def get_challenges_by_category(self, category: Category) -> List[Challenge]:
+        return self._challenges("WHERE category = ? ORDER BY rowid", (int(category),))
+
+    def get_challenges_by_solved(self, solved: Solved) -> List[Challenge]:
+        return self._challenges("WHERE solved = ? ORDER BY rowid", (int(solved),))
+
+    def get_populated_ctfs(self) -> List[CTF]:
+        return self._ctfs(
+            "WHERE id IN (SELECT DISTINCT ctf_id FROM challenges) ORDER BY rowid"
+        )
+
+    def get_ctf_by_path(self, path: Path) -> CTF | None:
+        # A record owns ``path`` when its own path is one of the ancestors, so
+        # the lookup is a handful of index probes instead of a table scan.
+        ancestors = _ancestors(path)
+        marks = ", ".join("?" * len(ancestors))
+        return next(
+            iter(self._ctfs(f"WHERE path IN ({marks}) ORDER BY rowid", ancestors)),
+            None,
+        )
+
+    def get_challenge_by_path(self, path: Path) -> Challenge | None:
+        ancestors = _ancestors(path)
+        marks = ", ".join("?" * len(ancestors))
+        return next(
+            iter(
+                self._challenges(f"WHERE path IN ({marks}) ORDER BY rowid", ancestors)
+            ),
+            None,
+        )
+
+    def _insert_ctfs(self, ctfs: Iterable[CTF]) -> None:
+        marks = ", ".join("?" * len(_CTF_COLUMNS))
+        self._conn.executemany(
+            f"INSERT INTO ctfs ({', '.join(_CTF_COLUMNS)}) VALUES ({marks})",
+            [_ctf_row(ctf) for ctf in ctfs],
+        )
+
+    def _insert_challenges(self, challenges: Iterable[Challenge]) -> None:
+        marks = ", ".join("?" * len(_CHALLENGE_COLUMNS))
+        self._conn.executemany(
+            f"INSERT INTO challenges ({', '.join(_CHALLENGE_COLUMNS)}) "
+            f"VALUES ({marks})",
+            [_challenge_row(ch) for ch in challenges],
+        )
+
+    def _insert_tags(self, tags: Iterable[str]) -> None:
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO tags (tag) VALUES (?)", [(t,) for t in tags]
+        )
+
+    def add_ctf(self, ctf: CTF) -> None:
+        with self._write():
+            self._insert_ctfs([ctf])
+
+    def add_challenge(self, ch: Challenge) -> None:
+        with self._write():
+            self._insert_challenges([ch])
+
+    def add_tags(self, tags: Iterable[str]) -> None:
+        with self._write():
+            self._insert_tags({t.lower() for t in tags})
+
+    def update_ctf(self, ctf: CTF) -> None:
+        columns = ", ".join(f"{col} = ?" for col in _CTF_COLUMNS)
+        with self._write():
+            self._conn.execute(
+                f"UPDATE ctfs SET {columns} WHERE id = ?",
+                (*_ctf_row(ctf), str(ctf.id)),
+            )
+
+    def update_challenge(self, ch: Challenge) -> None:
+        columns = ", ".join(f"{col} = ?" for col in _CHALLENGE_COLUMNS)
+        with self._write():
+            self._conn.execute(
+                f"UPDATE challenges SET {columns} WHERE id = ?",
+                (*_challenge_row(ch), str(ch.id)),
+            )
+
+    def remove_ctf(self, ctf: CTF) -> None:
+        with self._write():
+            self._conn.execute(
+                "DELETE FROM challenges WHERE ctf_id = ?", (str(ctf.id),)
+            )
+            self._conn.execute("DELETE FROM ctfs WHERE id = ?", (str(ctf.id),))
+
+    def remove_challenge(self, ch: Challenge) -> None:
+        with self._write():
+            self._conn.execute("DELETE FROM challenges WHERE id = ?", (str(ch.id),))
+
+    def import_records(
+        self, ctfs: List[CTF], challenges: List[Challenge], tags: Set[str]
+    ) -> None:
+        with self._write():
+            self._insert_ctfs(ctfs)
+            self._insert_challenges(challenges)
+            self._insert_tags(tags)
+
+    def clear(self) -> None:
+        with self._write():
+            for table in ("challenges", "ctfs", "tags"):
+                self._conn.execute(f"DELETE FROM {table}")
+
+
+def _summary(ctf: dict) -> dict:
+    return {key: ctf[key] for key in ("id", "name", "path", "running")}
+
+
+class ShardedStorage(Storage):
+    """A small root manifest plus one shard file per CTF.
+
+    The manifest lists every CTF by id, name, path and status (plus the tags);
+    the CTF record and its challenges live in ``<ctf.path>/.pwnv/ctf.json``.
+    A write only replaces the shard it concerns, and the manifest when a
+    summary changes, so its cost does not grow with the number of old CTFs.
+    """
+
+    name = "sharded"
+
+    def __init__(self, manifest_path: Path):
+        from filelock import SoftFileLock
+
+        self.manifest_path = manifest_path
+        self._lock = SoftFileLock(f"{manifest_path}.lock")
+        # Files read or changed by the running transaction; ``None`` deletes.
+        self._pending: Dict[Path, dict | None] | None = None
+
+    @staticmethod
+    def shard_path(ctf_path) -> Path:
+        from pwnv.constants import DEFAULT_SHARD_BASENAME, DEFAULT_SHARD_DIRNAME
+
+        return Path(ctf_path) / DEFAULT_SHARD_DIRNAME / DEFAULT_SHARD_BASENAME
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        if self._pending is not None:
+            yield
+            return
+        from pwnv.utils.config import write_json
+
+        with self._lock:
+            self._pending = {}
+            try:
+                yield
+                for path, data in self._pending.items():
+                    if data is None:
+                        path.unlink(missing_ok=True)
+                    else:
+                        write_json(path, data)
+            finally:
+                self._pending = None
+
+    def _read(self, path: Path, default: dict) -> dict:
+        import json
+
+        if self._pending is not None and path in self._pending:
+            return self._pending[path] or default
+        try:
+            return json.loads(path.read_text())
+        except FileNotFoundError:
+            return default
+
+    def _edit(self, path: Path, default: dict) -> dict:
+        """Return the copy of ``path`` written when the transaction commits."""
+        data = self._pending[path] = self._read(path, default)
+        return data
+
+    def _manifest(self) -> dict:
+        return self._read(self.manifest_path, {"ctfs": [], "challenge_tags": []})
+
+    def _edit_manifest(self) -> dict:
+        return self._edit(self.manifest_path, {"ctfs": [], "challenge_tags": []})
+
+    def _shard(self, entry: dict) -> dict:
+        return self._read(self.shard_path(entry["path"]), {"challenges": []})
+
+    def _edit_shard(self, entry: dict) -> dict:
+        return self._edit(self.shard_path(entry["path"]), {"challenges": []})
+
+    def _entry(self, ctf_id) -> dict | None:
+        return next(
+            (e for e in self._manifest()["ctfs"] if e["id"] == str(ctf_id)), None
+        )
+
+    def _ctf(self, entry: dict | None) -> CTF | None:
+        if entry is None or "ctf" not in (shard := self._shard(entry)):
+            return None
+        return ctf_from_record(shard["ctf"])
+
+    def _challenges_of(self, entry: dict | None) -> List[Challenge]:
+        if entry is None:
+            return []
+        return [challenge_from_record(ch) for ch in self._shard(entry)["challenges"]]
+
+    def get_ctfs(self) -> List[CTF]:
+        return [ctf for e in self._manifest()["ctfs"] if (ctf := self._ctf(e))]
+
+    def get_challenges(self) -> List[Challenge]:
+        return [ch for e in self._manifest()["ctfs"] for ch in self._challenges_of(e)]
+
+    def get_tags(self) -> Set[str]:
+        return set(self._manifest()["challenge_tags"])
+
+    def count_ctfs(self) -> int:
+        return len(self._manifest()["ctfs"])
+
+    def count_challenges(self, ctf_id=None) -> int:
+        entries = self._manifest()["ctfs"] if ctf_id is None else [self._entry(ctf_id)]
+        return sum(len(self._shard(e)["challenges"]) for e in entries if e)
+
+    def get_ctfs_by_status(self, status: Status) -> List[CTF]:
+        entries = self._manifest()["ctfs"]
+        return [
+            ctf
+            for e in entries
+            if e["running"] == int(status) and (ctf := self._ctf(e))
+        ]
+
+    def get_ctf(self, ctf_id) -> CTF | None:
+        return self._ctf(self._entry(ctf_id))
+
+    def get_ctf_by_name(self, name: str) -> CTF | None:
+        entries = self._manifest()["ctfs"]
+        return self._ctf(next((e for e in entries if e["name"] == name), None))
+
+    def challenges_for_ctf(self, ctf_id) -> List[Challenge]:
+        return self._challenges_of(self._entry(ctf_id))
+
+    def _entry_by_path(self, path: Path) -> dict | None:
+        entries = self._manifest()["ctfs"]
+        return next((e for e in entries if path.is_relative_to(e["path"])), None)
+
+    def get_ctf_by_path(self, path: Path) -> CTF | None:
+        return self._ctf(self._entry_by_path(path))
+
+    def get_challenge_by_path(self, path: Path) -> Challenge | None:
+        return next(
+            (
+                ch
+                for ch in self._challenges_of(self._entry_by_path(path))
+                if path.is_relative_to(ch.path)
+            ),
+            None,
+        )
+
+    def add_ctf(self, ctf: CTF) -> None:
+        record = ctf.model_dump(mode="json")
+        with self.transaction():
+            self._edit_manifest()["ctfs"].append(_summary(record))
+            self._edit_shard(record)["ctf"] = record
+
+    def add_challenge(self, ch: Challenge) -> None:
+        with self.transaction():
+            entry = self._entry(ch.ctf_id)
+            if entry is None:
+                raise ValueError(f"No CTF with id '{ch.ctf_id}'.")
+            self._edit_shard(entry)["challenges"].append(ch.model_dump(mode="json"))
+
+    def add_tags(self, tags: Iterable[str]) -> None:
+        with self.transaction():
+            manifest = self._edit_manifest()
+            manifest["challenge_tags"] = sorted(
+                set(manifest["challenge_tags"]) | {t.lower() for t in tags}
+            )
+
+    def update_ctf(self, ctf: CTF) -> None:
+        record = ctf.model_dump(mode="json")
+        with self.transaction():
+            entry = self._entry(ctf.id)
+            if entry is None:
+                return
+            if entry != _summary(record):
+                entries = self._edit_manifest()["ctfs"]
+                entries[entries.index(entry)] = _summary(record)
+                if entry["path"] != record["path"]:
+                    shard = self._shard(entry)
+                    self._pending[self.shard_path(entry["path"])] = None
+                    self._pending[self.shard_path(record["path"])] = shard
+            self._edit_shard(record)["ctf"] = record
+
+    def update_challenge(self, ch: Challenge) -> None:
+        with self.transaction():
+            entry = self._entry(ch.ctf_id)
+            if entry is None:
+                return
+            challenges = self._edit_shard(entry)["challenges"]
+            pos = find_record(challenges, ch.id)
+            if pos is not None:
+                challenges[pos] = ch.model_dump(mode="json")
+
+    def remove_ctf(self, ctf: CTF) -> None:
+        with self.transaction():
+            entry = self._entry(ctf.id)
+            if entry is None:
+                return
+            self._edit_manifest()["ctfs"].remove(entry)
+            self._pending[self.shard_path(entry["path"])] = None
+
+    def remove_challenge(self, ch: Challenge) -> None:
+        with self.transaction():
+            entry = self._entry(ch.ctf_id)
+            if entry is None:
+                return
+            challenges = self._edit_shard(entry)["challenges"]
+            pos = find_record(challenges, ch.id)
+            if pos is not None:
+                del challenges[pos]
+
+    def import_records(
+        self, ctfs: List[CTF], challenges: List[Challenge], tags: Set[str]
+    ) -> None:
+        with self.transaction():
+            for ctf in ctfs:
+                self.add_ctf(ctf)
+            for ch in challenges:
+                self.add_challenge(ch)
+            self.add_tags(tags)
+
+    def clear(self) -> None:
+        with self.transaction():
+            for entry in self._manifest()["ctfs"]:
+                self._pending[self.shard_path(entry["path"])] = None
+            self._pending[self.manifest_path] = {"ctfs": [], "challenge_tags": []}
+
+
+def get_db_path() -> Path:
+    """Return the path of the SQLite database used by ``SqliteStorage``."""
+    from pwnv.constants import DEFAULT_DB_BASENAME
+    from pwnv.utils.config import get_config_path
+
+    return get_config_path().parent / DEFAULT_DB_BASENAME
+
+
+def get_manifest_path() -> Path:
+    """Return the path of the root manifest used by ``ShardedStorage``."""
+    from pwnv.constants import DEFAULT_MANIFEST_BASENAME
+    from pwnv.utils.config import get_config_path
+
+    return get_config_path().parent / DEFAULT_MANIFEST_BASENAME
+
+
+@lru_cache(maxsize=None)
+def _open_storage(backend: str, location: Path) -> Storage:
+    if backend == "sqlite":
+        return SqliteStorage(location)
+    if backend == "sharded":
+        return ShardedStorage(location)
+    return JsonStorage()
+
+
+def open_storage(backend: str) -> Storage:
+    """Return the ``backend`` storage for the current configuration."""
+    from pwnv.utils.config import get_config_path
+
+    if backend not in STORAGE_BACKENDS:
+        raise ValueError(f"Unknown storage backend '{backend}'.")
+    location = {"sqlite": get_db_path, "sharded": get_manifest_path}.get(
+        backend, get_config_path
+    )()
+    return _open_storage(backend, location)
+
+
+def get_storage() -> Storage:
+    """Return the storage backend selected in the configuration."""
+    from pwnv.utils.config import get_config_value
+
+    return open_storage(get_config_value("storage") or "json")
+
+
+def migrate_storage(backend: str) -> int:
+    """Move every record into ``backend`` and select it.
+
+    Returns the number of migrated challenges.
+    """
+    from pwnv.utils.config import set_config_value
+
+    source = get_storage()
+    target = open_storage(backend)
+    if source is target:
+        return 0
+
+    ctfs, challenges, tags = (
+        source.get_ctfs(),
+        source.get_challenges(),
+        source.get_tags(),
+    )
+    target.clear()
+    target.import_records(ctfs, challenges, tags)
+    set_config_value("storage", backend)
+    source.clear()
+    return len(challenges)
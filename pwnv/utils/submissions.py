@@ -0,0 +1,118 @@
+"""Durable queue of flags waiting to be submitted to a remote CTF.
+
+Flags are appended to ``.pwnv/submissions.jsonl`` in the CTF directory
+before anything is sent, so a slow or unreachable platform never loses a
+solve.  :func:`flush_submissions` drains the queues concurrently: accepted
+flags mark their challenges solved, rejected ones are dropped and flags
+that could not be submitted stay queued for the next flush.
+"""
+
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import List, Sequence
+
+from pwnv.models import CTF, Challenge
+
+
+def get_queue_path(ctf: CTF) -> Path:
+    from pwnv.constants import DEFAULT_QUEUE_BASENAME, DEFAULT_SHARD_DIRNAME
+
+    return ctf.path / DEFAULT_SHARD_DIRNAME / DEFAULT_QUEUE_BASENAME
+
+
+def _lock(ctf: CTF):
+    from filelock import SoftFileLock
+
+    return SoftFileLock(f"{get_queue_path(ctf)}.lock")
+
+
+def get_queued_submissions(ctf: CTF) -> List[dict]:
+    try:
+        text = get_queue_path(ctf).read_text()
+    except FileNotFoundError:
+        return []
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+def enqueue_submission(ctf: CTF, challenge: Challenge, flag: str) -> None:
+    """Append ``flag`` for ``challenge`` to the queue of ``ctf``."""
+    entry = {
+        "challenge_id": str(challenge.id),
+        "flag": flag,
+        "queued_at": datetime.now().isoformat(),
+    }
+    path = get_queue_path(ctf)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with _lock(ctf), open(path, "a") as f:
+        f.write(json.dumps(entry) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _dequeue(ctf: CTF, done: List[dict]) -> None:
+    """Remove the ``done`` entries, keeping anything queued in the meantime."""
+    path = get_queue_path(ctf)
+    with _lock(ctf):
+        rest = [e for e in get_queued_submissions(ctf) if e not in done]
+        if not rest:
+            path.unlink(missing_ok=True)
+            return
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text("".join(json.dumps(entry) + "\n" for entry in rest))
+        tmp.replace(path)
+
+
+def flush_submissions(
+    ctfs: Sequence[CTF] | None = None, solved: Sequence[Challenge] = ()
+):
+    """Submit the queued flags of ``ctfs`` (default: every CTF) concurrently.
+
+    Accepted flags are recorded in one transaction, together with the
+    ``solved`` challenges, and flags of challenges that were removed
+    meanwhile are dropped with a warning.  Returns the
+    :class:`~pwnv.utils.remote.Submission` of every queued flag.
+    """
+    from pwnv.models.challenge import Solved
+    from pwnv.utils.crud import (
+        get_challenge_by_id,
+        get_ctfs,
+        transaction,
+        update_challenge,
+    )
+    from pwnv.utils.remote import submit_flags
+    from pwnv.utils.ui import warn
+
+    queued = []
+    for ctf in get_ctfs() if ctfs is None else ctfs:
+        for entry in get_queued_submissions(ctf):
+            challenge = get_challenge_by_id(entry["challenge_id"])
+            if challenge is None:
+                warn(
+                    f"Dropping queued flag {entry['flag']} of {ctf.name}: "
+                    "its challenge no longer exists."
+                )
+            queued.append((ctf, entry, challenge))
+    pending = [(ctf, e, ch) for ctf, e, ch in queued if ch is not None]
+    results = (
+        submit_flags([(ctf, ch, e["flag"]) for ctf, e, ch in pending])
+        if pending
+        else []
+    )
+
+    with transaction():
+        for challenge in solved:
+            update_challenge(challenge)
+        for result in results:
+            if result.correct:
+                result.challenge.solved = Solved.solved
+                result.challenge.flag = result.flag
+                update_challenge(result.challenge)
+
+    # Flags that could not be submitted stay queued; everything else is done.
+    failed = [entry for (_, entry, _), r in zip(pending, results) if r.error]
+    for ctf in {ctf.id: ctf for ctf, _, _ in queued}.values():
+        done = [e for c, e, _ in queued if c.id == ctf.id and e not in failed]
+        _dequeue(ctf, done)
+    return results
@@ -5,7 +5,12 @@ from rich.markup import escape
 from pwnv.models import CTF, Challenge
 from pwnv.models.challenge import Category, Solved
 from pwnv.plugins import ChallengePlugin
-from pwnv.utils.crud import challenges_for_ctf, get_ctfs, get_tags
+from pwnv.utils.crud import (
+    count_challenges,
+    get_ctf_by_id,
+    get_tags,
+)
+from pwnv.utils.meta import get_extra
 
 
 def success(msg: str):
@@ -32,14 +37,47 @@ def info(msg: str):
     print(f"[blue]info:[/] {msg}")
 
 
+def notify(title: str, msg: str):
+    """Ring the terminal bell and show a desktop notification if possible."""
+    import json
+    import shutil
+    import subprocess
+    import sys
+
+    sys.stdout.write("\a")
+    info(f"{title}: {escape(msg)}")
+    for cmd in (
+        ["notify-send", title, msg],
+        [
+            "osascript",
+            "-e",
+            f"display notification {json.dumps(msg)} with title {json.dumps(title)}",
+        ],
+    ):
+        if shutil.which(cmd[0]):
+            subprocess.run(cmd, check=False, capture_output=True)
+            break
+
+
 def command(msg: str):
     return f"[cyan]`{msg}`[/]"
 
 
+def _get_any_ctf(ctf_id) -> CTF | None:
+    """Return the active or archived CTF with ``ctf_id``."""
+    from pwnv.utils.archive import get_archived_ctf
+
+    return get_ctf_by_id(ctf_id) or get_archived_ctf(ctf_id)
+
+
 def _get_challenge_choices(challenges: Sequence[Challenge]):
     from InquirerPy.base.control import Choice
 
-    ctf_names = {ctf.id: ctf.name for ctf in get_ctfs()}
+    ctf_names = {
+        ctf_id: ctf.name
+        for ctf_id in {ch.ctf_id for ch in challenges}
+        if (ctf := _get_any_ctf(ctf_id))
+    }
     return [
         Choice(
             name=f"{ch.name:<50} [{ctf_names[ch.ctf_id]}]["
@@ -139,14 +177,16 @@ def show_challenge(challenge: Challenge):
     from rich import print
 
     print(f"[blue]{escape('[' + challenge.name + ']')}[/]")
-    ctf = next(ctf for ctf in get_ctfs() if ctf.id == challenge.ctf_id)
-    print(f"[red]ctf[/] = '{ctf.name}'")
+    ctf = _get_any_ctf(challenge.ctf_id)
+    print(f"[red]ctf[/] = '{ctf.name if ctf else ''}'")
     print(f"[red]category[/] = '{challenge.category.name}'")
     print(f"[red]path[/] = '{str(challenge.path)}'")
     print(f"[red]solved[/] = '{str(challenge.solved.name)}'")
     print(f"[red]points[/] = '{str(challenge.points)}'")
     print(f"[red]flag[/] = '{str(challenge.flag)}'")
     print(f"[red]tags[/] = '{', '.join(challenge.tags) if challenge.tags else ''}'")
+    if description := get_extra(challenge, "description"):
+        print(f"[red]description[/] = '{escape(str(description))}'")
 
 
 def show_ctf(ctf: CTF):
@@ -156,7 +196,33 @@ def show_ctf(ctf: CTF):
     print(f"[red]path[/] = '{str(ctf.path)}'")
     print(f"[red]running[/] = '{str(ctf.running.name)}'")
     print(f"[red]date[/] = '{str(ctf.created_at.date())}'")
-    print(f"[red]num_challenges[/] = {len(challenges_for_ctf(ctf))}")
+    print(f"[red]num_challenges[/] = {count_challenges(ctf)}")
+
+
+def show_sync_results(results):
+    from rich import print
+    from rich.table import Table
+
+    table = Table("CTF", "New", "Updated", "Status")
+    for result in results:
+        status = f"[red]{escape(result.error)}[/]" if result.error else "[green]ok[/]"
+        table.add_row(
+            escape(result.ctf.name), str(result.added), str(result.updated), status
+        )
+    print(table)
+
+
+def show_submissions(results):
+    for result in results:
+        name = f"[cyan]{escape(result.challenge.name)}[/]"
+        if result.correct:
+            success(f"{name} marked as solved.")
+        elif result.error:
+            info(f"{name}: {escape(result.error)}, flag stays queued.")
+        else:
+            error(f"{name}: flag incorrect")
+    if any(result.error for result in results):
+        info(f"Run {command('pwnv flush')} to retry the queued flags.")
 
 
 def show_plugin(plugin: ChallengePlugin):
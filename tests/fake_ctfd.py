@@ -0,0 +1,247 @@
+"""Local stand-in for a CTFd instance, used by the remote tests and benchmarks.
+
+:class:`FakeCTFd` serves just enough of the CTFd web UI and API for
+``ctfbridge`` to detect the platform, log in with credentials or a token,
+list and fetch challenges, download attachments and submit flags.  Latency,
+rate limits (HTTP 429 with ``Retry-After``) and random server errors can be
+injected, and every request and response byte is counted.
+
+    with FakeCTFd(challenges=20, files=2) as server:
+        ...  # use server.url as the CTF URL
+        print(server.stats)
+"""
+
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+NONCE = 'ab' * 32
+USERNAME, PASSWORD, TOKEN = 'player', 'hunter2', 'ctfd_token'
+_SESSION = 'fake-session'
+
+_PAGE = """<html><head><script>
+var init = {{'urlRoot': "", 'csrfNonce': "{nonce}", 'userMode': "users"}}
+</script></head><body>{body}<footer>Powered by CTFd</footer></body></html>"""
+
+
+def flag_for(challenge_id: int) -> str:
+    return f'flag{{fake_{challenge_id}}}'
+
+
+class FakeCTFd:
+    """A CTFd-like HTTP server running on a background thread.
+
+    ``latency`` delays every response, ``rate_limit`` allows that many API
+    requests per second before answering 429, and ``failure_rate`` is the
+    share of API requests answered with a 500.  Paths in ``broken`` always
+    answer with a 500.
+    """
+
+    def __init__(
+        self,
+        challenges: int = 10,
+        files: int = 1,
+        file_size: int = 1024,
+        latency: float = 0.0,
+        rate_limit: float | None = None,
+        failure_rate: float = 0.0,
+        seed: int = 0,
+    ):
+        self.challenges = {
+            i: {
+                'id': i,
+                'type': 'standard',
+                'name': f'chall {i}',
+                'value': 100 + i,
+                'category': ('pwn', 'crypto', 'web', 'rev')[i % 4],
+                'description': f'Challenge number {i}',
+                'tags': [],
+                'files': [f'/files/{i}/file{j}.bin' for j in range(files)],
+            }
+            for i in range(1, challenges + 1)
+        }
+        self.file_size = file_size
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.failure_rate = failure_rate
+        self.solved: set = set()
+        self.broken: set = set()
+        self.stats: Counter = Counter()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._window = (0.0, 0)
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), _handler(self))
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f'http://127.0.0.1:{self._server.server_address[1]}'
+
+    def add_challenge(self, **fields) -> dict:
+        """Release a new challenge; returns its record."""
+        with self._lock:
+            new_id = max(self.challenges, default=0) + 1
+            self.challenges[new_id] = {
+                'id': new_id,
+                'type': 'standard',
+                'name': f'chall {new_id}',
+                'value': 100,
+                'category': 'misc',
+                'description': '',
+                'tags': [],
+                'files': [],
+                **fields,
+            }
+            return self.challenges[new_id]
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.stats.clear()
+
+    def start(self) -> 'FakeCTFd':
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> 'FakeCTFd':
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _throttled(self) -> bool:
+        """Count an API request against the rate limit (one-second windows)."""
+        if self.rate_limit is None:
+            return False
+        with self._lock:
+            start, count = self._window
+            now = time.monotonic()
+            if now - start >= 1:
+                start, count = now, 0
+            self._window = (start, count + 1)
+            return count >= self.rate_limit
+
+    def _fails(self) -> bool:
+        with self._lock:
+            return self._random.random() < self.failure_rate
+
+
+def _handler(server: FakeCTFd):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, *args) -> None:
+            pass
+
+        def _send(self, status: int, body, content_type: str, headers=()) -> None:
+            if isinstance(body, str):
+                body = body.encode()
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            for name, value in headers:
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+            with server._lock:
+                server.stats['bytes_sent'] += len(body)
+
+        def _json(self, status: int, data, headers=()) -> None:
+            self._send(status, json.dumps(data), 'application/json', headers)
+
+        def _page(self, body: str = '', headers=()) -> None:
+            self._send(200, _PAGE.format(nonce=NONCE, body=body), 'text/html', headers)
+
+        def _body(self) -> bytes:
+            body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+            with server._lock:
+                server.stats['bytes_received'] += len(body)
+            return body
+
+        def _authenticated(self) -> bool:
+            token = self.headers.get('Authorization')
+            cookie = self.headers.get('Cookie') or ''
+            return token == f'Token {TOKEN}' or f'session={_SESSION}' in cookie
+
+        def _handle(self, method: str) -> None:
+            path = urlparse(self.path).path
+            route = re.sub(r'/\d+', '/<id>', path)
+            with server._lock:
+                server.stats['requests'] += 1
+                server.stats[f'{method} {route}'] += 1
+            body = self._body() if method == 'POST' else b''
+            if server.latency:
+                time.sleep(server.latency)
+
+            if path == '/':
+                return self._page()
+            if path == '/api/v1/swagger.json':
+                return self._json(200, {'info': 'disband your current team'})
+            if path == '/login' and method == 'POST':
+                form = parse_qs(body.decode())
+                login = (form.get('name'), form.get('password'))
+                if login != ([USERNAME], [PASSWORD]):
+                    return self._page('Your username or password is incorrect')
+                return self._page(
+                    headers=[('Set-Cookie', f'session={_SESSION}; Path=/')]
+                )
+
+            if server._throttled():
+                with server._lock:
+                    server.stats['throttled'] += 1
+                return self._json(429, {'success': False}, [('Retry-After', '1')])
+            if path in server.broken or server._fails():
+                with server._lock:
+                    server.stats['failed'] += 1
+                return self._json(500, {'success': False})
+            # Like CTFd, file URLs carry their own token, not the session.
+            if path.startswith('/files/'):
+                return self._send(
+                    200, b'\0' * server.file_size, 'application/octet-stream'
+                )
+            if not self._authenticated():
+                return self._json(401, {'success': False})
+
+            if path == '/api/v1/challenges' and method == 'GET':
+                listing = [
+                    {
+                        **{k: ch[k] for k in ('id', 'type', 'name', 'value')},
+                        'category': ch['category'],
+                        'solved_by_me': ch['id'] in server.solved,
+                    }
+                    for ch in server.challenges.values()
+                ]
+                return self._json(200, {'success': True, 'data': listing})
+            if match := re.fullmatch(r'/api/v1/challenges/(\d+)', path):
+                ch = server.challenges.get(int(match[1]))
+                if ch is None:
+                    return self._json(404, {'success': False})
+                data = {**ch, 'solved_by_me': ch['id'] in server.solved}
+                return self._json(200, {'success': True, 'data': data})
+            if path == '/api/v1/challenges/attempt' and method == 'POST':
+                attempt = json.loads(body)
+                challenge_id = int(attempt['challenge_id'])
+                if attempt['submission'] == flag_for(challenge_id):
+                    server.solved.add(challenge_id)
+                    data = {'status': 'correct', 'message': 'Correct'}
+                else:
+                    data = {'status': 'incorrect', 'message': 'Incorrect'}
+                return self._json(200, {'success': True, 'data': data})
+            return self._json(404, {'success': False})
+
+        def do_GET(self) -> None:
+            self._handle('GET')
+
+        def do_POST(self) -> None:
+            self._handle('POST')
+
+    return Handler
@@ -0,0 +1,100 @@
+import importlib
+from datetime import datetime, timedelta
+
+from pwnv.models import CTF, Challenge
+from pwnv.models.challenge import Solved
+from pwnv.models.ctf import Status
+
+
+def _reload_modules():
+    import pwnv.utils.archive as archive
+    import pwnv.utils.config as config
+    import pwnv.utils.crud as crud
+    importlib.reload(config)
+    importlib.reload(crud)
+    importlib.reload(archive)
+    return config, crud, archive
+
+
+def _populate(config, tmp_path):
+    old = CTF(name='old', path=tmp_path/'old', running=Status.stopped,
+              created_at=datetime.now() - timedelta(days=90))
+    new = CTF(name='new', path=tmp_path/'new')
+    challenges = [
+        Challenge(name='heapnote', ctf_id=old.id, path=old.path/'heapnote',
+                  solved=Solved.solved, tags=['heap'], extras={'d': 'x' * 100}),
+        Challenge(name='web1', ctf_id=new.id, path=new.path/'web1'),
+    ]
+    config.save_config({
+        'ctfs_path': str(tmp_path),
+        'challenge_tags': ['heap'],
+        'ctfs': [ctf.model_dump(mode='json') for ctf in (old, new)],
+        'challenges': [ch.model_dump(mode='json') for ch in challenges],
+    })
+    return old, new, challenges
+
+
+def test_archive_policy_and_restore(tmp_path, monkeypatch):
+    monkeypatch.setenv('PWNV_CONFIG', str(tmp_path / 'cfg.json'))
+    config, crud, archive = _reload_modules()
+    old, new, challenges = _populate(config, tmp_path)
+
+    # Old, but only just stopped.
+    recent = CTF(name='recent', path=tmp_path/'recent', running=Status.stopped,
+                 created_at=datetime.now() - timedelta(days=90),
+                 stopped_at=datetime.now() - timedelta(days=1))
+    crud.add_ctf(recent)
+
+    assert archive.apply_archive_policy() == []
+    config.set_config_value('archive_after_days', 30)
+    assert archive.apply_archive_policy() == [old]
+
+    assert crud.get_ctfs() == [new, recent]
+    assert crud.get_challenges() == [challenges[1]]
+    assert archive.get_archived_ctfs() == [old]
+    assert archive.search_archive('HEAP') == [old]
+    assert archive.search_archive('web') == []
+    assert archive.get_archived_challenges() == [challenges[0]]
+
+    assert archive.restore_ctf(old) == 1
+    assert archive.get_archived_ctfs() == []
+    assert crud.get_ctf_by_name('old') == old
+    assert crud.get_challenge_by_name('heapnote') == challenges[0]
+
+
+def test_missing_archive_bundle_is_skipped(tmp_path, monkeypatch, capsys):
+    monkeypatch.setenv('PWNV_CONFIG', str(tmp_path / 'cfg.json'))
+    config, crud, archive = _reload_modules()
+    old, new, challenges = _populate(config, tmp_path)
+    archive.archive_ctf(old)
+    (archive.get_archive_path() / f'{old.id}.json.gz').unlink()
+
+    assert archive.get_archived_challenges() == []
+    assert archive.restore_ctf(old) is None
+    assert archive.get_archived_ctfs() == [old]
+    assert 'archive of CTF old is missing' in capsys.readouterr().out
+
+
+def test_reset_backup_keeps_archive(tmp_path, monkeypatch):
+    import shutil
+
+    monkeypatch.setenv('PWNV_CONFIG', str(tmp_path / 'cfg' / 'cfg.json'))
+    monkeypatch.setenv('HOME', str(tmp_path / 'home'))
+    config, crud, archive = _reload_modules()
+    (tmp_path / 'cfg').mkdir(exist_ok=True)
+    (tmp_path / 'home').mkdir()
+    old, new, challenges = _populate(config, tmp_path / 'ctfs')
+    (tmp_path / 'ctfs').mkdir()
+    archive.archive_ctf(old)
+
+    import pwnv.cli.reset as reset
+    monkeypatch.setattr(reset, 'prompt_confirm', lambda *a, **k: True)
+    reset.reset(force=False)
+    assert not (tmp_path / 'cfg').exists()
+
+    restored = tmp_path / 'restored'
+    shutil.unpack_archive(tmp_path / 'home' / 'pwnv_backup.tar.gz', restored)
+    shutil.copytree(restored, tmp_path / 'cfg')
+    assert archive.get_archived_ctfs() == [old]
+    assert archive.restore_ctf(old) == 1
+    assert crud.get_challenge_by_name('heapnote') == challenges[0]
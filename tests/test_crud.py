@@ -1,6 +1,6 @@
 import importlib
 
-from pwnv.models import CTF
+from pwnv.models import CTF, Challenge
 from pwnv.models.ctf import Status
 
 
@@ -22,6 +22,16 @@ def test_is_duplicate(tmp_path, monkeypatch):
     assert crud.is_duplicate(name='one', path=tmp_path/'other', model_list=ctfs)
     assert not crud.is_duplicate(name='two', path=tmp_path/'two', model_list=ctfs)
 
+    crud.add_ctf(ctfs[0])
+    crud.add_challenge(Challenge(name='ch', ctf_id=ctfs[0].id,
+                                 path=tmp_path/'one'/'pwn'/'ch'))
+    assert crud.is_duplicate(name='one')
+    assert crud.is_duplicate(path=tmp_path/'one')
+    assert not crud.is_duplicate(path=tmp_path/'one'/'sub')
+    assert crud.is_duplicate(path=tmp_path/'one'/'pwn'/'ch', model=Challenge)
+    assert not crud.is_duplicate(path=tmp_path/'one'/'pwn'/'other', model=Challenge)
+    assert not crud.is_duplicate(name='one', model=Challenge)
+
 
 def test_update_ctf(tmp_path, monkeypatch):
     monkeypatch.setenv('PWNV_CONFIG', str(tmp_path / 'cfg.json'))
@@ -34,3 +44,115 @@ def test_update_ctf(tmp_path, monkeypatch):
 
     reloaded = crud.get_ctfs()[0]
     assert reloaded.running == Status.stopped
+
+
+def test_transaction_single_write(tmp_path, monkeypatch):
+    import uuid
+
+    monkeypatch.setenv('PWNV_CONFIG', str(tmp_path / 'cfg.json'))
+    config, crud = _reload_modules()
+
+    ctf = CTF(id=uuid.uuid4(), name='ctf', path=tmp_path/'ctf')
+    crud.add_ctf(ctf)
+
+    writes = []
+    write = config._write
+    monkeypatch.setattr(config, '_write', lambda cfg: writes.append(write(cfg)))
+
+    with crud.transaction():
+        for i in range(5):
+            crud.add_challenge(Challenge(id=uuid.uuid4(), name=f'ch{i}',
+                                         ctf_id=ctf.id, path=ctf.path/f'ch{i}'))
+        crud.add_tags({'rop'})
+    assert len(writes) == 1
+    assert len(crud.get_challenges()) == 5
+
+    try:
+        with crud.transaction():
+            crud.add_tags({'heap'})
+            raise RuntimeError
+    except RuntimeError:
+        pass
+    assert crud.get_tags() == {'rop'}
+
+
+def test_concurrent_commits_merge(tmp_path, monkeypatch):
+    import json
+    import uuid
+
+    import pytest
+
+    monkeypatch.setenv('PWNV_CONFIG', str(tmp_path / 'cfg.json'))
+    config, crud = _reload_modules()
+
+    ctf = CTF(id=uuid.uuid4(), name='ctf', path=tmp_path/'ctf')
+    crud.add_ctf(ctf)
+    assert config.get_config_version() == 1
+    config.load_config()
+
+    def other_process(mutate):
+        cfg = json.loads(config.get_config_path().read_text())
+        mutate(cfg)
+        cfg['version'] += 1
+        config.get_config_path().write_text(json.dumps(cfg))
+
+    other = CTF(id=uuid.uuid4(), name='other', path=tmp_path/'other')
+    other_process(lambda cfg: cfg['ctfs'].append(other.model_dump(mode='json')))
+    ctf.running = Status.stopped
+    crud.update_ctf(ctf)
+
+    assert crud.get_ctfs() == [ctf, other]
+    assert config.get_config_version() == 3
+
+    config.load_config()
+    other_process(lambda cfg: cfg['ctfs'][0].update(url='http://a'))
+    ctf.url = 'http://b'
+    with pytest.raises(config.ConfigConflictError):
+        crud.update_ctf(ctf)
+    assert crud.get_ctfs()[0].url == 'http://a'
+
+
+def test_snapshot_skips_parsing(tmp_path, monkeypatch):
+    import json
+    import uuid
+
+    monkeypatch.setenv('PWNV_CONFIG', str(tmp_path / 'cfg.json'))
+    config, crud = _reload_modules()
+
+    ctf = CTF(id=uuid.uuid4(), name='ctf', path=tmp_path/'ctf')
+    crud.add_ctf(ctf)
+    assert crud.get_ctfs() == [ctf]
+    assert config.get_snapshot_path().exists()
+
+    config, crud = _reload_modules()
+
+    def no_json(*a, **kw):
+        raise AssertionError('config parsed despite a valid snapshot')
+
+    with monkeypatch.context() as m:
+        m.setattr(json, 'load', no_json)
+        assert crud.get_ctfs() == [ctf]
+
+    ctf.running = Status.stopped
+    crud.update_ctf(ctf)
+    assert crud.get_ctfs()[0].running == Status.stopped
+
+
+def test_large_extras_in_side_file(tmp_path, monkeypatch):
+    monkeypatch.setenv('PWNV_CONFIG', str(tmp_path / 'cfg.json'))
+    config, crud = _reload_modules()
+    from pwnv.utils import meta
+
+    ctf = CTF(name='ctf', path=tmp_path / 'ctf')
+    crud.add_ctf(ctf)
+    description = 'A' * 10_000
+    ch = Challenge(name='ch', ctf_id=ctf.id, path=ctf.path / 'ch',
+                   extras={'slug': 7, 'description': description})
+    crud.add_challenge(ch)
+
+    assert description not in config.config_path.read_text()
+    stored = crud.get_challenge_by_name('ch')
+    assert stored.extras == {'slug': 7}
+    assert stored.meta_keys == ['description']
+    assert meta.get_extra(stored, 'description') == description
+    assert meta.get_extras(stored) == {'slug': 7, 'description': description}
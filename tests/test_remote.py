@@ -0,0 +1,657 @@
+import asyncio
+import importlib
+from pathlib import Path
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from pwnv.utils import remote, resilience
+
+
+@pytest.fixture(autouse=True)
+def _workspace(tmp_path, monkeypatch):
+    import pwnv.utils.config as config
+
+    monkeypatch.setenv('PWNV_CONFIG', str(tmp_path / 'cfg.json'))
+    importlib.reload(config)
+    config.save_config({'ctfs_path': str(tmp_path), 'challenge_tags': []})
+    monkeypatch.setattr(resilience, '_breakers', {})
+    monkeypatch.setattr(resilience, '_stats', {})
+
+
+class _Attachment(SimpleNamespace):
+    def model_dump(self, **kwargs):
+        return {'name': self.name, 'url': f'/files/{self.name}'}
+
+
+class _FlakyAttachments:
+    def __init__(self, failures):
+        self.failures = dict(failures)
+        self.active = self.peak = 0
+
+    async def download(self, att, save_dir):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        if self.failures.get(att.name, 0):
+            self.failures[att.name] -= 1
+            raise ConnectionError(att.name)
+        Path(save_dir, att.name).write_bytes(att.name.encode())
+
+
+def test_download_attachments_bounded_with_retry(tmp_path, monkeypatch):
+    monkeypatch.setattr(remote.asyncio, 'sleep', _no_backoff(asyncio.sleep))
+    attachments = _FlakyAttachments({'a1': 1, 'a2': 5})
+    client = SimpleNamespace(attachments=attachments)
+    jobs = [(_Attachment(name=f'a{i}'), Path(tmp_path)) for i in range(10)]
+
+    failed = asyncio.run(remote.download_attachments(client, jobs, limit=3))
+
+    assert [att.name for att, _ in failed] == ['a2']
+    assert attachments.peak == 3
+
+
+def test_detail_fetches_are_bounded(tmp_path, monkeypatch):
+    import pwnv.utils.config as config
+    from pwnv.models import CTF
+    from pwnv.utils import ratelimit
+
+    class _RateLimited(Exception):
+        retry_after = 0.05
+
+    class _Service:
+        base_has_details = False
+        active = peak = 0
+
+        async def get_all(self, detailed):
+            return [SimpleNamespace(id=i) for i in range(20)]
+
+        async def get_by_id(self, slug):
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            await asyncio.sleep(0.01)
+            self.active -= 1
+            if slug == 3 and not hasattr(self, 'limited'):
+                self.limited = True
+                raise _RateLimited()
+            return _remote_challenge(slug)
+
+    monkeypatch.setattr(ratelimit, '_buckets', {})
+    pauses = []
+    pause = ratelimit.TokenBucket.pause
+    monkeypatch.setattr(ratelimit.TokenBucket, 'pause',
+                        lambda self, delay: (pauses.append(delay), pause(self, delay)))
+    config.set_config_value('download_concurrency', 3)
+    service = _Service()
+    ctf = CTF(name='ctf', path=tmp_path, url='https://ctf.example')
+    details = remote._run_async(
+        remote.get_remote_challenges(SimpleNamespace(challenges=service), ctf))
+
+    assert [d.id for d in details] == list(range(20))
+    assert service.peak == 3
+    assert len(pauses) == 1 and pauses[0] >= 0.05
+
+
+def test_missing_attachments_are_not_retried(tmp_path, monkeypatch):
+    tries = []
+
+    async def _download(att, save_dir):
+        tries.append(att.name)
+
+    client = SimpleNamespace(attachments=SimpleNamespace(download=_download),
+                             platform_url='https://ctf.example')
+    jobs = [(_Attachment(name=f'gone{i}'), Path(tmp_path)) for i in range(6)]
+
+    failed = asyncio.run(remote.download_attachments(client, jobs, limit=2))
+    assert len(failed) == 6 and len(tries) == 6
+    assert resilience.get_breaker('ctf.example').allow()
+
+
+def _no_backoff(sleep):
+    async def _sleep(delay):
+        await sleep(min(delay, 0.01))
+
+    return _sleep
+
+
+def _fake_platform(monkeypatch, calls):
+    import ctfbridge
+
+    class _Client:
+        platform_name = 'CTFd'
+        platform_url = 'https://api.ctf.example'
+
+        def __init__(self):
+            self.auth = SimpleNamespace(get_supported_auth_methods=self._probe)
+            self.session = SimpleNamespace(load=self._load)
+
+        async def _probe(self):
+            calls.append('probe')
+            return []
+
+        async def _load(self, path):
+            calls.append('load')
+
+    async def _create_client(url, platform='auto', **kwargs):
+        calls.append(('create', url, platform))
+        return _Client()
+
+    monkeypatch.setattr(ctfbridge, 'create_client', _create_client)
+    monkeypatch.setattr(remote, '_clients', {})
+    monkeypatch.setattr(remote, '_auth_methods', {})
+    monkeypatch.setattr(remote, '_sessions', set())
+
+
+def test_session_pool_skips_auth_probe(tmp_path, monkeypatch):
+    from pwnv.models import CTF
+
+    calls = []
+    _fake_platform(monkeypatch, calls)
+
+    ctf = CTF(name='ctf', path=tmp_path, url='https://ctf.example')
+    (tmp_path / '.session').write_text('{}')
+
+    first = remote._run_async(remote.open_session(ctf))
+    second = remote._run_async(remote.open_session(ctf))
+
+    assert first is second
+    assert calls == [('create', 'https://ctf.example', 'auto'), 'load']
+
+
+def test_platform_cache(tmp_path, monkeypatch):
+    url = 'https://ctf.example'
+    calls = []
+    _fake_platform(monkeypatch, calls)
+    remote._run_async(remote.get_remote_credential_methods(url))
+
+    remote._clients.clear()
+    remote._auth_methods.clear()
+    remote._run_async(remote.get_remote_credential_methods(url))
+    assert calls == [
+        ('create', url, 'auto'),
+        'probe',
+        ('create', 'https://api.ctf.example', 'ctfd'),
+    ]
+
+    remote.forget_client(url, TimeoutError())
+    remote._run_async(remote.get_client(url))
+    assert calls[-1] == ('create', 'https://api.ctf.example', 'ctfd')
+
+    remote.forget_client(url, httpx.ConnectError('refused'))
+    remote._run_async(remote.get_client(url))
+    assert calls[-1] == ('create', url, 'auto')
+
+    remote.forget_client(url)
+    remote._run_async(remote.get_client(url))
+    assert calls[-1] == ('create', url, 'auto')
+
+
+def _remote_challenge(slug, value=100, files=('a',), solved=False):
+    return SimpleNamespace(
+        id=slug, name=f'chall {slug}', category='pwn', value=value, solved=solved,
+        description='desc', author=None, tags=[],
+        attachments=[_Attachment(name=f) for f in files],
+    )
+
+
+def test_sync_upserts_changed_challenges(tmp_path, monkeypatch):
+    import pwnv.utils.crud as crud
+    from pwnv.models import CTF
+    from pwnv.models.challenge import Solved
+    downloads = []
+
+    async def _download(att, save_dir):
+        downloads.append(att.name)
+        Path(save_dir, att.name).write_bytes(att.name.encode())
+
+    client = SimpleNamespace(attachments=SimpleNamespace(download=_download))
+    ctf = CTF(name='ctf', path=tmp_path / 'ctf', url='https://ctf.example')
+    crud.add_ctf(ctf)
+    remote._run_async(remote.add_remote_challenges(
+        client, ctf, [_remote_challenge(1), _remote_challenge(2)]))
+    assert remote._diff_remote_challenges(
+        ctf, [_remote_challenge(1), _remote_challenge(2)]) == ([], [])
+
+    downloads.clear()
+    fresh = [_remote_challenge(1, value=80, files=('a', 'b'), solved=True),
+             _remote_challenge(2), _remote_challenge(3)]
+    new, changed = remote._diff_remote_challenges(ctf, fresh)
+    assert [ch.id for ch in new] == [3]
+    assert [(ch.id, local.name) for ch, local in changed] == [(1, 'chall-1')]
+
+    remote._run_async(remote.update_remote_challenges(client, changed))
+    assert downloads == ['b']
+    updated = crud.get_challenge_by_name('chall-1')
+    assert (updated.points, updated.solved) == (80, Solved.solved)
+    assert remote._diff_remote_challenges(ctf, fresh[:2]) == ([], [])
+
+
+@pytest.mark.parametrize('reflinks', [False, True])
+def test_attachment_store_dedups_and_gc(tmp_path, monkeypatch, reflinks):
+    import shutil
+
+    from pwnv.utils import attachments
+
+    def _reflink(src, dest):
+        if reflinks:
+            shutil.copyfile(src, dest)
+        return reflinks
+
+    monkeypatch.setattr(attachments, '_reflink', _reflink)
+    downloads = []
+
+    async def _download(att, save_dir):
+        downloads.append(att.name)
+        Path(save_dir, att.name).write_bytes(b'libc')
+
+    client = SimpleNamespace(attachments=SimpleNamespace(download=_download))
+    jobs = [(_Attachment(name='libc.so.6'), tmp_path / f'ch{i}') for i in range(2)]
+    jobs.append((_Attachment(name='other'), tmp_path / 'ch2'))
+    assert remote._run_async(remote.download_attachments(client, jobs)) == []
+
+    assert sorted(downloads) == ['libc.so.6', 'other']
+    blobs = list((attachments.get_store_path() / 'blobs').glob('*/*'))
+    assert len(blobs) == reflinks
+    first, second = (tmp_path / f'ch{i}' / 'libc.so.6' for i in range(2))
+    assert first.read_bytes() == second.read_bytes() == b'libc'
+    assert not first.samefile(second)
+    first.chmod(0o755)
+    first.write_bytes(b'patched')
+    assert second.read_bytes() == b'libc'
+    assert (tmp_path / 'ch2' / 'other').read_bytes() == b'libc'
+
+    # Copies come from an unmodified file, a patched one is not used.
+    second.unlink()
+    third = (_Attachment(name='libc.so.6'), tmp_path / 'ch3')
+    assert remote._run_async(remote.download_attachments(client, [third])) == []
+    assert (tmp_path / 'ch3' / 'libc.so.6').read_bytes() == b'libc'
+    assert len(downloads) == 2
+
+    for path in (first, tmp_path / 'ch3' / 'libc.so.6'):
+        path.unlink()
+    assert attachments.collect_garbage() == (0, 0)
+    (tmp_path / 'ch2' / 'other').unlink()
+    assert attachments.collect_garbage() == (len(blobs), 4 * len(blobs))
+
+
+def test_same_source_is_fetched_once_concurrently(tmp_path):
+    downloads = []
+
+    async def _download(att, save_dir):
+        downloads.append(save_dir)
+        part = Path(save_dir, att.name + '.part')
+        for chunk in (b'li', b'bc'):
+            with open(part, 'ab') as f:
+                f.write(chunk)
+            await asyncio.sleep(0.01)
+        part.rename(part.with_suffix(''))
+
+    client = SimpleNamespace(attachments=SimpleNamespace(download=_download))
+    jobs = [(_Attachment(name='libc.so.6'), tmp_path / f'ch{i}') for i in range(4)]
+    assert remote._run_async(remote.download_attachments(client, jobs)) == []
+
+    assert len(downloads) == 1
+    for _, save_dir in jobs:
+        assert (save_dir / 'libc.so.6').read_bytes() == b'libc'
+
+
+def test_sync_all_isolates_failures_and_commits_once(tmp_path, monkeypatch):
+    import pwnv.utils.config as config
+    import pwnv.utils.crud as crud
+    from pwnv.models import CTF
+
+    async def _download(att, save_dir):
+        Path(save_dir, att.name).write_bytes(att.name.encode())
+
+    client = SimpleNamespace(attachments=SimpleNamespace(download=_download))
+    ctfs = [CTF(name=f'ctf{i}', path=tmp_path / f'ctf{i}', url=f'https://{i}.example')
+            for i in range(3)]
+    for ctf in ctfs:
+        crud.add_ctf(ctf)
+
+    async def _open_session(ctf, interactive=True):
+        assert not interactive
+        return None if ctf.name == 'ctf1' else client
+
+    async def _challenges(client, ctf):
+        return [_remote_challenge(f'{ctf.name}-{i}', files=(ctf.name,))
+                for i in range(2)]
+
+    monkeypatch.setattr(remote, 'open_session', _open_session)
+    monkeypatch.setattr(remote, 'get_remote_challenges', _challenges)
+    writes = []
+    write = config._write
+    monkeypatch.setattr(config, '_write', lambda cfg: writes.append(write(cfg)))
+
+    results = remote.sync_remote_ctfs(ctfs)
+
+    assert [(r.ctf.name, r.added, bool(r.error)) for r in results] == [
+        ('ctf0', 2, False), ('ctf1', 0, True), ('ctf2', 2, False)]
+    assert len(writes) == 1
+    assert crud.count_challenges(ctfs[2]) == 2
+    assert (tmp_path / 'ctf0' / 'pwn' / 'chall-ctf0-0' / 'ctf0').exists()
+
+
+def test_credentials_are_per_ctf(tmp_path, monkeypatch):
+    import os
+
+    from pwnv.models import CTF
+    from pwnv.utils.credentials import Credentials, get_credentials, save_credentials
+
+    monkeypatch.delenv('CTF_TOKEN', raising=False)
+    first, second = (CTF(name=n, path=tmp_path / n) for n in ('a', 'b'))
+    for ctf in (first, second):
+        ctf.path.mkdir()
+    assert get_credentials(first) is None
+
+    save_credentials(first, Credentials(token='tok-a'))
+    save_credentials(second, Credentials(username='bob', password='pw'))
+
+    assert get_credentials(first).login_kwargs() == {'token': 'tok-a'}
+    assert get_credentials(second) == Credentials('bob', 'pw', None)
+    assert 'CTF_TOKEN' not in os.environ
+
+    save_credentials(first, Credentials(token='tok-new'))
+    assert get_credentials(first).token == 'tok-new'
+
+    legacy = second.path / '.env'
+    legacy.chmod(0o644)
+    save_credentials(second, Credentials(token='tok-b'))
+    assert legacy.stat().st_mode & 0o777 == 0o600
+
+
+def test_submit_flags_backs_off_on_rate_limit(tmp_path, monkeypatch):
+    import pwnv.utils.config as config
+    from pwnv.models import CTF, Challenge
+    from pwnv.utils import ratelimit
+
+    class _RateLimited(Exception):
+        retry_after = 0
+
+    attempts = []
+
+    async def _submit(slug, flag):
+        attempts.append(slug)
+        if attempts.count(slug) == 1 and slug == 'b':
+            raise _RateLimited()
+        return SimpleNamespace(correct=flag == 'flag{ok}')
+
+    client = SimpleNamespace(challenges=SimpleNamespace(submit=_submit))
+
+    async def _open_session(ctf, interactive=True):
+        return client
+
+    monkeypatch.setattr(remote, 'open_session', _open_session)
+    monkeypatch.setattr(ratelimit, '_buckets', {})
+    config.set_config_value('submit_rate', 100)
+    config.set_config_value('submit_burst', 2)
+
+    ctf = CTF(name='ctf', path=tmp_path, url='https://ctf.example')
+    entries = [
+        (ctf, Challenge(name=slug, ctf_id=ctf.id, path=tmp_path / slug,
+                        extras={'slug': slug}), flag)
+        for slug, flag in (('a', 'flag{ok}'), ('b', 'flag{ok}'), ('c', 'nope'))
+    ]
+    results = remote.submit_flags(entries)
+
+    assert [(r.challenge.name, r.correct, r.error) for r in results] == [
+        ('a', True, None), ('b', True, None), ('c', False, None)]
+    assert sorted(attempts) == ['a', 'b', 'b', 'c']
+    bucket = ratelimit._buckets['ctf.example']
+    assert bucket.tokens < bucket.capacity
+
+
+def test_submission_queue_survives_outage(tmp_path, monkeypatch, capsys):
+    import pwnv.utils.config as config
+    import pwnv.utils.crud as crud
+    from pwnv.models import CTF, Challenge
+    from pwnv.models.challenge import Solved
+    from pwnv.utils import ratelimit
+    from pwnv.utils.submissions import (
+        enqueue_submission,
+        flush_submissions,
+        get_queued_submissions,
+    )
+
+    online = False
+    tries = []
+
+    async def _submit(slug, flag):
+        tries.append(slug)
+        if not online:
+            raise ConnectionError('platform down')
+        return SimpleNamespace(correct=flag == 'flag{ok}')
+
+    async def _open_session(ctf, interactive=True):
+        return SimpleNamespace(challenges=SimpleNamespace(submit=_submit))
+
+    monkeypatch.setattr(remote, 'open_session', _open_session)
+    monkeypatch.setattr(remote.asyncio, 'sleep', _no_backoff(asyncio.sleep))
+    monkeypatch.setattr(ratelimit, '_buckets', {})
+    config.set_config_value('submit_rate', 100)
+    ctf = CTF(name='ctf', path=tmp_path / 'ctf', url='https://ctf.example')
+    crud.add_ctf(ctf)
+    good, bad = (
+        Challenge(name=n, ctf_id=ctf.id, path=ctf.path / n, extras={'slug': n})
+        for n in ('good', 'bad')
+    )
+    crud.add_challenges([good, bad])
+    enqueue_submission(ctf, good, 'flag{ok}')
+    enqueue_submission(ctf, bad, 'flag{no}')
+
+    with resilience.attempt_limit(1):
+        assert all(r.error for r in flush_submissions())
+    assert len(tries) == 2
+    assert all(r.error for r in flush_submissions())
+    assert len(get_queued_submissions(ctf)) == 2
+    assert not resilience.get_breaker('ctf.example').allow()
+
+    online = True
+    resilience._breakers.clear()
+    results = flush_submissions()
+    assert [(r.challenge.name, r.correct) for r in results] == [
+        ('good', True), ('bad', False)]
+    assert get_queued_submissions(ctf) == []
+    assert crud.get_challenge_by_name('good').solved == Solved.solved
+    assert crud.get_challenge_by_name('bad').solved == Solved.unsolved
+
+    gone = Challenge(name='gone', ctf_id=ctf.id, path=ctf.path / 'gone')
+    enqueue_submission(ctf, gone, 'flag{gone}')
+    assert flush_submissions() == []
+    assert get_queued_submissions(ctf) == []
+    assert 'no longer exists' in capsys.readouterr().out
+
+
+def test_solve_batch_resolves_names_and_commits_once(tmp_path, monkeypatch, capsys):
+    import pwnv.utils.config as config
+    import pwnv.utils.crud as crud
+    from pwnv.cli.solve import _solve_batch
+    from pwnv.models import CTF, Challenge
+    from pwnv.models.challenge import Solved
+    from pwnv.models.ctf import Status
+    from pwnv.utils import ratelimit
+
+    async def _submit(slug, flag):
+        return SimpleNamespace(correct=True)
+
+    async def _open_session(ctf, interactive=True):
+        return SimpleNamespace(challenges=SimpleNamespace(submit=_submit))
+
+    monkeypatch.setattr(remote, 'open_session', _open_session)
+    monkeypatch.setattr(ratelimit, '_buckets', {})
+    config.set_config_value('submit_rate', 100)
+    live = CTF(name='live', path=tmp_path / 'live', url='https://ctf.example')
+    local = CTF(name='local', path=tmp_path / 'local')
+    old = CTF(name='old', path=tmp_path / 'old', running=Status.stopped)
+    live.path.mkdir()
+    (live.path / '.session').write_text('{}')
+    for ctf in (live, local, old):
+        crud.add_ctf(ctf)
+    crud.add_challenges([
+        Challenge(name=name, ctf_id=ctf.id, path=ctf.path / name,
+                  extras={'slug': name})
+        for ctf, names in ((live, ('warmup', 'pwn1')), (local, ('warmup', 'rev1')),
+                           (old, ('sanity',)))
+        for name in names
+    ])
+    batch = tmp_path / 'flags.txt'
+    batch.write_text('warmup,flag{a}\nlive/warmup,flag{b}\npwn1,flag{c}\n'
+                     'rev1,flag{d}\nsanity,flag{e}\nold/sanity,flag{f}\n')
+    writes = []
+    write = config._write
+    monkeypatch.setattr(config, '_write', lambda cfg: writes.append(write(cfg)))
+
+    _solve_batch(str(batch))
+
+    out = capsys.readouterr().out
+    assert 'several running CTFs' in out
+    assert "Skipping invalid line: 'sanity,flag{e}'" in out
+    assert len(writes) == 1
+    solved = {(crud.get_ctf_by_challenge(ch).name, ch.name, ch.flag)
+              for ch in crud.get_challenges() if ch.solved == Solved.solved}
+    assert solved == {('live', 'warmup', 'flag{b}'), ('live', 'pwn1', 'flag{c}'),
+                      ('local', 'rev1', 'flag{d}'), ('old', 'sanity', 'flag{f}')}
+
+
+def test_watch_backs_off_and_imports_drops(tmp_path, monkeypatch):
+    import time
+
+    import pwnv.utils.crud as crud
+    from pwnv.models import CTF
+    from pwnv.utils import ui
+
+    drops = [[1], [1], [1], [1, 2]]
+    details, listings = [], []
+
+    async def _get_all(detailed=True):
+        listings.append(detailed)
+        return [_remote_challenge(slug, files=()) for slug in drops[0]]
+
+    async def _get_by_id(slug):
+        details.append(slug)
+        return _remote_challenge(slug, files=())
+
+    client = SimpleNamespace(challenges=SimpleNamespace(
+        get_all=_get_all, get_by_id=_get_by_id, base_has_details=False))
+
+    async def _open_session(ctf, interactive=True):
+        return client
+
+    sleeps = []
+
+    def _sleep(delay):
+        sleeps.append(delay)
+        drops.pop(0)
+        if not drops:
+            raise KeyboardInterrupt
+
+    notes = []
+    monkeypatch.setattr(remote, 'open_session', _open_session)
+    monkeypatch.setattr(time, 'sleep', _sleep)
+    monkeypatch.setattr(ui, 'notify', lambda title, msg: notes.append(msg))
+    ctf = CTF(name='ctf', path=tmp_path / 'ctf', url='https://ctf.example')
+    crud.add_ctf(ctf)
+
+    with pytest.raises(KeyboardInterrupt):
+        remote.watch_remote_ctf(ctf, interval=1, max_interval=3)
+
+    assert sleeps == [1, 2, 3, 1]
+    assert details == [1, 1, 2]
+    assert listings == [False] * 4
+    assert notes == ['chall 1 (100 pts)', 'chall 2 (100 pts)']
+    assert crud.count_challenges(ctf) == 2
+
+    # A restarted watch doesn't refetch what is already imported.
+    drops[:] = [[1, 2]]
+    with pytest.raises(KeyboardInterrupt):
+        remote.watch_remote_ctf(ctf, interval=1, max_interval=3)
+    assert details == [1, 1, 2]
+    assert len(listings) == 5
+
+
+def test_resilience_classifies_and_breaks_circuit(monkeypatch):
+    from datetime import datetime, timedelta, timezone
+    from email.utils import format_datetime
+
+    monkeypatch.setattr(remote.asyncio, 'sleep', _no_backoff(asyncio.sleep))
+    monkeypatch.setattr(resilience, '_breakers', {})
+    calls = []
+
+    def _failing(exc, times):
+        async def _fn():
+            calls.append(exc)
+            if len(calls) <= times:
+                raise RuntimeError('wrapped') from exc
+            return 'ok'
+
+        return _fn
+
+    outage = type('ServerError', (Exception,), {'status_code': 502})()
+    assert resilience.classify(outage) == resilience.TRANSIENT
+    assert resilience.classify(ValueError()) == resilience.FATAL
+
+    def _limited(value):
+        response = SimpleNamespace(status_code=429, headers={'Retry-After': value})
+        return type('RateLimited', (Exception,), {'response': response})()
+
+    assert resilience.retry_after(_limited('2')) == 2
+    assert resilience.retry_after(_limited('soon')) == 0
+    assert resilience.retry_after(_limited('1e9')) == 300
+    assert 0 < resilience.retry_after(
+        _limited(format_datetime(datetime.now(timezone.utc) + timedelta(seconds=60),
+                                 usegmt=True))) <= 60
+    assert resilience.retry_after(_limited('Wed, 21 Oct 2015 07:28:00 GMT')) == 0
+
+    assert asyncio.run(resilience.call('h', 'get', _failing(outage, 2))) == 'ok'
+    assert resilience.get_call_stats()['get']['retries'] == 2
+
+    calls.clear()
+    with pytest.raises(RuntimeError):
+        asyncio.run(resilience.call('h', 'get', _failing(ValueError(), 1)))
+    assert len(calls) == 1
+
+    calls.clear()
+    with pytest.raises(RuntimeError):
+        asyncio.run(resilience.call('h', 'get', _failing(outage, 99), attempts=10))
+    assert len(calls) == 5
+    with pytest.raises(resilience.CircuitOpenError):
+        asyncio.run(resilience.call('h', 'get', _failing(outage, 0)))
+
+    # After the cooldown only one probe goes through, a fatal one lets the
+    # next call probe again.
+    breaker = resilience.get_breaker('h')
+    breaker.opened_at -= breaker.cooldown
+    calls.clear()
+    with pytest.raises(RuntimeError):
+        asyncio.run(resilience.call('h', 'get', _failing(ValueError(), 1)))
+    assert breaker.allow() and not breaker.allow()
+    breaker.release()
+
+    async def _probes():
+        async def _slow():
+            calls.append(None)
+            await asyncio.sleep(0)
+            return 'ok'
+
+        return await asyncio.gather(
+            *(resilience.call('h', 'get', _slow) for _ in range(3)),
+            return_exceptions=True)
+
+    calls.clear()
+    results = asyncio.run(_probes())
+    assert len(calls) == 1 and results[0] == 'ok'
+    assert all(isinstance(r, resilience.CircuitOpenError) for r in results[1:])
+    assert breaker.opened_at is None and breaker.allow()
+
+
+def test_fetch_skips_challenges_without_ctf(tmp_path, capsys):
+    import uuid
+
+    from pwnv.models import Challenge
+
+    orphan = Challenge(name='orphan', ctf_id=uuid.uuid4(), path=tmp_path / 'o',
+                       extras={'pending_attachments': [{'name': 'a'}]})
+    assert remote.fetch_challenge_attachments([orphan]) == 1
+    assert 'archived or was removed' in capsys.readouterr().out
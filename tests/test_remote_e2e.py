@@ -0,0 +1,149 @@
+import importlib
+from pathlib import Path
+
+import pytest
+
+from pwnv.utils import ratelimit, remote
+from tests.fake_ctfd import PASSWORD, TOKEN, USERNAME, FakeCTFd, flag_for
+
+
+@pytest.fixture()
+def workspace(tmp_path, monkeypatch):
+    import pwnv.utils.config as config
+
+    monkeypatch.setenv('PWNV_CONFIG', str(tmp_path / 'cfg.json'))
+    importlib.reload(config)
+    config.save_config({'ctfs_path': str(tmp_path), 'challenge_tags': []})
+    monkeypatch.setattr(ratelimit, '_buckets', {})
+    return tmp_path
+
+
+def _remote_ctf(workspace, server, creds):
+    import pwnv.utils.crud as crud
+    from pwnv.models import CTF
+    from pwnv.utils.credentials import save_credentials
+
+    ctf = CTF(name='fake', path=workspace / 'fake', url=server.url)
+    crud.add_ctf(ctf)
+    save_credentials(ctf, creds)
+    return ctf
+
+
+def test_sync_against_fake_ctfd(workspace):
+    import pwnv.utils.crud as crud
+    from pwnv.utils.credentials import Credentials
+
+    with FakeCTFd(challenges=3, files=2, failure_rate=0.1, seed=3) as server:
+        ctf = _remote_ctf(workspace, server, Credentials(USERNAME, PASSWORD))
+        remote.sync_remote_ctf(ctf)
+        assert crud.count_challenges(ctf) == 3
+        assert len(list(Path(ctf.path).rglob('*.bin'))) == 6
+
+        server.add_challenge(name='late drop', files=['/files/9/late.bin'])
+        server.reset_stats()
+        remote.sync_remote_ctf(ctf)
+
+        assert crud.get_challenge_by_name('late-drop') is not None
+        assert server.stats['POST /login'] == 0
+        assert server.stats['GET /files/<id>/late.bin'] >= 1
+        assert server.stats['GET /files/<id>/file0.bin'] == 0
+
+
+def test_submit_respects_rate_limit(workspace):
+    import pwnv.utils.config as config
+    import pwnv.utils.crud as crud
+    from pwnv.utils.credentials import Credentials
+
+    config.set_config_value('submit_rate', 50)
+    with FakeCTFd(challenges=6, files=0) as server:
+        ctf = _remote_ctf(workspace, server, Credentials(token=TOKEN))
+        remote.sync_remote_ctf(ctf)
+        server.rate_limit = 3
+        entries = [
+            (ctf, ch, flag_for(int(ch.extras['slug'])))
+            for ch in crud.get_challenges()
+        ]
+
+        results = remote.submit_flags(entries)
+
+        assert all(r.correct for r in results)
+        assert server.stats['throttled'] > 0
+        assert server.solved == set(server.challenges)
+
+
+def test_interrupted_import_resumes(workspace):
+    import pwnv.utils.config as config
+    import pwnv.utils.crud as crud
+    from pwnv.utils.checkpoint import ImportCheckpoint, get_checkpoint_path
+    from pwnv.utils.credentials import Credentials
+
+    config.set_config_value('remote_attempts', 1)
+    with FakeCTFd(challenges=8, files=1) as server:
+        server.broken = {'/api/v1/challenges/3', '/api/v1/challenges/6'}
+        ctf = _remote_ctf(workspace, server, Credentials(token=TOKEN))
+        remote.sync_remote_ctf(ctf)
+        assert crud.count_challenges(ctf) == 0
+        assert len(ImportCheckpoint(ctf, resume=True).details) == 6
+
+        server.broken.clear()
+        server.reset_stats()
+        remote.sync_remote_ctf(ctf, resume=True)
+
+        assert server.stats['GET /api/v1/challenges/<id>'] == 2
+        assert crud.count_challenges(ctf) == 8
+        assert len(list(Path(ctf.path).rglob('*.bin'))) == 8
+        assert not get_checkpoint_path(ctf).exists()
+
+
+def test_unfinished_downloads_are_retried(workspace, monkeypatch):
+    import pwnv.constants as constants
+    import pwnv.utils.crud as crud
+    from pwnv.utils.checkpoint import ImportCheckpoint, get_checkpoint_path
+    from pwnv.utils.credentials import Credentials
+
+    monkeypatch.setattr(constants, 'DEFAULT_DOWNLOAD_ATTEMPTS', 1)
+    with FakeCTFd(challenges=4, files=3) as server:
+        server.broken = {'/files/2/file0.bin', '/files/4/file2.bin'}
+        ctf = _remote_ctf(workspace, server, Credentials(token=TOKEN))
+        remote.sync_remote_ctf(ctf)
+        assert crud.count_challenges(ctf) == 4
+        assert len(ImportCheckpoint(ctf).downloads) == 2
+
+        server.broken.clear()
+        server.reset_stats()
+        remote.sync_remote_ctf(ctf)
+
+        assert server.stats['GET /files/<id>/file0.bin'] == 1
+        assert server.stats['GET /files/<id>/file2.bin'] == 1
+        assert server.stats['GET /files/<id>/file1.bin'] == 0
+        assert len(list(Path(ctf.path).rglob('*.bin'))) == 12
+        assert not get_checkpoint_path(ctf).exists()
+
+
+def test_lazy_import_defers_attachments(workspace):
+    import pwnv.utils.config as config
+    import pwnv.utils.crud as crud
+    from pwnv.utils.credentials import Credentials
+    from pwnv.utils.meta import get_extra
+
+    config.set_config_value('lazy_attachments', True)
+    config.set_config_value('prefetch_categories', ['pwn'])
+    config.set_config_value('prefetch_priority', ['web', 'crypto'])
+    with FakeCTFd(challenges=8, files=1) as server:
+        ctf = _remote_ctf(workspace, server, Credentials(token=TOKEN))
+        remote.sync_remote_ctf(ctf)
+        fetched = {p.parent.parent.name for p in Path(ctf.path).rglob('*.bin')}
+        assert fetched == {'pwn'}
+        lazy = [ch for ch in crud.get_challenges() if ch.category.name != 'pwn']
+        assert all(get_extra(ch, 'pending_attachments') for ch in lazy)
+
+        ordered = remote.order_for_prefetch(lazy)
+        assert [ch.category.name for ch in ordered][:4] == ['web'] * 2 + ['crypto'] * 2
+        assert remote.fetch_challenge_attachments(ordered) == 0
+
+        assert len(list(Path(ctf.path).rglob('*.bin'))) == 8
+        for ch in crud.get_challenges():
+            assert not get_extra(ch, 'pending_attachments')
+        server.reset_stats()
+        assert remote.fetch_challenge_attachments(crud.get_challenges()) == 0
+        assert server.stats['requests'] == 0
@@ -0,0 +1,191 @@
+import importlib
+import uuid
+
+from pwnv.models import CTF, Challenge
+from pwnv.models.challenge import Category, Solved
+
+
+def _reload_modules():
+    import pwnv.utils.config as config
+    import pwnv.utils.crud as crud
+    importlib.reload(config)
+    importlib.reload(crud)
+    return config, crud
+
+
+def _populate(config, tmp_path):
+    ctfs = [CTF(id=uuid.uuid4(), name=f'ctf{i}', path=tmp_path/f'ctf{i}')
+            for i in range(3)]
+    challenges = [
+        Challenge(id=uuid.uuid4(), name=f'ch{i}', ctf_id=ctfs[i % 2].id,
+                  path=ctfs[i % 2].path/f'ch{i}', category=Category(i % 3 + 1),
+                  solved=Solved(i % 2))
+        for i in range(6)
+    ]
+    config.save_config({
+        'ctfs_path': str(tmp_path),
+        'challenge_tags': [],
+        'ctfs': [ctf.model_dump(mode='json') for ctf in ctfs],
+        'challenges': [ch.model_dump(mode='json') for ch in challenges],
+    })
+    return ctfs, challenges
+
+
+def test_indexed_lookups(tmp_path, monkeypatch):
+    monkeypatch.setenv('PWNV_CONFIG', str(tmp_path / 'cfg.json'))
+    config, crud = _reload_modules()
+    ctfs, challenges = _populate(config, tmp_path)
+
+    assert crud.get_ctf_by_name('ctf2') == ctfs[2]
+    assert crud.get_ctf_by_id(ctfs[1].id) == ctfs[1]
+    assert crud.get_challenge_by_name('ch3') == challenges[3]
+    assert crud.get_challenge_by_id(challenges[4].id) == challenges[4]
+    assert crud.get_challenge_by_name('missing') is None
+    assert crud.challenges_for_ctf(ctfs[0]) == challenges[0::2]
+    assert crud.challenges_for_ctf(ctfs[2]) == []
+    assert crud.get_challenges_by_category(Category.web) == [
+        challenges[1], challenges[4]
+    ]
+    assert crud.get_solved_challenges() == challenges[1::2]
+    assert crud.get_ctf_by_challenge(challenges[5]) == ctfs[1]
+    assert crud.ctfs_with_challenges() == ctfs[:2]
+
+
+def test_lookups_return_fresh_models(tmp_path, monkeypatch):
+    monkeypatch.setenv('PWNV_CONFIG', str(tmp_path / 'cfg.json'))
+    config, crud = _reload_modules()
+    ctfs, challenges = _populate(config, tmp_path)
+
+    challenge = crud.get_challenge_by_name('ch0')
+    challenge.solved = Solved.solved
+    assert crud.get_challenge_by_name('ch0').solved == Solved.unsolved
+
+    crud.update_challenge(challenge)
+    assert crud.get_challenge_by_name('ch0').solved == Solved.solved
+    assert challenge in crud.get_solved_challenges()
+
+
+def test_indexes_persisted_in_snapshot(tmp_path, monkeypatch):
+    monkeypatch.setenv('PWNV_CONFIG', str(tmp_path / 'cfg.json'))
+    config, crud = _reload_modules()
+    ctfs, challenges = _populate(config, tmp_path)
+    crud.get_challenge_by_name('ch1')
+
+    config, crud = _reload_modules()
+    repository = importlib.import_module('pwnv.utils.repository')
+
+    def no_rebuild(cfg):
+        raise AssertionError('indexes rebuilt despite a valid snapshot')
+
+    monkeypatch.setattr(repository, 'build_indexes', no_rebuild)
+    assert crud.get_challenge_by_name('ch1') == challenges[1]
+
+
+def test_current_from_path_trie(tmp_path, monkeypatch):
+    monkeypatch.setenv('PWNV_CONFIG', str(tmp_path / 'cfg.json'))
+    config, crud = _reload_modules()
+    ctfs, challenges = _populate(config, tmp_path)
+
+    assert crud.get_current_ctf(ctfs[1].path) == ctfs[1]
+    assert crud.get_current_ctf(challenges[3].path/'dist'/'libc.so') == ctfs[1]
+    assert crud.get_current_challenge(challenges[3].path/'dist') == challenges[3]
+    assert crud.get_current_challenge(ctfs[1].path) is None
+    assert crud.get_current_ctf(tmp_path) is None
+    assert crud.get_current_ctf(tmp_path/'ctf10') is None
+
+
+def test_duplicate_ids_repaired(tmp_path, monkeypatch):
+    monkeypatch.setenv('PWNV_CONFIG', str(tmp_path / 'cfg.json'))
+    config, crud = _reload_modules()
+    shared = str(uuid.uuid4())
+    config.save_config({
+        'ctfs_path': str(tmp_path),
+        'challenge_tags': [],
+        'ctfs': [
+            CTF(name=f'ctf{i}', path=tmp_path/f'ctf{i}').model_dump(mode='json')
+            | {'id': shared}
+            for i in range(2)
+        ],
+        'challenges': [
+            Challenge(name=f'ch{i}', ctf_id=shared,
+                      path=tmp_path/f'ctf{i}'/'ch').model_dump(mode='json')
+            | {'id': shared}
+            for i in range(2)
+        ],
+    })
+
+    ctf0, ctf1 = crud.get_ctfs()
+    assert ctf0.id != ctf1.id
+    assert [ch.name for ch in crud.challenges_for_ctf(ctf1)] == ['ch1']
+
+    challenge = crud.get_challenge_by_name('ch1')
+    challenge.flag = 'flag{x}'
+    crud.update_challenge(challenge)
+    assert [ch.flag for ch in crud.get_challenges()] == [None, 'flag{x}']
+    crud.remove_challenge(crud.get_challenge_by_name('ch0'))
+    assert [ch.name for ch in crud.get_challenges()] == ['ch1']
+
+
+def test_counts_and_decoded_models(tmp_path, monkeypatch):
+    monkeypatch.setenv('PWNV_CONFIG', str(tmp_path / 'cfg.json'))
+    config, crud = _reload_modules()
+    assert not crud.exists_ctfs() and not crud.exists_challenges()
+    ctfs, challenges = _populate(config, tmp_path)
+
+    assert crud.count_ctfs() == 3 and crud.exists_challenges()
+    assert crud.count_challenges() == 6
+    assert [crud.count_challenges(ctf) for ctf in ctfs] == [3, 3, 0]
+
+    decoded = crud.get_challenges()
+    assert decoded == challenges
+    assert [Challenge(**ch.model_dump()) for ch in decoded] == challenges
+    decoded[0].tags = ['heap']
+    assert crud.get_challenges()[0].tags is None
+
+
+def test_nested_extras_are_not_shared(tmp_path, monkeypatch):
+    monkeypatch.setenv('PWNV_CONFIG', str(tmp_path / 'cfg.json'))
+    config, crud = _reload_modules()
+    ctf = CTF(name='ctf', path=tmp_path/'ctf')
+    ch = Challenge(name='ch', ctf_id=ctf.id, path=ctf.path/'ch',
+                   extras={'attachments': [{'name': 'libc'}]})
+    crud.add_ctf(ctf)
+    crud.add_challenge(ch)
+
+    loaded = crud.get_challenge_by_name('ch')
+    loaded.extras['attachments'].append({'name': 'ld'})
+    loaded.extras['attachments'][0]['name'] = 'changed'
+
+    assert crud.get_challenge_by_name('ch').extras == ch.extras
+    assert config.load_config()['challenges'][0]['extras'] == ch.extras
+
+
+def test_path_trie_survives_unrelated_writes(tmp_path, monkeypatch):
+    monkeypatch.setenv('PWNV_CONFIG', str(tmp_path / 'cfg.json'))
+    config, crud = _reload_modules()
+    ctfs, challenges = _populate(config, tmp_path)
+    repository = importlib.import_module('pwnv.utils.repository')
+    assert crud.get_current_challenge(challenges[0].path) == challenges[0]
+
+    builds = []
+    build = repository.build_path_trie
+    monkeypatch.setattr(repository, 'build_path_trie',
+                        lambda cfg: builds.append(1) or build(cfg))
+    saves = []
+    save = config._save_snapshot
+    monkeypatch.setattr(config, '_save_snapshot',
+                        lambda *args: saves.append(1) or save(*args))
+
+    challenges[0].solved = Solved.solved
+    crud.update_challenge(challenges[0])
+    assert crud.get_current_challenge(challenges[0].path) == challenges[0]
+    assert builds == [] and saves == [1]
+
+    config, crud = _reload_modules()
+    assert crud.get_current_challenge(challenges[0].path) == challenges[0]
+    assert builds == []
+
+    moved = challenges[1].model_copy(update={'path': tmp_path / 'moved'})
+    crud.update_challenge(moved)
+    assert crud.get_current_challenge(tmp_path / 'moved') == moved
+    assert builds == [1]
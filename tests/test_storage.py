@@ -0,0 +1,117 @@
+import importlib
+import uuid
+
+import pytest
+
+from pwnv.models import CTF, Challenge
+from pwnv.models.challenge import Solved
+
+
+def _reload_modules():
+    import pwnv.utils.config as config
+    import pwnv.utils.crud as crud
+    import pwnv.utils.storage as storage
+    importlib.reload(config)
+    importlib.reload(storage)
+    importlib.reload(crud)
+    return config, storage, crud
+
+
+def _populate(storage, tmp_path):
+    ctf = CTF(id=uuid.uuid4(), name='ctf', path=tmp_path/'ctf')
+    storage = storage.get_storage()
+    storage.add_ctf(ctf)
+    challenges = [
+        Challenge(id=uuid.uuid4(), name=f'ch{i}', ctf_id=ctf.id,
+                  path=ctf.path/'pwn'/f'ch{i}', tags=['rop'], extras={'slug': i})
+        for i in range(3)
+    ]
+    for ch in challenges:
+        storage.add_challenge(ch)
+    storage.add_tags({'ROP'})
+    return ctf, challenges
+
+
+def test_sqlite_crud(tmp_path, monkeypatch):
+    monkeypatch.setenv('PWNV_CONFIG', str(tmp_path / 'cfg.json'))
+    config, storage, crud = _reload_modules()
+    config.set_config_value('storage', 'sqlite')
+
+    ctf, challenges = _populate(storage, tmp_path)
+    assert storage.get_storage().name == 'sqlite'
+    assert not config.load_config().get('challenges')
+
+    assert crud.get_ctf_by_name('ctf') == ctf
+    assert crud.get_challenge_by_name('ch1') == challenges[1]
+    assert crud.challenges_for_ctf(ctf) == challenges
+    assert crud.get_current_ctf(ctf.path/'pwn') == ctf
+    assert crud.get_current_challenge(challenges[2].path/'solve.py') == challenges[2]
+    assert crud.get_tags() == {'rop'}
+
+    challenges[0].solved = Solved.solved
+    crud.update_challenge(challenges[0])
+    assert crud.get_solved_challenges() == [challenges[0]]
+
+    storage.get_storage().remove_ctf(ctf)
+    assert crud.get_ctfs() == []
+    assert crud.get_challenges() == []
+
+
+def test_migrate_storage(tmp_path, monkeypatch):
+    monkeypatch.setenv('PWNV_CONFIG', str(tmp_path / 'cfg.json'))
+    config, storage, crud = _reload_modules()
+
+    ctf, challenges = _populate(storage, tmp_path)
+    assert storage.migrate_storage('sqlite') == 3
+    assert config.get_config_value('storage') == 'sqlite'
+    assert config.load_config()['challenges'] == []
+    assert crud.get_challenges() == challenges
+    assert crud.get_tags() == {'rop'}
+
+    assert storage.migrate_storage('json') == 3
+    assert storage.get_storage().name == 'json'
+    assert crud.get_ctfs() == [ctf]
+    assert crud.get_challenges() == challenges
+
+
+def test_sqlite_ids_are_unique(tmp_path, monkeypatch):
+    import sqlite3
+
+    monkeypatch.setenv('PWNV_CONFIG', str(tmp_path / 'cfg.json'))
+    config, storage, crud = _reload_modules()
+    db = storage.SqliteStorage(tmp_path / 'pwnv.db')
+    ctf = CTF(name='ctf', path=tmp_path/'ctf')
+    db.add_ctf(ctf)
+    with pytest.raises(sqlite3.IntegrityError):
+        db.add_ctf(ctf.model_copy(update={'name': 'other'}))
+    assert db.get_ctfs() == [ctf]
+
+
+def test_sharded_writes_only_owning_shard(tmp_path, monkeypatch):
+    monkeypatch.setenv('PWNV_CONFIG', str(tmp_path / 'cfg.json'))
+    config, storage, crud = _reload_modules()
+    config.set_config_value('storage', 'sharded')
+
+    ctf, challenges = _populate(storage, tmp_path)
+    other = CTF(name='old', path=tmp_path/'old', running=0)
+    crud.add_ctf(other)
+    shards = storage.get_storage()
+    assert shards.name == 'sharded'
+    assert crud.get_challenges() == challenges
+    assert crud.get_running_ctfs() == [ctf]
+    assert crud.get_stopped_ctfs() == [other]
+    assert crud.get_tags() == {'rop'}
+
+    manifest = storage.get_manifest_path()
+    before = manifest.stat().st_mtime_ns, shards.shard_path(other.path).read_text()
+    challenges[1].solved = Solved.solved
+    crud.update_challenge(challenges[1])
+    after = manifest.stat().st_mtime_ns, shards.shard_path(other.path).read_text()
+    assert before == after
+    assert crud.get_solved_challenges() == [challenges[1]]
+    assert crud.get_current_challenge(challenges[2].path / 'x') == challenges[2]
+
+    assert storage.migrate_storage('json') == 3
+    assert not shards.shard_path(ctf.path).exists()
+    assert crud.get_ctfs() == [ctf, other]
+    assert crud.get_challenges() == challenges